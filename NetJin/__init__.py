@@ -1,3 +1,6 @@
 from .core.WebServer import *  # noqa: F403
 from .http.request import *  # noqa: F403
 from .http.response import *  # noqa: F403
+from .http.form import *  # noqa: F403
+from .http.cache import *  # noqa: F403
+from .http.codec import *  # noqa: F403
@@ -0,0 +1,49 @@
+from NetJin.http.compression import precompress
+from NetJin.http.response import precompile_templates
+from NetJin.config import STATIC_DIRS, COMPRESSION_TYPES, COMPRESSION_MIN_SIZE
+from NetJin.config import TEMPLATE_CACHE_DIR
+from NetJin.types import List
+import argparse
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m NetJin")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    precompress_ = commands.add_parser(
+        "precompress",
+        help="write .gz (and .br, with brotli installed) siblings of static files",
+    )
+    precompress_.add_argument(
+        "directories", nargs="*", help="directories to compress (default: STATIC_DIRS)"
+    )
+    precompress_.add_argument(
+        "--level", type=int, default=9, help="compression level (default: 9)"
+    )
+
+    commands.add_parser(
+        "precompile",
+        help="compile every template of TEMPLATE_DIRS into TEMPLATE_CACHE_DIR",
+    )
+
+    args = parser.parse_args(argv)
+    if args.command == "precompress":
+        written = precompress(
+            args.directories or STATIC_DIRS,
+            COMPRESSION_TYPES,
+            COMPRESSION_MIN_SIZE,
+            args.level,
+        )
+        for path in written:
+            print(path)
+        print("%d file(s) written" % len(written))
+    elif args.command == "precompile":
+        if not TEMPLATE_CACHE_DIR:
+            print("TEMPLATE_CACHE_DIR is not set; nothing would be kept")
+            return 1
+        print("%d template(s) compiled" % precompile_templates())
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,5 +1,9 @@
 from pathlib import Path
-from typing import List
+from typing import TYPE_CHECKING, List, Literal
+
+if TYPE_CHECKING:
+    # Imported for the annotation only: NetJin.http imports this module.
+    from NetJin.http.codec import JSONCodec
 
 __all__ = [
     "BASE_DIR",
@@ -8,9 +12,53 @@ __all__ = [
     "DEBUG",
     "ALLOWED_HOST",
     "TEMPLATE_DIRS",
+    "TEMPLATE_CACHE_DIR",
     "STATIC_DIRS",
     "PUBLIC_DIR",
     "MEDIA_DIR",
+    "STATIC_CACHE_CONTROL",
+    "STATIC_REFRESH_INTERVAL",
+    "COMPRESSION",
+    "COMPRESSION_LEVEL",
+    "COMPRESSION_MIN_SIZE",
+    "COMPRESSION_TYPES",
+    "WORKERS",
+    "MAX_QUEUE",
+    "BACKLOG",
+    "MAX_CONNECTIONS",
+    "MAX_INFLIGHT_REQUESTS",
+    "QUEUE_TIMEOUT",
+    "RETRY_AFTER",
+    "PROCESSES",
+    "REUSE_PORT",
+    "SHUTDOWN_TIMEOUT",
+    "RESTART_TIMEOUT",
+    "KEEP_ALIVE_TIMEOUT",
+    "KEEP_ALIVE_MAX_REQUESTS",
+    "HEADER_TIMEOUT",
+    "BODY_TIMEOUT",
+    "MIN_BODY_RATE",
+    "WRITE_TIMEOUT",
+    "MAX_HEADER_SIZE",
+    "MAX_BODY_SIZE",
+    "SPOOL_MAX_SIZE",
+    "MAX_FORM_SIZE",
+    "JSON_CODEC",
+    "MAX_JSON_SIZE",
+    "ACCESS_LOG",
+    "ACCESS_LOG_FORMAT",
+    "ACCESS_LOG_SAMPLE_RATE",
+    "ACCESS_LOG_MAX_BYTES",
+    "ACCESS_LOG_BACKUPS",
+    "METRICS",
+    "METRICS_PATH",
+    "METRICS_BUCKETS",
+    "PROFILE_DIR",
+    "PROFILE_SAMPLE_RATE",
+    "PROFILE_ROUTES",
+    "PROFILE_ENABLED",
+    "PROFILE_ADMIN_PATH",
+    "PROFILE_DUMP_INTERVAL",
 ]
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -23,6 +71,78 @@ ALLOWED_HOST: List[str] = []
 
 # Views and Static
 TEMPLATE_DIRS: str | List[str] = "views"
+TEMPLATE_CACHE_DIR: str | None = None  # Persistent Jinja bytecode cache, e.g. ".cache/templates".
 STATIC_DIRS: List[str] = ["static"]
 PUBLIC_DIR: str = "public"
 MEDIA_DIR: str = "media"
+STATIC_CACHE_CONTROL: str = "no-cache"  # Cache-Control of static files; "" sends none.
+STATIC_REFRESH_INTERVAL: float = 5  # Seconds between rescans of STATIC_DIRS; 0 scans only at startup.
+
+# Compression
+COMPRESSION: bool = True  # gzip/deflate Response bodies for clients that accept it.
+COMPRESSION_LEVEL: int = 6  # zlib level, 1 (fastest) to 9 (smallest).
+COMPRESSION_MIN_SIZE: int = 1024  # Smaller bodies are sent as they are.
+COMPRESSION_TYPES: List[str] = [  # Compressed media types; entries ending in "/" match a prefix.
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+]
+
+# Concurrency
+WORKERS: int = 64  # Threads handling client connections.
+MAX_QUEUE: int = 256  # Accepted connections waiting for a free worker; beyond it clients get 503.
+PROCESSES: int = 1  # Worker processes forked by run(); more than 1 needs os.fork().
+REUSE_PORT: bool = False  # Let each worker process bind its own SO_REUSEPORT socket.
+
+# Graceful shutdown and hot restart (SIGHUP or SIGUSR2)
+SHUTDOWN_TIMEOUT: float = 30  # Seconds in-flight requests get to finish on SIGTERM or a restart.
+RESTART_TIMEOUT: float = 30  # Seconds a restarted generation gets to start accepting before it is abandoned.
+
+# Admission control: over a limit, clients get an immediate 503 with Retry-After.
+BACKLOG: int = 1024  # listen() backlog; the kernel caps it at net.core.somaxconn.
+MAX_CONNECTIONS: int = 0  # Open client connections per process; 0 is unlimited.
+MAX_INFLIGHT_REQUESTS: int = 0  # Requests being handled at once per process; 0 is unlimited.
+QUEUE_TIMEOUT: float = 0  # Seconds a connection may wait for a worker before it is shed; 0 waits.
+RETRY_AFTER: int = 1  # Retry-After seconds sent with the 503.
+
+# Persistent connections
+KEEP_ALIVE_TIMEOUT: float = 5  # Seconds an idle connection waits for its next request; 0 waits.
+KEEP_ALIVE_MAX_REQUESTS: int = 100  # Requests served on one connection before closing it.
+
+# Slow clients: 0 turns a limit off.
+HEADER_TIMEOUT: float = 10  # Seconds to receive a request line and headers; 408 after.
+BODY_TIMEOUT: float = 30  # Seconds a request body may stall between reads; 408 after.
+MIN_BODY_RATE: int = 1024  # Bytes per second a body must average once it has taken BODY_TIMEOUT.
+WRITE_TIMEOUT: float = 30  # Seconds a response write may block on a client that stopped reading.
+
+# Request limits
+MAX_HEADER_SIZE: int = 64 * 1024  # Request line and headers; larger requests get 431.
+MAX_BODY_SIZE: int = 1024 * 1024 * 1024  # Request body; larger requests get 413.
+SPOOL_MAX_SIZE: int = 1024 * 1024  # Buffered body bytes kept in memory before spilling to disk.
+MAX_FORM_SIZE: int = 2 * 1024 * 1024  # Non-file form fields held in memory; uploads spill to MEDIA_DIR.
+
+# JSON
+JSON_CODEC: "str | JSONCodec" = "auto"  # "orjson", "ujson", "json" (stdlib) or a JSONCodec; "auto" picks the fastest installed.
+MAX_JSON_SIZE: int = 1024 * 1024  # Body read by request.json(); larger requests get 413.
+
+# Access log
+ACCESS_LOG: str | None = None  # File the access log is appended to; "-" is stdout, None (the default) disables it.
+ACCESS_LOG_FORMAT: Literal["text", "json"] = "text"  # Common Log Format-like lines or one JSON object per line.
+ACCESS_LOG_SAMPLE_RATE: float = 1.0  # Fraction of requests logged.
+ACCESS_LOG_MAX_BYTES: int = 10 * 1024 * 1024  # Size at which the log file is rotated; 0 never rotates.
+ACCESS_LOG_BACKUPS: int = 5  # Rotated files kept (access.log.1 ... access.log.5).
+
+# Metrics
+METRICS: bool = False  # Count requests per route and serve them at METRICS_PATH.
+METRICS_PATH: str = "/metrics"  # Prometheus text exposition; counters are per worker process.
+METRICS_BUCKETS: List[float] = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]  # Latency histogram bounds in seconds.
+
+# Profiling
+PROFILE_DIR: str | None = None  # Where .pstats and .collapsed files are written; None removes the profiler.
+PROFILE_SAMPLE_RATE: float = 0.01  # Fraction of requests run under cProfile while profiling is on.
+PROFILE_ROUTES: List[str] = []  # Route patterns to keep profiles for; empty keeps all.
+PROFILE_ENABLED: bool = False  # Profile from startup; otherwise toggled with SIGUSR1 or PROFILE_ADMIN_PATH.
+PROFILE_ADMIN_PATH: str | None = None  # Local-only status page; POST toggles profiling.
+PROFILE_DUMP_INTERVAL: float = 10  # Seconds between profile file writes; 0 writes only on demand and at shutdown.
@@ -1,28 +1,99 @@
-from NetJin.utils import extract_route_pattern
-from NetJin.http.response import Response
-from NetJin.http.request import Request, create_request_object  # type: ignore
-from NetJin.types import Callable, List, RequestMethod, Dict, Tuple
-from NetJin.config import STATIC_DIRS, BASE_DIR, HOST, PORT, DEBUG
+from NetJin.utils import Router, WorkerPool, Supervisor, AccessLog, Metrics, Profiler
+from NetJin.utils import HotRestart, notify_ready
+from NetJin.http.response import Response, precompile_templates
+from NetJin.http.request import Request, create_request_object
+from NetJin.http.parser import RequestReader, RequestError, RequestTimeout
+from NetJin.http.cache import CacheBackend, CacheEntry, ResponseCache
+from NetJin.http.static import StaticFile, StaticIndex, send_file
+from NetJin.http.writer import write, status_line, header_line, CONNECTION
+from NetJin.http.static import parse_range, byterange_parts
+from NetJin.core.engine import AsyncioEngine
+from NetJin.core.admission import listen, limit, reject, accept, admit, expired, UNAVAILABLE
+from NetJin.types import Callable, List, RequestMethod, Dict, Tuple, Literal
+from NetJin.config import STATIC_DIRS, BASE_DIR, HOST, PORT, DEBUG, WORKERS, MAX_QUEUE
+from NetJin.config import PROCESSES, REUSE_PORT, KEEP_ALIVE_TIMEOUT, KEEP_ALIVE_MAX_REQUESTS
+from NetJin.config import MAX_HEADER_SIZE, MAX_BODY_SIZE
+from NetJin.config import STATIC_CACHE_CONTROL, STATIC_REFRESH_INTERVAL
+from NetJin.config import ACCESS_LOG, ACCESS_LOG_FORMAT, ACCESS_LOG_SAMPLE_RATE
+from NetJin.config import ACCESS_LOG_MAX_BYTES, ACCESS_LOG_BACKUPS
+from NetJin.config import METRICS, METRICS_PATH, METRICS_BUCKETS
+from NetJin.config import PROFILE_DIR, PROFILE_SAMPLE_RATE, PROFILE_ROUTES, PROFILE_ENABLED
+from NetJin.config import PROFILE_ADMIN_PATH, PROFILE_DUMP_INTERVAL
+from NetJin.config import MAX_CONNECTIONS, MAX_INFLIGHT_REQUESTS
+from NetJin.config import HEADER_TIMEOUT, BODY_TIMEOUT, MIN_BODY_RATE, WRITE_TIMEOUT
+from NetJin.config import SHUTDOWN_TIMEOUT, RESTART_TIMEOUT
 
+from typing import Awaitable, BinaryIO
+import asyncio
+import inspect
 import socket
 from dataclasses import dataclass
 from colorama import init, Fore
 import datetime
-import threading
 import atexit
-import mimetypes
+import threading
+import signal
+import json
+import secrets
+import traceback
+import time
 import os
 
 __all__ = ["WebServer"]
 init(True)
 
-_HandleType = Callable[[Request, Response], None]
+_HandleType = Callable[[Request, Response], None | Awaitable[None]]
+
+# Files up to this size go out in one write with their headers instead of a
+# separate sendfile(), which saves a syscall and a second small TCP segment.
+_SMALL_FILE = 64 * 1024
+
+
+async def _await(awaitable: Awaitable[None]) -> None:
+    await awaitable
+
+
+def _head(
+    status: Tuple[int, str],
+    content_type: str,
+    length: int | None,
+    keep_alive: bool,
+    headers: Dict[str, str] | None = None,
+) -> bytes:
+    head = [status_line(*status)]
+    if content_type:
+        head.append(header_line("Content-Type", content_type))
+    if length is not None:
+        head.append(b"Content-Length: %d\r\n" % length)
+    if headers:
+        head.extend(header_line(*header) for header in headers.items())
+    head.append(CONNECTION[keep_alive])
+    return b"".join(head)
+
+
+_REQUEST_TIMEOUT = _head(
+    (408, "Request Timeout"), "text/plain", len(b"Request Timeout"), False
+) + b"Request Timeout"
+
+
+def _no_delay(client: socket.socket) -> None:
+    # Responses are written whole; Nagle would only hold back their tails.
+    client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+
+def _close(server: socket.socket) -> None:
+    try:
+        server.close()
+    except OSError:
+        ...
 
 
 @dataclass
 class _RouteRecordType(object):
     handler: _HandleType
     methods: List[RequestMethod]
+    cache: ResponseCache | None = None
+    path: str = ""
 
 
 @dataclass
@@ -33,14 +104,71 @@ class WebServer(object):
     def __init__(self, debug: bool = True) -> None:
         self._routes: Dict[str, _RouteRecordType] = {}
         self._error_handlers: Dict[int, _ErrorRecordType] = {}
+        self._router = Router()
+        self._caches: Dict[_HandleType, ResponseCache] = {}
+        self._pool: WorkerPool | None = None
+        self._static = StaticIndex(STATIC_DIRS, STATIC_CACHE_CONTROL, STATIC_REFRESH_INTERVAL)
+        self._access_log = AccessLog(
+            ACCESS_LOG,
+            ACCESS_LOG_FORMAT,
+            ACCESS_LOG_SAMPLE_RATE,
+            ACCESS_LOG_MAX_BYTES,
+            ACCESS_LOG_BACKUPS,
+        )
+        self._metrics = Metrics(METRICS_BUCKETS) if METRICS else None
+        self._profiler = (
+            Profiler(
+                PROFILE_DIR,
+                PROFILE_SAMPLE_RATE,
+                PROFILE_ROUTES,
+                PROFILE_ENABLED,
+                PROFILE_DUMP_INTERVAL,
+            )
+            if PROFILE_DIR
+            else None
+        )
+        # Admission control; None where the limit is off.
+        self._connections = limit(MAX_CONNECTIONS)
+        self._inflight = limit(MAX_INFLIGHT_REQUESTS)
+        # Set by stop(): nothing new is accepted and every response closes its connection.
+        self._draining = False
+        self._engine: AsyncioEngine | None = None
         self._isDebug = debug
     
     def route(
-        self, path: str, methods: List[RequestMethod] | None = None
+        self,
+        path: str,
+        methods: List[RequestMethod] | None = None,
+        cache: ResponseCache | float | None = None,
     ) -> Callable[[_HandleType], _HandleType]:
+        if cache is not None and not isinstance(cache, ResponseCache):
+            cache = ResponseCache(cache)
+
         def wrapper(handler: _HandleType) -> _HandleType:
-            route = _RouteRecordType(handler, methods or ["GET"])
+            # @app.cache() below @app.route() has registered the handler already.
+            route = _RouteRecordType(
+                handler, methods or ["GET"], cache or self._caches.get(handler), path
+            )
             self._routes[path] = route
+            self._router.add(path, route)
+            return handler
+
+        return wrapper
+
+    def cache(
+        self,
+        ttl: float = 60,
+        vary: List[str] | None = None,
+        max_entries: int = 1024,
+        backend: CacheBackend | None = None,
+    ) -> Callable[[_HandleType], _HandleType]:
+        cache = ResponseCache(ttl, vary, max_entries, backend)
+
+        def wrapper(handler: _HandleType) -> _HandleType:
+            self._caches[handler] = cache
+            for route in self._routes.values():
+                if route.handler is handler:
+                    route.cache = cache
             return handler
 
         return wrapper
@@ -53,6 +181,10 @@ class WebServer(object):
 
         return wrapper
 
+    @property
+    def queue_depth(self) -> int:
+        return self._pool.queue_depth if self._pool else 0
+
     def log(self, *messages) -> None:
         date = datetime.datetime.now()
         date = f"{date:[%d of %B, %Y %I:%M:S %p]}"
@@ -60,95 +192,569 @@ class WebServer(object):
             print(f"{date:<30}", *messages)
     
     def handleClient(self, client: socket.socket) -> None:
-        user_requests = client.recv(1024).decode()
-        request = create_request_object(user_requests)
+        reader = RequestReader(
+            client,
+            MAX_HEADER_SIZE,
+            MAX_BODY_SIZE,
+            header_timeout=HEADER_TIMEOUT,
+            body_timeout=BODY_TIMEOUT,
+            min_body_rate=MIN_BODY_RATE,
+            write_timeout=WRITE_TIMEOUT,
+        )
+        served = 0
+        responded = False
+        if self._metrics is not None:
+            self._metrics.connection_opened()
+        try:
+            while True:
+                # A new connection has HEADER_TIMEOUT to start its request, an idle one
+                # KEEP_ALIVE_TIMEOUT; then the request line and headers get HEADER_TIMEOUT.
+                head = reader.read_head(KEEP_ALIVE_TIMEOUT if served else HEADER_TIMEOUT)
+                responded = False
+                if head is None:
+                    return
+                if self._inflight is not None and not self._inflight.acquire(blocking=False):
+                    self._shed(client, "inflight")
+                    return
 
-        if not request.method or not request.path:
-            client.close()
-            return
+                try:
+                    if self._profiler is not None:
+                        # Begun before parsing; dispatch() ends it once the route is known.
+                        self._profiler.begin()
+                        request = self._profiler.call(create_request_object, head)
+                    else:
+                        request = create_request_object(head)
+                    if not request.method or not request.path:
+                        return
+                    body = reader.body(request.headers)
+                    request._stream = body
+
+                    served += 1
+                    keep_alive = self._keep_alive(request, served)
+                    try:
+                        keep_alive = self.dispatch(request, client, keep_alive)
+                        responded = True
+                    finally:
+                        request.close()
+                finally:
+                    if self._inflight is not None:
+                        self._inflight.release()
+                if not keep_alive or not body.drain():
+                    return
+        except RequestTimeout as e:
+            self._timed_out(client, e.phase, not responded)
+        except RequestError as e:
+            # Framing is lost after a malformed request, so the connection is closed.
+            try:
+                self.send(client, e.status, str(e))
+            except TimeoutError:
+                ...
+        except TimeoutError:
+            # A response write blocked past WRITE_TIMEOUT.
+            self._timed_out(client, "write", False)
+        except OSError:
+            ...
+        finally:
+            _close(client)
+            if self._metrics is not None:
+                self._metrics.connection_closed()
+            if self._profiler is not None:
+                # A request that failed before reaching dispatch() isn't kept.
+                self._profiler.end(None)
+
+    def _accepted(self, item: Tuple[socket.socket, float]) -> None:
+        admit(item, self.handleClient, self._connections, self._shed)
+
+    def _shed(self, client: socket.socket, reason: str, close: bool = True) -> None:
+        if self._metrics is not None:
+            self._metrics.shed(reason)
+        reject(client, UNAVAILABLE, close)
+
+    def _timed_out(
+        self, client: socket.socket, phase: str, answer: bool, close: bool = True
+    ) -> bool:
+        # Only a request that was cut short gets a 408; idle connections and
+        # stalled writes are just closed. Returns whether a 408 was sent.
+        if self._metrics is not None:
+            self._metrics.timeout(phase)
+        answer = answer and phase in ("header", "body")
+        if answer:
+            reject(client, _REQUEST_TIMEOUT, close)
+        elif close:
+            _close(client)
+        return answer
+
+    def _keep_alive(self, request: Request, served: int) -> bool:
+        if self._draining or served >= KEEP_ALIVE_MAX_REQUESTS:
+            return False
+        connection = (request.Connection or "").lower()
+        if request.version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
 
-        if self._isDebug:
-            self.log(request.method, request.path)
+    def dispatch(
+        self, request: Request, client: socket.socket, keep_alive: bool = False
+    ) -> bool:
+        # The peer is read up front; a closed connection no longer has one.
+        peer = self._log_peer(client)
+        start = time.perf_counter()
+        # A fixed label until a route matches; raw paths would make metrics unbounded.
+        status, sent, route, source = 500, 0, "<unmatched>", "error"
+        try:
+            if self._profiler is not None:
+                self._profiler.begin()
+                result = self._profiler.call(self._dispatch, request, client, keep_alive)
+            else:
+                result = self._dispatch(request, client, keep_alive)
+            keep_alive, status, sent, route, source = result
+            return keep_alive
+        except (TimeoutError, ConnectionError):
+            raise
+        except RequestError as e:
+            # Raised outside a route handler, e.g. by an error handler reading the body.
+            keep_alive, status, sent = self._rejected(client, None, e)
+            return keep_alive
+        except Exception:
+            # Raised outside a route handler, e.g. by an error handler.
+            keep_alive, status, sent = self._failed(client, None, request.method == "HEAD")
+            return keep_alive
+        finally:
+            self._record(peer, request, status, sent, route, source, start)
+
+    def _dispatch_queued(
+        self, request: Request, client: socket.socket, keep_alive: bool, queued_at: float
+    ) -> bool:
+        # dispatch() for requests that waited for an executor thread.
+        if expired(queued_at):
+            self._shed(client, "queue_timeout")
+            return False
+        return self.dispatch(request, client, keep_alive)
+
+    def _dispatch(
+        self, request: Request, client: socket.socket, keep_alive: bool
+    ) -> Tuple[bool, int, int, str, str]:
+        # keep-alive, status, bytes sent, route and source for the access log and metrics.
+        if self._metrics is not None and request.path == METRICS_PATH:
+            sent = self.send(
+                client,
+                (200, "OK"),
+                self._metrics.render(self._gauges()),
+                "text/plain; version=0.0.4; charset=utf-8",
+                keep_alive,
+                head_only=request.method == "HEAD",
+            )
+            return keep_alive, 200, sent, METRICS_PATH, "metrics"
+        if self._profiler is not None and request.path == PROFILE_ADMIN_PATH:
+            return self._profile_admin(request, client, keep_alive)
 
         # Handling Routing
-        for route, route_info in self._routes.items():
-            route_ = extract_route_pattern(route, request.path)
-            if isinstance(route_, dict):
-                response = Response(client)
-                if request.method not in route_info.methods:
-                    temp = self._error_handlers.get(405, None)
-                    if temp:
-                        temp.handler(request, response)
-                        return
+        match = self._router.lookup(request.path, request.method)
+        if match:
+            route_info, route_ = match
+            response = self._response(client, request, keep_alive)
+            if request.method not in route_info.methods:
+                temp = self._error_handlers.get(405, None)
+                if temp:
+                    self._call(temp.handler, request, response)
+                    return self._result(response, route_info.path, "error")
 
-                    self.send(
-                        client,
-                        (405, "Not Allowed"),
-                        "Method '%s' on route '%s' not allowed"
-                        % (request.method, request.path),
-                    )
-                    return
+                sent = self.send(
+                    client,
+                    (405, "Not Allowed"),
+                    "Method '%s' on route '%s' not allowed"
+                    % (request.method, request.path),
+                    keep_alive=keep_alive,
+                    head_only=request.method == "HEAD",
+                )
+                return keep_alive, 405, sent, route_info.path, "error"
 
-                if not request.user_parameters:
-                    request.user_parameters = route_
-                else:
-                    request.user_parameters.update(route_)
+            if not request.user_parameters:
+                request.user_parameters = route_
+            else:
+                request.user_parameters.update(route_)
 
-                route_info.handler(request, response)
-                return
+            cache = route_info.cache if request.method in ("GET", "HEAD") else None
+            if cache is not None:
+                entry = cache.get(request)
+                if entry is not None:
+                    sent = self._send_cached(client, entry, request.method == "HEAD", keep_alive)
+                    return keep_alive, 200, sent, route_info.path, "cache"
+                response.capture = True
+
+            try:
+                self._call(route_info.handler, request, response)
+            except (TimeoutError, ConnectionError):
+                # The client stalled or went away; handled by the connection.
+                raise
+            except RequestError as e:
+                return (*self._rejected(client, response, e), route_info.path, "error")
+            except Exception:
+                return (*self._failed(client, response), route_info.path, "error")
+            if cache is not None and response.captured is not None:
+                status, headers, body = response.captured
+                if cache.cacheable(status, headers):
+                    cache.store(request, status, headers, body)
+            return self._result(response, route_info.path, "dynamic")
 
         # Handling Static Content
-        for static in STATIC_DIRS:
-            filename = os.path.join(static, request.path.lstrip("/"))
-            if os.path.exists(filename) and os.path.isfile(filename):
-                with open(filename, "rb") as file:
-                    mimetype, _ = mimetypes.guess_type(filename)
-                    if mimetype is None:
-                        mimetype = ""
-                    #! Change static serve; add cache control for static
-                    self.send(client, (200, "OK"), file.read(), mimetype)
-                    return
+        static = self._static.lookup(request.path)
+        if static is not None:
+            result = self._send_static(client, request, static, keep_alive)
+            if result is not None:
+                return (keep_alive, *result, "<static>", "static")
 
         #! Handle Error Condition (Make user configurable)
         temp = self._error_handlers.get(404, None)
         if temp:
-            response = Response(client)
-            temp.handler(request, response)
-            return
+            response = self._response(client, request, keep_alive)
+            self._call(temp.handler, request, response)
+            return self._result(response, "<unmatched>", "error")
 
         filepath = BASE_DIR / "views" / "errors" / "NotFound.html"
         with open(filepath) as file:
-            self.send(
+            sent = self.send(
                 client,
                 (404, "Not Found"),
                 file.read().replace("{{ pathname }}", request.path),
                 "text/html",
+                keep_alive,
+                head_only=request.method == "HEAD",
             )
+        return keep_alive, 404, sent, "<unmatched>", "error"
+
+    def _result(
+        self, response: Response, route: str, source: str
+    ) -> Tuple[bool, int, int, str, str]:
+        # A handler that never responded leaves the client waiting; close it.
+        return (
+            response.keep_alive and response.bytes_sent > 0,
+            response.status,
+            response.bytes_sent,
+            route,
+            source,
+        )
+
+    def _failed(
+        self, client: socket.socket, response: Response | None, head_only: bool = False
+    ) -> Tuple[bool, int, int]:
+        # keep-alive, status and bytes sent after a handler raised. A response that
+        # had already started can't be replaced, so its connection is just closed.
+        print(f"{Fore.RED}{traceback.format_exc()}")
+        if response is not None and response.bytes_sent:
+            return False, response.status or 500, response.bytes_sent
+        if response is not None:
+            head_only = response.head_only
+        try:
+            sent = self.send(
+                client,
+                (500, "Internal Server Error"),
+                "Internal Server Error",
+                head_only=head_only,
+            )
+        except OSError:
+            sent = 0
+        return False, 500, sent
+
+    def _rejected(
+        self,
+        client: socket.socket,
+        response: Response | None,
+        error: RequestError,
+        close: bool = True,
+    ) -> Tuple[bool, int, int]:
+        # keep-alive, status and bytes sent after the request body failed to read in a
+        # handler: too large, malformed or too slow. Framing is lost, so the connection
+        # is closed either way.
+        if response is not None and response.bytes_sent:
+            # Already answering; the response can only be cut short.
+            if isinstance(error, RequestTimeout):
+                self._timed_out(client, error.phase, False, close)
+            elif close:
+                _close(client)
+            return False, response.status or 500, response.bytes_sent
+        if isinstance(error, RequestTimeout):
+            self._timed_out(client, error.phase, True, close)
+            return False, 408, len(_REQUEST_TIMEOUT)
+        message = str(error).encode()
+        answer = _head(error.status, "text/plain", len(message), False)
+        if response is None or not response.head_only:
+            answer += message
+        reject(client, answer, close)
+        return False, error.status[0], len(answer)
+
+    def _gauges(self) -> Dict[str, Tuple[str, float]]:
+        gauges = {"threads": ("Live threads in this process.", threading.active_count())}
+        if self._pool is not None:
+            gauges["worker_threads"] = ("Threads in the worker pool.", self._pool.size)
+            gauges["worker_threads_busy"] = ("Worker threads serving a client.", self._pool.busy)
+            gauges["queue_depth"] = ("Accepted connections waiting for a worker.", self._pool.queue_depth)
+        return gauges
+
+    def _log_peer(self, client: socket.socket) -> str | None:
+        # None when this request is not going to the access log.
+        if not self._access_log.enabled or not self._access_log.sampled():
+            return None
+        try:
+            peer = client.getpeername()
+        except OSError:
+            return "-"
+        return str(peer[0]) if isinstance(peer, tuple) else str(peer or "-")
+
+    def _record(
+        self,
+        peer: str | None,
+        request: Request,
+        status: int,
+        sent: int,
+        route: str,
+        source: str,
+        start: float,
+    ) -> None:
+        duration = time.perf_counter() - start
+        if peer is not None:
+            self._access_log.log(
+                peer, request.method, request.path, request.version, status, sent, duration
+            )
+        if self._metrics is not None:
+            self._metrics.observe(route, request.method, status, source, sent, duration)
+        if self._profiler is not None:
+            self._profiler.end(route)
+
+    def _profile_admin(
+        self, request: Request, client: socket.socket, keep_alive: bool
+    ) -> Tuple[bool, int, int, str, str]:
+        profiler = self._profiler
+        try:
+            peer = client.getpeername()
+        except OSError:
+            peer = None
+        host = peer[0] if isinstance(peer, tuple) else ""
+        if profiler is None or host not in ("127.0.0.1", "::1"):
+            sent = self.send(
+                client,
+                (403, "Forbidden"),
+                "Forbidden",
+                keep_alive=keep_alive,
+                head_only=request.method == "HEAD",
+            )
+            return keep_alive, 403, sent, PROFILE_ADMIN_PATH or "", "error"
+
+        if request.method == "POST" and "dump" in request.queries:
+            # ?dump=1 writes the files now instead of toggling.
+            profiler.flush()
+        elif request.method == "POST":
+            # POST toggles; ?enabled=1 / ?enabled=0 set it explicitly.
+            value = request.queries.get("enabled", [None])[0]
+            profiler.toggle(None if value is None else value.lower() in ("1", "true", "on"))
+        data = {
+            "enabled": profiler.enabled,
+            "sample_rate": profiler.sample_rate,
+            "routes": sorted(profiler.routes),
+            "directory": profiler.directory,
+            "profiles": profiler.counts,
+        }
+        sent = self.send(
+            client,
+            (200, "OK"),
+            json.dumps(data),
+            "application/json",
+            keep_alive,
+            head_only=request.method == "HEAD",
+        )
+        return keep_alive, 200, sent, PROFILE_ADMIN_PATH or "", "admin"
+
+    def _toggle_profiler(self, signum: int, frame: object) -> None:
+        if self._profiler is not None:
+            state = self._profiler.toggle()
+            print("Profiler %s (pid %d)" % ("enabled" if state else "disabled", os.getpid()))
+
+    def _send_cached(
+        self, client: socket.socket, entry: CacheEntry, head_only: bool, keep_alive: bool
+    ) -> int:
+        # Serialized when stored; only the per-request headers are added here.
+        tail = b"Age: %d\r\nX-Cache: HIT\r\n%s" % (entry.age(), CONNECTION[keep_alive])
+        try:
+            sent = write(client, (entry.head, tail) if head_only else (entry.head, tail, entry.body))
+            if not keep_alive:
+                client.close()
+            return sent
+        except TimeoutError:
+            raise
+        except OSError as e:
+            self.log(f"{Fore.RED}OSError: {Fore.LIGHTRED_EX}{repr(e)}")
+            return 0
+
+    def _response(self, client: socket.socket, request: Request, keep_alive: bool) -> Response:
+        return Response(
+            client,
+            keep_alive,
+            request.headers.get("Accept-Encoding", ""),
+            request.version,
+            request.method,
+        )
+
+    def _call(self, handler: _HandleType, request: Request, response: Response) -> None:
+        result = handler(request, response)
+        if inspect.isawaitable(result):
+            # Coroutine handlers outside the asyncio engine get a private event loop.
+            asyncio.run(_await(result))
+
     def send(
         self,
         client: socket.socket,
         status: Tuple[int, str],
         data: str | bytes,
         content_type: str = "",
+        keep_alive: bool = False,
+        headers: Dict[str, str] | None = None,
+        head_only: bool = False,
     ) -> int:
         if isinstance(data, str):
-            response = (
-                "HTTP/1.1 %s %s\r\nContent-Type: %s\r\n\r\n" % (*status, content_type)
-                + data
-            )
-            response = response.encode()
-        else:
-            response = (
-                "HTTP/1.1 %s %s\r\nContent-Type: %s\r\n\r\n" % (*status, content_type)
-            ).encode() + data
+            data = data.encode()
+        # 204 and 304 responses never carry a body.
+        length = None if status[0] in (204, 304) else len(data)
+        head = _head(status, content_type, length, keep_alive, headers)
         try:
-            status_ = client.send(response)
-            client.close()
+            # A HEAD response has the headers of the GET one, Content-Length included.
+            status_ = write(client, (head,) if head_only else (head, data))
+            if not keep_alive:
+                client.close()
             return status_
+        except TimeoutError:
+            # WRITE_TIMEOUT expired; the connection is dropped rather than written to again.
+            raise
+        except OSError as e:
+            self.log(f"{Fore.RED}OSError: {Fore.LIGHTRED_EX}{repr(e)}")
+            return 0
+
+    def send_file(
+        self,
+        client: socket.socket,
+        path: str | os.PathLike,
+        content_type: str = "",
+        keep_alive: bool = False,
+        headers: Dict[str, str] | None = None,
+    ) -> int:
+        try:
+            with open(path, "rb") as file:
+                size = os.fstat(file.fileno()).st_size
+                return self._send_open_file(
+                    client, file, size, content_type, keep_alive, headers
+                )
+        except TimeoutError:
+            raise
         except OSError as e:
             self.log(f"{Fore.RED}OSError: {Fore.LIGHTRED_EX}{repr(e)}")
             return 0
 
+    def _send_open_file(
+        self,
+        client: socket.socket,
+        file: BinaryIO,
+        size: int,
+        content_type: str,
+        keep_alive: bool,
+        headers: Dict[str, str] | None = None,
+        body: bool = True,
+        ranges: List[Tuple[int, int]] | None = None,
+    ) -> int:
+        status = (200, "OK")
+        parts = [(b"", 0, size)]
+        tail = b""
+        if ranges:
+            status = (206, "Partial Content")
+            if len(ranges) == 1:
+                start, end = ranges[0]
+                headers = dict(headers or {})
+                headers["Content-Range"] = "bytes %d-%d/%d" % (start, end, size)
+                parts = [(b"", start, end - start + 1)]
+            else:
+                boundary = secrets.token_hex(12)
+                parts, tail = byterange_parts(ranges, size, content_type, boundary)
+                content_type = "multipart/byteranges; boundary=" + boundary
+
+        length = sum(len(head) + count for head, _, count in parts) + len(tail)
+        head_ = _head(status, content_type, length, keep_alive, headers)
+        if body and len(parts) == 1 and length <= _SMALL_FILE:
+            file.seek(parts[0][1])
+            data = file.read(parts[0][2])
+            write(client, (head_, data))
+            if not keep_alive:
+                client.close()
+            return len(data)
+
+        write(client, (head_,))
+        status_ = 0
+        if body:
+            # Every part is copied straight from its file offset.
+            for head, start, count in parts:
+                if head:
+                    client.sendall(head)
+                status_ += send_file(client, file, start, count)
+            if tail:
+                client.sendall(tail)
+        if not keep_alive:
+            client.close()
+        return status_
+
+    def _send_static(
+        self,
+        client: socket.socket,
+        request: Request,
+        static: StaticFile,
+        keep_alive: bool,
+    ) -> Tuple[int, int] | None:
+        # A precompressed sibling is sent when the client accepts its coding.
+        static = static.negotiate(request.headers.get("Accept-Encoding", ""))
+        conditional = request.method in ("GET", "HEAD")
+        if conditional and static.not_modified(request.headers):
+            sent = self.send(
+                client, (304, "Not Modified"), b"", keep_alive=keep_alive, headers=static.headers
+            )
+            return 304, sent
+
+        try:
+            file = open(static.path, "rb")
+        except OSError:
+            # Removed since the index was built; let the 404 handling answer.
+            self._static.discard(static)
+            return None
+        status, sent = 200, 0
+        try:
+            with file:
+                # The descriptor is open anyway, so picking up edits costs one fstat.
+                static = self._static.refresh(static, os.fstat(file.fileno()))
+                ranges = None
+                range_ = request.headers.get("Range")
+                if range_ and request.method == "GET":
+                    if static.if_range(request.headers.get("If-Range")):
+                        ranges = parse_range(range_, static.size)
+                if ranges == []:
+                    sent = self.send(
+                        client,
+                        (416, "Range Not Satisfiable"),
+                        b"",
+                        keep_alive=keep_alive,
+                        headers={**static.headers, "Content-Range": "bytes */%d" % static.size},
+                    )
+                    return 416, sent
+                status = 206 if ranges else 200
+                sent = self._send_open_file(
+                    client,
+                    file,
+                    static.size,
+                    static.mimetype,
+                    keep_alive,
+                    static.headers,
+                    request.method != "HEAD",
+                    ranges,
+                )
+        except TimeoutError:
+            raise
+        except OSError as e:
+            self.log(f"{Fore.RED}OSError: {Fore.LIGHTRED_EX}{repr(e)}")
+        return status, sent
+
     def render_error(
         self,
         status: Tuple[int, str],
@@ -170,29 +776,33 @@ class WebServer(object):
         if os.path.exists(error_template):
             with open(error_template) as file:
                 data = file.read().replace("{{ pathname }}", request.path)
-                return self.send(client, status, data, "text/html")
+                return self.send(
+                    client, status, data, "text/html", head_only=request.method == "HEAD"
+                )
         data = {
             404: "URL '%s' Not Found" % request.path,
             405: "Method [%s] on '%s' Not Allowed" % (request.method, request.path),
         }.get(status_code, "%s - %s" % status)
-        return self.send(client, status, data)
+        return self.send(client, status, data, head_only=request.method == "HEAD")
 
     def run(
         self,
         callback: Callable[[socket.socket, str, int], None] | None = None,
         post_callback: Callable[[socket.socket], None] | None = None,
+        engine: Literal["thread", "asyncio"] = "thread",
+        processes: int | None = None,
     ) -> None:
-        def _close(server: socket.socket) -> None:
-            try:
-                server.close()
-            except OSError:
-                ...
+        processes = processes or PROCESSES
+        # Indexed before forking so every worker starts with the same table.
+        self._static.build()
+        if not DEBUG:
+            # Compiled once here instead of by the first request in every worker.
+            precompile_templates()
+        prefork = processes > 1 and hasattr(os, "fork")
+        if processes > 1 and not prefork:
+            self.log(f"{Fore.YELLOW}os.fork() unavailable, running a single process.")
 
-        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        server.bind((HOST, PORT))
-        server.listen(5)
-        server.settimeout(1)
+        server = listen(prefork and REUSE_PORT)
 
         post_callback = post_callback if post_callback else _close
         atexit.register(lambda: post_callback(server))
@@ -203,16 +813,82 @@ class WebServer(object):
             else print("Server listening on http://%s:%s" % (HOST, str(PORT)))
         )
 
+        if not prefork:
+            HotRestart(server, self.stop, RESTART_TIMEOUT).install()
+            self._serve(server, engine, notify_ready)
+            return
+
+        # SIGUSR1 sent to the supervisor toggles the profiler in every worker.
+        forward = [signal.SIGUSR1] if self._profiler is not None else []
+        if REUSE_PORT:
+            # Every worker binds its own socket; the kernel balances between them.
+            # The next generation binds its own too, so there is none to hand over.
+            _close(server)
+            supervisor = Supervisor(
+                lambda: self._serve(listen(True), engine), processes, forward, notify_ready
+            )
+            HotRestart(None, supervisor.stop, RESTART_TIMEOUT).install()
+        else:
+            supervisor = Supervisor(
+                lambda: self._serve(server, engine), processes, forward, notify_ready
+            )
+            HotRestart(server, supervisor.stop, RESTART_TIMEOUT).install()
+        supervisor.run()
+        _close(server)
+
+    def stop(self) -> None:
+        self._draining = True
+        if self._engine is not None:
+            self._engine.stop()
+
+    def _terminate(self, signum: int, frame: object) -> None:
+        self.stop()
+
+    def _serve(
+        self,
+        server: socket.socket,
+        engine: Literal["thread", "asyncio"] = "thread",
+        ready: Callable[[], None] | None = None,
+    ) -> None:
+        if self._profiler is not None and hasattr(signal, "SIGUSR1"):
+            signal.signal(signal.SIGUSR1, self._toggle_profiler)
+        # SIGTERM drains what is being served instead of dropping it.
+        signal.signal(signal.SIGTERM, self._terminate)
         try:
-            while True:
-                try:
-                    client_socket, _ = server.accept()
-                    client_socket.settimeout(60)
-                    threading.Thread(
-                        target=self.handleClient, args=(client_socket,)
-                    ).start()
-                except TimeoutError:
-                    ...
+            if engine == "asyncio":
+                self._engine = AsyncioEngine(self)
+                self._engine.serve(server, ready)
+            else:
+                self._pool = WorkerPool(self._accepted, WORKERS, MAX_QUEUE).start()
+                if ready is not None:
+                    ready()
+                accept(
+                    server,
+                    self._pool,
+                    self._connections,
+                    _no_delay,
+                    lambda: not self._draining,
+                    self._shed,
+                )
+                # Only this process's descriptor is closed; connections still queued on
+                # a handed over socket are accepted by the next generation.
+                _close(server)
+                self._drain()
+            self._access_log.close()
+            if self._profiler is not None:
+                self._profiler.close()
         except KeyboardInterrupt:
             _close(server)
-            exit(0)
\ No newline at end of file
+            if self._pool:
+                self._pool.shutdown(wait=False)
+            self._access_log.close()
+            if self._profiler is not None:
+                self._profiler.close()
+            exit(0)
+
+    def _drain(self) -> None:
+        # Idle keep-alive connections aren't cut: a client may be sending on one right
+        # now. Each closes after its next response or at KEEP_ALIVE_TIMEOUT.
+        if self._pool is not None:
+            # Queued connections come before the pool's stop markers, so they are served too.
+            self._pool.shutdown(wait=True, timeout=SHUTDOWN_TIMEOUT)
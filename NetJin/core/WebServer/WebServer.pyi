@@ -1,18 +1,23 @@
 from NetJin.http.response import Response
 from NetJin.http.request import Request
-from NetJin.types import Callable, List, RequestMethod, Tuple
+from NetJin.http.cache import CacheBackend, ResponseCache
+from NetJin.types import Callable, Dict, List, RequestMethod, Tuple, Literal
 
+from typing import Awaitable
 import socket
+import os
 from dataclasses import dataclass
 
 __all__ = ["WebServer"]
 
-_HandleType = Callable[[Request, Response], None]
+_HandleType = Callable[[Request, Response], None | Awaitable[None]]
 
 @dataclass
 class _RouteRecordType(object):
     handler: _HandleType
     methods: List[RequestMethod]
+    cache: ResponseCache | None = None
+    path: str = ""
 
 @dataclass
 class _ErrorRecordType(object):
@@ -27,7 +32,10 @@ class WebServer(object):
         """
 
     def route(
-        self, path: str, methods: List[RequestMethod] | None = None
+        self,
+        path: str,
+        methods: List[RequestMethod] | None = None,
+        cache: ResponseCache | float | None = None,
     ) -> Callable[[_HandleType], _HandleType]:
         """Create a Route using this decorator.
 
@@ -37,15 +45,56 @@ class WebServer(object):
             def home(Response response, Request request):
                 return request.send("Hello, World!")
 
+        Handlers may be plain functions or `async def` coroutines. Coroutines run on
+        the event loop when the server is started with engine="asyncio".
+
+        Route parameters are written as <name> or <converter:name>, where converter is
+        one of str (default), int, float, uuid or path (matches the rest of the URL,
+        slashes included). Routes are compiled into a tree when registered, so lookup
+        cost depends on the length of the URL rather than on the number of routes.
+
         Args:
             path (str): URL Fragment to which, the handler function is executed.
             methods (List[RequestMethod] | None, optional): Allowed HTTP Methods to which this method is triggered. Defaults to None.
+            cache (ResponseCache | float | None, optional): Cache the responses of this route, see cache(). A number is the TTL in seconds. Defaults to None.
 
         Returns:
             Callable[[_HandleType], _HandleType]: Callable method that handles the routing specific operations.
         """
         ...
 
+    def cache(
+        self,
+        ttl: float = 60,
+        vary: List[str] | None = None,
+        max_entries: int = 1024,
+        backend: CacheBackend | None = None,
+    ) -> Callable[[_HandleType], _HandleType]:
+        """Cache the complete responses of a route. Use with @route() in either order.
+
+        Example:
+            @app.route("/news")
+            @app.cache(ttl=60, vary=["Cookie"])
+            def news(request: Request, response: Response): ...
+
+        The bytes sent by a GET's response.send()/render() are stored, keyed on Host,
+        path, query string, negotiated content-coding and the `vary` request headers.
+        Later GET and HEAD requests for the same key are answered from the cache
+        without calling the handler, with `Age` and `X-Cache: HIT` headers (fresh
+        responses carry `X-Cache: MISS`). Only 200 responses without Set-Cookie or
+        `Cache-Control: no-store/private` are cached; streamed responses never are.
+
+        Args:
+            ttl (float, optional): Seconds a response is served from the cache. Defaults to 60.
+            vary (List[str] | None, optional): Request headers whose values select different responses. Defaults to None.
+            max_entries (int, optional): Size of the default in-memory LRU. Defaults to 1024.
+            backend (CacheBackend | None, optional): Where responses are kept; e.g. a DiskCache shared by all worker processes. Defaults to a per-process MemoryCache.
+
+        Returns:
+            Callable[[_HandleType], _HandleType]: Decorator for the handler.
+        """
+        ...
+
     def error_route(self, status_code: int) -> Callable[[_HandleType], _HandleType]:
         """Handle HTTP Error routing
 
@@ -57,27 +106,111 @@ class WebServer(object):
         """
         ...
 
+    @property
+    def queue_depth(self) -> int:
+        """Number of accepted connections waiting for a free worker thread."""
+        ...
+
     def log(self, *messages) -> None:
         """Logging out messages to the console."""
         ...
 
+    def handleClient(self, client: socket.socket) -> None:
+        """Serve requests from a connected client socket until it is closed.
+
+        Connections are persistent: HTTP/1.1 requests keep the connection open unless
+        they send `Connection: close`, HTTP/1.0 requests only when they ask for
+        keep-alive. The connection is closed after KEEP_ALIVE_MAX_REQUESTS requests or
+        when idle for KEEP_ALIVE_TIMEOUT seconds.
+
+        Slow clients are cut off: a request line and headers that take longer than
+        HEADER_TIMEOUT, or a body that stalls for BODY_TIMEOUT or averages under
+        MIN_BODY_RATE bytes/s, get a 408 and the connection is closed. A response
+        write blocked for WRITE_TIMEOUT closes the connection without an answer.
+        Each case is counted in netjin_client_timeouts_total when METRICS is on.
+
+        Args:
+            client (socket.socket): Client Socket
+        """
+        ...
+
+    def dispatch(
+        self, request: Request, client: socket.socket, keep_alive: bool = False
+    ) -> bool:
+        """Route a parsed request to its handler, a static file or an error page.
+
+        The request is recorded in the access log (ACCESS_LOG) with its status, the
+        bytes sent and the time taken; the line is written by a background thread.
+        With METRICS on it is also counted per route, and METRICS_PATH answers with the
+        counters and latency histograms in Prometheus text format.
+
+        Args:
+            request (Request): Parsed client request.
+            client (socket.socket): Client socket (or socket-like object) to respond on.
+            keep_alive (bool, optional): Whether the response may leave the connection open. Defaults to False.
+
+        Returns:
+            bool: True if the connection can be reused for another request.
+        """
+        ...
+
     def send(
         self,
         client: socket.socket,
         status: Tuple[int, str],
         data: str | bytes,
         content_type: str = "",
+        keep_alive: bool = False,
+        headers: Dict[str, str] | None = None,
+        head_only: bool = False,
     ) -> int:
-        """Sends response back to the client.
+        """Sends response back to the client. 204 and 304 responses are sent
+        without Content-Type, Content-Length or body.
 
         Args:
             client (socket.socket): Client socket to which response is to be sent.
             status (Tuple[int, str]): HTTP Status Code to send.
             data (str): Content of data to send.
             content_type (str, optional): ContentType header for response. Defaults to "".
+            keep_alive (bool, optional): Leave the connection open for another request instead of closing it. Defaults to False.
+            headers (Dict[str, str] | None, optional): Extra response headers. Defaults to None.
+            head_only (bool, optional): Answer to a HEAD request: the headers are sent, Content-Length included, without the body. Defaults to False.
 
         Returns:
             int: Amount of bytes sent.
+
+        Raises:
+            TimeoutError: The write blocked for WRITE_TIMEOUT; other socket errors are logged and 0 is returned.
+        """
+        ...
+
+    def send_file(
+        self,
+        client: socket.socket,
+        path: str | os.PathLike,
+        content_type: str = "",
+        keep_alive: bool = False,
+        headers: Dict[str, str] | None = None,
+    ) -> int:
+        """Sends a file back to the client without reading it into memory. The
+        headers are written first, then the kernel copies the file to the socket
+        (sendfile); clients without sendfile are fed slices of an mmap.
+
+        Files in STATIC_DIRS are served from an index built by run(), with ETag,
+        Last-Modified and STATIC_CACHE_CONTROL headers; conditional GET and HEAD
+        requests (If-None-Match, If-Modified-Since) get a bodyless 304. Range
+        requests (honouring If-Range) get a 206 with one range or a
+        multipart/byteranges body, read from file offsets, or a 416.
+
+        Args:
+            client (socket.socket): Client socket to which response is to be sent.
+            path (str | os.PathLike): File to send.
+            content_type (str, optional): ContentType header for response. Defaults to "".
+            keep_alive (bool, optional): Leave the connection open for another request instead of closing it. Defaults to False.
+            headers (Dict[str, str] | None, optional): Extra response headers. Defaults to None.
+
+        Returns:
+            int: Amount of body bytes sent.
         """
         ...
 
@@ -105,11 +238,28 @@ class WebServer(object):
         self,
         callback: Callable[[socket.socket, str, int], None] | None = None,
         post_callback: Callable[[socket.socket], None] | None = None,
+        engine: Literal["thread", "asyncio"] = "thread",
+        processes: int | None = None,
     ) -> None:
         """Start the server and subsequently handles incomming requests.
 
+        Connections are served by a pool of WORKERS threads, in PROCESSES forked workers
+        when there is more than one. SIGTERM drains (see stop()) and SIGHUP or SIGUSR2
+        restarts without downtime; see the README for deploying under a supervisor.
+
         Args:
             callback (((server: socket, host: str, port: int) -> None) | None, optional): Callback Function. It will be called when server starts listening. Defaults to None.
             post_callback (((server: socket) -> None) | None, optional): Callback function which will be called when server is turn off (intentionally or unintentionally) to release some resources. Defaults to None.
+            engine ("thread" | "asyncio", optional): "thread" serves connections from the worker pool; "asyncio" serves every connection from one event loop (see AsyncioEngine). Defaults to "thread".
+        """
+        ...
+
+    def stop(self) -> None:
+        """Stop accepting connections and let the ones being served finish.
+
+        Responses sent from now on close their connection, and run() returns once every
+        request has been answered or SHUTDOWN_TIMEOUT has passed. Safe to call from any
+        thread or a signal handler; SIGTERM calls it. In a pre-forked server it only
+        stops the worker it is called in.
         """
         ...
@@ -0,0 +1,126 @@
+from NetJin.utils import WorkerPool, inherited_socket
+from NetJin.http.writer import status_line, header_line, CONNECTION
+from NetJin.config import HOST, PORT, BACKLOG, MAX_HEADER_SIZE, RETRY_AFTER, QUEUE_TIMEOUT
+from NetJin.types import Callable, Tuple
+
+import threading
+import socket
+import time
+
+__all__ = ["listen", "limit", "reject", "accept", "admit", "expired", "UNAVAILABLE"]
+
+_Shed = Callable[[socket.socket, str], None]
+
+# Load shedding answer, serialized once: it is sent without parsing the request.
+UNAVAILABLE = b"".join(
+    [
+        status_line(503, "Service Unavailable"),
+        header_line("Content-Type", "text/plain"),
+        b"Content-Length: %d\r\n" % len(b"Service Unavailable"),
+        header_line("Retry-After", str(RETRY_AFTER)),
+        CONNECTION[False],
+        b"Service Unavailable",
+    ]
+)
+
+
+def listen(reuse_port: bool = False) -> socket.socket:
+    server = inherited_socket()
+    if server is not None:
+        if server.getsockname()[1] == PORT:
+            # Handed over by the previous generation, already listening.
+            server.settimeout(1)
+            return server
+        # PORT changed across the restart; the old socket stays with the old generation.
+        try:
+            server.close()
+        except OSError:
+            ...
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    server.bind((HOST, PORT))
+    server.listen(BACKLOG)
+    server.settimeout(1)
+    return server
+
+
+def limit(value: int) -> threading.BoundedSemaphore | None:
+    return threading.BoundedSemaphore(value) if value > 0 else None
+
+
+def reject(client: socket.socket, answer: bytes, close: bool = True) -> None:
+    # One non-blocking send: a rejected client is never waited on.
+    try:
+        if isinstance(client, socket.socket):
+            client.setblocking(False)
+        client.send(answer)
+        if not close:
+            return
+        if isinstance(client, socket.socket):
+            client.shutdown(socket.SHUT_WR)
+            # Whatever of the request already arrived is read and dropped, so
+            # closing doesn't reset the connection before the answer is read.
+            client.recv(MAX_HEADER_SIZE)
+    except OSError:
+        ...
+    if close:
+        try:
+            client.close()
+        except OSError:
+            ...
+
+
+def _shed(client: socket.socket, reason: str) -> None:
+    reject(client, UNAVAILABLE)
+
+
+def accept(
+    server: socket.socket,
+    pool: WorkerPool,
+    connections: threading.BoundedSemaphore | None,
+    prepare: Callable[[socket.socket], None],
+    running: Callable[[], bool] = lambda: True,
+    shed: _Shed = _shed,
+) -> None:
+    # Hands accepted connections to the pool, with the time they were accepted,
+    # until running() turns false. What the caps can't take gets a 503.
+    while running():
+        try:
+            client, _ = server.accept()
+        except TimeoutError:
+            continue
+        if connections is not None and not connections.acquire(blocking=False):
+            shed(client, "connections")
+            continue
+        prepare(client)
+        # A full queue is answered at once instead of stalling the accept loop.
+        if not pool.submit((client, time.monotonic()), block=False):
+            if connections is not None:
+                connections.release()
+            shed(client, "queue")
+
+
+def expired(queued_at: float) -> bool:
+    # The client has most likely given up; answering fast beats serving late.
+    return QUEUE_TIMEOUT > 0 and time.monotonic() - queued_at > QUEUE_TIMEOUT
+
+
+def admit(
+    item: Tuple[socket.socket, float],
+    handle: Callable[[socket.socket], None],
+    connections: threading.BoundedSemaphore | None,
+    shed: _Shed = _shed,
+) -> None:
+    # Worker side of accept(): serves the connection unless it waited past
+    # QUEUE_TIMEOUT, then frees its slot.
+    client, accepted_at = item
+    try:
+        if expired(accepted_at):
+            shed(client, "queue_timeout")
+            return
+        handle(client)
+    finally:
+        if connections is not None:
+            connections.release()
@@ -1,14 +1,18 @@
 from NetJin.types import Callable, List, RequestMethod, Dict, Tuple
-from NetJin.config import HOST, PORT, DEBUG, BASE_DIR
+from NetJin.config import HOST, PORT, DEBUG, BASE_DIR, WORKERS, MAX_QUEUE
+from NetJin.config import PROCESSES, REUSE_PORT, MAX_CONNECTIONS
+from NetJin.config import HEADER_TIMEOUT, BODY_TIMEOUT, WRITE_TIMEOUT
+from NetJin.core.admission import listen, limit, accept, admit
 from NetJin.http.request import Request
 from NetJin.http.response import Response
+from NetJin.http.writer import write, status_line, header_line, CONNECTION
+from NetJin.utils import Router, WorkerPool, Supervisor
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from colorama import init, Fore
 
 import datetime
-import threading
 import atexit
 
 import socket
@@ -20,6 +24,18 @@ init(True)
 _HandleType = Callable[[Request, Response], None]
 
 
+def _bounded(client: socket.socket) -> None:
+    # Subclasses read and write the socket themselves; this bounds each call.
+    client.settimeout(max(HEADER_TIMEOUT, BODY_TIMEOUT, WRITE_TIMEOUT) or None)
+
+
+def _close(server: socket.socket) -> None:
+    try:
+        server.close()
+    except OSError:
+        ...
+
+
 @dataclass
 class _RouteRecordType(object):
     handler: _HandleType
@@ -35,6 +51,9 @@ class AbstractBase(ABC):
     def __init__(self) -> None:
         self._routes: Dict[str, _RouteRecordType] = {}
         self._error_handlers: Dict[int, _ErrorRecordType] = {}
+        self._router = Router()
+        self._pool: WorkerPool | None = None
+        self._connections = limit(MAX_CONNECTIONS)
 
     def route(
         self, path: str, methods: List[RequestMethod] | None = None
@@ -42,6 +61,7 @@ class AbstractBase(ABC):
         def wrapper(handler: _HandleType) -> _HandleType:
             route = _RouteRecordType(handler, methods or ["GET"])
             self._routes[path] = route
+            self._router.add(path, route)
             return handler
 
         return wrapper
@@ -54,6 +74,10 @@ class AbstractBase(ABC):
 
         return wrapper
 
+    @property
+    def queue_depth(self) -> int:
+        return self._pool.queue_depth if self._pool else 0
+
     def log(self, *messages) -> None:
         date = datetime.datetime.now()
         date = f"{date:[%d of %B, %Y %I:%M:S %p]}"
@@ -70,20 +94,21 @@ class AbstractBase(ABC):
         status: Tuple[int, str],
         data: str | bytes,
         content_type: str = "",
+        keep_alive: bool = False,
+        head_only: bool = False,
     ) -> int:
         if isinstance(data, str):
-            response = (
-                "HTTP/1.1 %s %s\r\nContent-Type: %s\r\n\r\n" % (*status, content_type)
-                + data
-            )
-            response = response.encode()
-        else:
-            response = (
-                "HTTP/1.1 %s %s\r\nContent-Type: %s\r\n\r\n" % (*status, content_type)
-            ).encode() + data
+            data = data.encode()
+        head = (
+            status_line(*status)
+            + (header_line("Content-Type", content_type) if content_type else b"")
+            + b"Content-Length: %d\r\n" % len(data)
+            + CONNECTION[keep_alive]
+        )
         try:
-            status_ = client.send(response)
-            client.close()
+            status_ = write(client, (head,) if head_only else (head, data))
+            if not keep_alive:
+                client.close()
             return status_
         except OSError as e:
             self.log(f"{Fore.RED}OSError: {Fore.LIGHTRED_EX}{repr(e)}")
@@ -111,29 +136,27 @@ class AbstractBase(ABC):
         if os.path.exists(error_template):
             with open(error_template) as file:
                 data = file.read().replace("{{ pathname }}", request.path)
-                return self.send(client, status, data, "text/html")
+                return self.send(
+                    client, status, data, "text/html", head_only=request.method == "HEAD"
+                )
         data = {
             404: "URL '%s' Not Found" % request.path,
             405: "Method [%s] on '%s' Not Allowed" % (request.method, request.path),
         }.get(status_code, "%s - %s" % status)
-        return self.send(client, status, data)
+        return self.send(client, status, data, head_only=request.method == "HEAD")
 
     def run(
         self,
         callback: Callable[[socket.socket, str, int], None] | None = None,
         post_callback: Callable[[socket.socket], None] | None = None,
+        processes: int | None = None,
     ) -> None:
-        def _close(server: socket.socket) -> None:
-            try:
-                server.close()
-            except OSError:
-                ...
-
-        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        server.bind((HOST, PORT))
-        server.listen(5)
-        server.settimeout(1)
+        processes = processes or PROCESSES
+        prefork = processes > 1 and hasattr(os, "fork")
+        if processes > 1 and not prefork:
+            self.log(f"{Fore.YELLOW}os.fork() unavailable, running a single process.")
+
+        server = listen(prefork and REUSE_PORT)
 
         post_callback = post_callback if post_callback else _close
         atexit.register(lambda: post_callback(server))
@@ -144,16 +167,26 @@ class AbstractBase(ABC):
             else print("Server listening on http://%s:%s" % (HOST, str(PORT)))
         )
 
+        if not prefork:
+            self._serve(server)
+            return
+
+        if REUSE_PORT:
+            _close(server)
+            Supervisor(lambda: self._serve(listen(True)), processes).run()
+        else:
+            Supervisor(lambda: self._serve(server), processes).run()
+        _close(server)
+
+    def _serve(self, server: socket.socket) -> None:
         try:
-            while True:
-                try:
-                    client_socket, _ = server.accept()
-                    client_socket.settimeout(60)
-                    threading.Thread(
-                        target=self.handleClient, args=(client_socket,)
-                    ).start()
-                except TimeoutError:
-                    ...
+            self._pool = WorkerPool(self._accepted, WORKERS, MAX_QUEUE).start()
+            accept(server, self._pool, self._connections, _bounded)
         except KeyboardInterrupt:
             _close(server)
+            if self._pool:
+                self._pool.shutdown(wait=False)
             exit(0)
+
+    def _accepted(self, item: Tuple[socket.socket, float]) -> None:
+        admit(item, self.handleClient, self._connections)
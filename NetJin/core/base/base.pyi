@@ -37,6 +37,11 @@ class AbstractBase(ABC):
             def home(Response response, Request request):
                 return request.send("Hello, World!")
 
+        Route parameters are written as <name> or <converter:name>, where converter is
+        one of str (default), int, float, uuid or path (matches the rest of the URL,
+        slashes included). Routes are compiled into a tree when registered, so lookup
+        cost depends on the length of the URL rather than on the number of routes.
+
         Args:
             path (str): URL Fragment to which, the handler function is executed.
             methods (List[RequestMethod] | None, optional): Allowed HTTP Methods to which this method is triggered. Defaults to None.
@@ -57,6 +62,11 @@ class AbstractBase(ABC):
         """
         ...
 
+    @property
+    def queue_depth(self) -> int:
+        """Number of accepted connections waiting for a free worker thread."""
+        ...
+
     def log(self, *messages) -> None:
         """Logs out message on the Console."""
         ...
@@ -79,6 +89,8 @@ class AbstractBase(ABC):
         status: Tuple[int, str],
         data: str | bytes,
         content_type: str = "",
+        keep_alive: bool = False,
+        head_only: bool = False,
     ) -> int:
         """Sends response back to the client.
 
@@ -87,6 +99,8 @@ class AbstractBase(ABC):
             status (Tuple[int, str]): HTTP Status Code to send.
             data (str): Content of data to send.
             content_type (str, optional): ContentType header for response. Defaults to "".
+            keep_alive (bool, optional): Leave the connection open for another request instead of closing it. Defaults to False.
+            head_only (bool, optional): Answer to a HEAD request: the headers are sent, Content-Length included, without the body. Defaults to False.
 
         Returns:
             int: Amount of bytes sent.
@@ -117,11 +131,21 @@ class AbstractBase(ABC):
         self,
         callback: Callable[[socket.socket, str, int], None] | None = None,
         post_callback: Callable[[socket.socket], None] | None = None,
+        processes: int | None = None,
     ) -> None:
         """Start the server and subsequently handles incomming requests.
 
+        Accepted connections are queued (up to MAX_QUEUE) and handled by a fixed
+        pool of WORKERS threads that are reused across connections.
+
+        With more than one process the server forks that many workers once routes and
+        templates are registered. Workers share the listening socket (or bind their own
+        with SO_REUSEPORT when REUSE_PORT is set); the parent restarts workers that die
+        and forwards SIGINT/SIGTERM to them.
+
         Args:
             callback (((server: socket, host: str, port: int) -> None) | None, optional): Callback Function. It will be called when server starts listening. Defaults to None.
             post_callback (((server: socket) -> None) | None, optional): Callback function which will be called when server is turn off (intentionally or unintentionally) to release some resources. Defaults to None.
+            processes (int | None, optional): Number of worker processes. Defaults to PROCESSES from settings.
         """
         ...
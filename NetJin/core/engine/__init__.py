@@ -0,0 +1 @@
+from .engine import *  # noqa: F403
@@ -0,0 +1,508 @@
+from NetJin.http.request import Request, create_request_object
+from NetJin.http.parser import RequestError, RequestTimeout, body_framing, chunk_size
+from NetJin.http.parser import expects_continue, check_rate
+from NetJin.config import WORKERS, KEEP_ALIVE_TIMEOUT, MAX_HEADER_SIZE, MAX_BODY_SIZE
+from NetJin.config import SPOOL_MAX_SIZE, MEDIA_DIR, BACKLOG, SHUTDOWN_TIMEOUT
+from NetJin.config import HEADER_TIMEOUT, BODY_TIMEOUT, MIN_BODY_RATE, WRITE_TIMEOUT
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Awaitable, BinaryIO, Callable, Mapping, Sequence, Set
+from colorama import Fore, init
+import traceback
+import time
+import tempfile
+import threading
+import asyncio
+import inspect
+import socket
+import os
+
+if TYPE_CHECKING:
+    from NetJin.core.WebServer import WebServer
+    from NetJin.core.WebServer.WebServer import _RouteRecordType
+
+__all__ = ["AsyncioEngine"]
+init(True)
+
+# asyncio's default transport write buffer high-water mark.
+_HIGH_WATER = 64 * 1024
+# Bytes per sendfile() call on the loop; each must finish within WRITE_TIMEOUT.
+_SENDFILE_PIECE = 256 * 1024
+# Seconds a rejected connection is kept open for its request to arrive.
+_SHED_LINGER = 1
+# Bytes read from a body at a time.
+_BODY_CHUNK = 65536
+_CONTINUE = b"HTTP/1.1 100 Continue\r\n\r\n"
+
+
+class _StreamClient(object):
+    def __init__(
+        self, writer: asyncio.StreamWriter, loop: asyncio.AbstractEventLoop
+    ) -> None:
+        self._writer = writer
+        self._loop = loop
+        self._thread = threading.get_ident()
+        # Set by close() from an executor thread; the connection closes once the
+        # handler returns, after what is left of the request has been read.
+        self.closing = False
+
+    def _on_loop(self) -> bool:
+        return threading.get_ident() == self._thread
+
+    def send(self, data: bytes) -> int:
+        if isinstance(data, memoryview):
+            # The transport may keep unsent data past this call; don't pin the buffer.
+            data = data.tobytes()
+        if self._on_loop():
+            # Buffered by the transport; callers await drain() for backpressure.
+            self._writer.write(data)
+        else:
+            self._run(self._write(data))
+        return len(data)
+
+    def sendall(self, data: bytes) -> None:
+        self.send(data)
+
+    def sendmsg(self, buffers: Sequence[bytes | bytearray | memoryview]) -> int:
+        # Queued whole on the transport, which may keep views of them after this
+        # returns; copies keep callers free to reuse their buffers.
+        data = [buffer if isinstance(buffer, bytes) else bytes(buffer) for buffer in buffers]
+        if self._on_loop():
+            self._queue(data)
+        else:
+            self._run(self._writelines(data))
+        return sum(len(buffer) for buffer in data)
+
+    def _queue(self, data: Sequence[bytes]) -> None:
+        if len(data) > 1 and sum(len(buffer) for buffer in data) > _HIGH_WATER:
+            # writelines() doesn't pause the protocol when the transport buffer
+            # fills up (CPython 3.12), so drain() wouldn't wait; write() does.
+            self._writer.writelines(data[:-1])
+            self._writer.write(data[-1])
+        else:
+            self._writer.writelines(data)
+
+    def sendfile(self, file: BinaryIO, offset: int = 0, count: int | None = None) -> int:
+        if self._on_loop():
+            file.seek(offset)
+            return self.send(file.read(count) if count is not None else file.read())
+        return self._run(self._sendfile(file, offset, count))
+
+    def _run(self, coroutine: Awaitable[Any]) -> Any:
+        # From an executor thread; the loop does the writing.
+        future = asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+        return future.result()
+
+    async def _write(self, data: bytes) -> None:
+        self._writer.write(data)
+        await self.drain()
+
+    async def _writelines(self, data: Sequence[bytes]) -> None:
+        self._queue(data)
+        await self.drain()
+
+    async def _sendfile(self, file: BinaryIO, offset: int, count: int | None) -> int:
+        await self.drain()
+        if count is None:
+            count = os.fstat(file.fileno()).st_size - offset
+        sent = 0
+        # In pieces, so WRITE_TIMEOUT bounds a stalled client rather than the whole file.
+        while sent < count:
+            # Uses os.sendfile on the transport's socket where the event loop supports it.
+            piece = await asyncio.wait_for(
+                self._loop.sendfile(
+                    self._writer.transport,
+                    file,
+                    offset + sent,
+                    min(count - sent, _SENDFILE_PIECE),
+                ),
+                WRITE_TIMEOUT or None,
+            )
+            if not piece:
+                break
+            sent += piece
+        return sent
+
+    async def drain(self) -> None:
+        # Raises TimeoutError when the client stops reading for WRITE_TIMEOUT.
+        await asyncio.wait_for(self._writer.drain(), WRITE_TIMEOUT or None)
+
+    def getpeername(self) -> Any:
+        return self._writer.get_extra_info("peername")
+
+    def close(self) -> None:
+        if self._on_loop():
+            self._writer.close()
+        else:
+            self.closing = True
+
+
+def _is_multipart(request: Request) -> bool:
+    content_type = request.headers.get("Content-Type", "")
+    return content_type.partition(";")[0].strip().lower() == "multipart/form-data"
+
+
+async def _receive(awaitable: Awaitable[bytes], timeout: float | None, phase: str) -> bytes:
+    try:
+        return await asyncio.wait_for(awaitable, timeout)
+    except asyncio.TimeoutError:
+        raise RequestTimeout(phase) from None
+
+
+class _Transfer(object):
+    # Time spent waiting on one request body and the bytes it brought, for MIN_BODY_RATE.
+    __slots__ = ("waited", "received")
+
+    def __init__(self) -> None:
+        self.waited = 0.0
+        self.received = 0
+
+    async def receive(self, awaitable: Awaitable[bytes]) -> bytes:
+        start = time.monotonic()
+        data = await _receive(awaitable, BODY_TIMEOUT or None, "body")
+        self.waited += time.monotonic() - start
+        self.received += len(data)
+        check_rate(self.received, self.waited, BODY_TIMEOUT, MIN_BODY_RATE)
+        return data
+
+
+class _StreamBody(object):
+    # BodyReader over an asyncio stream. Handlers on the executor block on the loop
+    # for each read; async routes get their body read before they run.
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        loop: asyncio.AbstractEventLoop,
+        headers: Mapping[str, str],
+    ) -> None:
+        length, chunked = body_framing(headers, MAX_BODY_SIZE)
+        self._reader = reader
+        self._writer = writer
+        self._loop = loop
+        self._remaining = length or 0
+        self._chunked = chunked
+        self._expect_continue = expects_continue(headers)
+        self._received = 0
+        self._transfer = _Transfer()
+        self._done = not chunked and not length
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    def read(self, size: int = -1) -> bytes:
+        if self._done:
+            return b""
+        # From an executor thread; the loop does the reading.
+        future = asyncio.run_coroutine_threadsafe(self.aread(size), self._loop)
+        return future.result()
+
+    async def aread(self, size: int = -1) -> bytes:
+        parts = []
+        while size and not self._done:
+            data = await self._read_some(_BODY_CHUNK if size < 0 else size)
+            parts.append(data)
+            if size > 0:
+                size -= len(data)
+        return b"".join(parts)
+
+    async def drain(self, limit: int = 65536) -> bool:
+        if self._expect_continue or (not self._chunked and self._remaining > limit):
+            return False
+        while not self._done:
+            limit -= len(await self._read_some(_BODY_CHUNK))
+            if limit < 0:
+                return False
+        return True
+
+    async def _read_some(self, size: int) -> bytes:
+        if self._expect_continue:
+            self._expect_continue = False
+            self._writer.write(_CONTINUE)
+
+        if self._chunked and not self._remaining:
+            self._remaining = chunk_size(await self._transfer.receive(self._reader.readline()))
+            if not self._remaining:
+                while (await self._transfer.receive(self._reader.readline())).strip():
+                    ...
+                self._done = True
+                return b""
+
+        data = await self._transfer.receive(self._reader.read(min(size, self._remaining)))
+        if not data:
+            raise RequestError((400, "Bad Request"), "Incomplete request body")
+        self._remaining -= len(data)
+        self._received += len(data)
+        if self._received > MAX_BODY_SIZE:
+            raise RequestError((413, "Content Too Large"))
+
+        if not self._remaining:
+            if self._chunked:
+                if await self._transfer.receive(self._reader.readexactly(2)) != b"\r\n":
+                    raise RequestError((400, "Bad Request"), "Invalid chunk")
+            else:
+                self._done = True
+        return data
+
+
+class AsyncioEngine(object):
+    def __init__(self, app: "WebServer") -> None:
+        self._app = app
+        self._executor = ThreadPoolExecutor(
+            WORKERS, thread_name_prefix="NetJin-executor"
+        )
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stopping: asyncio.Event | None = None
+        # Every connection's task, waited for when draining.
+        self._tasks: Set["asyncio.Task[None]"] = set()
+
+    def serve(self, server: socket.socket, ready: Callable[[], None] | None = None) -> None:
+        try:
+            asyncio.run(self._serve(server, ready))
+        finally:
+            self._executor.shutdown(wait=False)
+
+    def stop(self) -> None:
+        # Called from signal handlers and other threads alike.
+        if self._loop is not None and self._stopping is not None:
+            self._loop.call_soon_threadsafe(self._stopping.set)
+
+    async def _serve(self, server: socket.socket, ready: Callable[[], None] | None) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        aserver = await asyncio.start_server(
+            self.handle, sock=server, limit=MAX_HEADER_SIZE, backlog=BACKLOG
+        )
+        if ready is not None:
+            ready()
+        if self._app._draining:
+            # stop() came before the loop was running.
+            self._stopping.set()
+        try:
+            await self._stopping.wait()
+        finally:
+            aserver.close()
+        # Drained like WebServer._drain().
+        if self._tasks:
+            await asyncio.wait(set(self._tasks), timeout=SHUTDOWN_TIMEOUT)
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        client = _StreamClient(writer, loop)
+        served = 0
+        task = asyncio.current_task()
+        metrics = self._app._metrics
+        connections, inflight = self._app._connections, self._app._inflight
+        if connections is not None and not connections.acquire(blocking=False):
+            await self._shed(reader, writer, client, "connections")
+            return
+        if metrics is not None:
+            metrics.connection_opened()
+        if task is not None:
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        try:
+            while True:
+                # Timed like WebServer.handleClient().
+                idle = (KEEP_ALIVE_TIMEOUT if served else HEADER_TIMEOUT) or None
+                first = await _receive(reader.read(1), idle, "idle")
+                if not first:
+                    return
+                try:
+                    head = first + await _receive(
+                        reader.readuntil(b"\r\n\r\n"), HEADER_TIMEOUT or None, "header"
+                    )
+                except asyncio.LimitOverrunError:
+                    raise RequestError((431, "Request Header Fields Too Large"))
+                if inflight is not None and not inflight.acquire(blocking=False):
+                    await self._shed(reader, writer, client, "inflight")
+                    return
+                served += 1
+                try:
+                    keep_alive = await self._request(
+                        loop, reader, writer, client, head, served
+                    )
+                finally:
+                    if inflight is not None:
+                        inflight.release()
+
+                if not keep_alive:
+                    return
+        except RequestTimeout as e:
+            # Reading the request head; nothing has been answered yet.
+            if self._app._timed_out(client, e.phase, True, close=False):
+                await self._linger(reader, writer)
+        except RequestError as e:
+            self._app.send(client, e.status, str(e))
+        except TimeoutError:
+            # A response write blocked past WRITE_TIMEOUT; what the transport still
+            # buffers is dropped instead of flushed on close.
+            self._app._timed_out(client, "write", False, close=False)
+            writer.transport.abort()
+        except (
+            asyncio.IncompleteReadError,
+            asyncio.LimitOverrunError,
+            ConnectionError,
+        ):
+            ...
+        except asyncio.CancelledError:
+            # Cut off at shutdown. Ending normally keeps asyncio.streams from
+            # reporting the cancelled task as an unhandled exception.
+            writer.transport.abort()
+        except Exception:
+            print(f"{Fore.RED}{traceback.format_exc()}")
+        finally:
+            if metrics is not None:
+                metrics.connection_closed()
+            if connections is not None:
+                connections.release()
+            await self._closed(writer)
+
+    async def _shed(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        client: "_StreamClient",
+        reason: str,
+    ) -> None:
+        self._app._shed(client, reason, close=False)
+        await self._linger(reader, writer)
+
+    async def _linger(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            writer.write_eof()
+            # Closing with the request unread would reset the connection and could
+            # discard the answer before the client reads it.
+            await asyncio.wait_for(reader.read(MAX_HEADER_SIZE), _SHED_LINGER)
+        except (asyncio.TimeoutError, ConnectionError, OSError):
+            ...
+        await self._closed(writer)
+
+    async def _closed(self, writer: asyncio.StreamWriter) -> None:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            ...
+
+    async def _request(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        client: "_StreamClient",
+        head: bytes,
+        served: int,
+    ) -> bool:
+        request = create_request_object(head)
+        if not request.method or not request.path:
+            return False
+        body = _StreamBody(reader, writer, loop, request.headers)
+        request._stream = body
+        spool = None
+
+        keep_alive = self._app._keep_alive(request, served)
+        route = self._coroutine_route(request)
+        try:
+            if route is None:
+                # Sync handlers, static files and error pages block, so they
+                # run on the executor and write back through the loop.
+                keep_alive = await loop.run_in_executor(
+                    self._executor,
+                    self._app._dispatch_queued,
+                    request,
+                    client,
+                    keep_alive,
+                    time.monotonic(),
+                )
+                return await self._finish(reader, writer, client, body, keep_alive)
+
+            peer = self._app._log_peer(client)
+            start = time.perf_counter()
+            response = self._app._response(client, request, keep_alive)
+            status, sent, source = 500, 0, "error"
+            try:
+                if not body.done:
+                    if _is_multipart(request):
+                        # Uploads are spooled once, by the form parser.
+                        await loop.run_in_executor(self._executor, request._parse_form)
+                    else:
+                        request._stream = spool = await self._spool(body)
+                await route.handler(request, response)
+                await response.drain()
+                keep_alive = response.keep_alive and response.bytes_sent > 0
+                status, sent, source = response.status or 500, response.bytes_sent, "dynamic"
+            except (TimeoutError, ConnectionError):
+                raise
+            except RequestError as e:
+                keep_alive, status, sent = self._app._rejected(client, response, e, close=False)
+            except Exception:
+                keep_alive, status, sent = self._app._failed(client, response)
+            finally:
+                self._app._record(peer, request, status, sent, route.path, source, start)
+            return await self._finish(reader, writer, client, body, keep_alive)
+        finally:
+            request.close()
+            if spool is not None:
+                spool.close()
+
+    async def _finish(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        client: "_StreamClient",
+        body: _StreamBody,
+        keep_alive: bool,
+    ) -> bool:
+        # Whether the connection takes another request, once what the handler left
+        # of the body is read.
+        try:
+            if keep_alive and not client.closing and await body.drain():
+                return True
+        except RequestTimeout as e:
+            self._app._timed_out(client, e.phase, False, close=False)
+            return False
+        except RequestError:
+            return False
+        if not body.done:
+            await self._linger(reader, writer)
+        return False
+
+    async def _spool(self, body: _StreamBody) -> BinaryIO:
+        # Async routes can't block on reads, so their body is received first;
+        # large ones spill to MEDIA_DIR.
+        os.makedirs(MEDIA_DIR, exist_ok=True)
+        spool = tempfile.SpooledTemporaryFile(SPOOL_MAX_SIZE, dir=MEDIA_DIR)
+        try:
+            while not body.done:
+                spool.write(await body.aread(_BODY_CHUNK))
+        except BaseException:
+            spool.close()
+            raise
+        spool.seek(0)
+        return spool
+
+    def _coroutine_route(self, request: Request) -> "_RouteRecordType | None":
+        match = self._app._router.lookup(request.path, request.method)
+        if match is None:
+            return None
+
+        route_info, route_ = match
+        if request.method not in route_info.methods:
+            return None
+        if not inspect.iscoroutinefunction(route_info.handler):
+            return None
+        if route_info.cache is not None:
+            # Cached routes go through dispatch(), which serves hits and stores misses.
+            return None
+
+        if not request.user_parameters:
+            request.user_parameters = route_
+        else:
+            request.user_parameters.update(route_)
+        return route_info
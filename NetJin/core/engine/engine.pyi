@@ -0,0 +1,48 @@
+from typing import TYPE_CHECKING, Callable
+
+import asyncio
+import socket
+
+if TYPE_CHECKING:
+    from NetJin.core.WebServer import WebServer
+
+__all__ = ["AsyncioEngine"]
+
+class AsyncioEngine(object):
+    """Serve a WebServer from a single asyncio event loop.
+
+    Connections are read with asyncio streams, so idle and slow clients cost no
+    threads. `async def` route handlers run on the event loop; plain handlers, static
+    files and error pages run on a thread pool of WORKERS threads.
+
+    Plain handlers receive the request body as they read it, like in the thread
+    engine. An async handler can't wait on reads, so its body is received before it
+    runs: multipart forms are parsed straight into MEDIA_DIR, other bodies over
+    SPOOL_MAX_SIZE are spooled there.
+
+    Slow clients are handled as in the thread engine: HEADER_TIMEOUT, BODY_TIMEOUT
+    and MIN_BODY_RATE answer with a 408, WRITE_TIMEOUT closes the connection.
+    """
+
+    def __init__(self, app: "WebServer") -> None: ...
+
+    def serve(self, server: socket.socket, ready: Callable[[], None] | None = None) -> None:
+        """Run the event loop and accept connections on an already listening socket
+        until interrupted or stopped.
+
+        Args:
+            server (socket.socket): Bound and listening server socket.
+            ready ((() -> None) | None, optional): Called once connections are being accepted. Defaults to None.
+        """
+        ...
+
+    def stop(self) -> None:
+        """Close the listening socket and return from serve() once the open connections
+        are done, or after SHUTDOWN_TIMEOUT. Thread-safe."""
+        ...
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Handle a single client connection (asyncio.start_server callback)."""
+        ...
@@ -0,0 +1,252 @@
+from NetJin.http.compression import negotiate
+from NetJin.http.writer import status_line, header_line
+from NetJin.http.request import Request
+from NetJin.types import Dict, List
+from collections import OrderedDict
+from abc import ABC, abstractmethod
+from typing import Iterable
+import threading
+import tempfile
+import hashlib
+import struct
+import time
+import os
+
+__all__ = ["CacheEntry", "CacheBackend", "MemoryCache", "DiskCache", "ResponseCache"]
+
+# stored_at, expires, length of head
+_DISK_HEADER = struct.Struct("!ddI")
+
+
+class CacheEntry(object):
+    __slots__ = ("head", "body", "stored_at", "expires")
+
+    def __init__(self, head: bytes, body: bytes, stored_at: float, expires: float) -> None:
+        # Status line and headers, without Connection and the closing blank line.
+        self.head = head
+        self.body = body
+        self.stored_at = stored_at
+        self.expires = expires
+
+    @classmethod
+    def build(
+        cls, status: int, headers: Dict[str, str], body: bytes, ttl: float
+    ) -> "CacheEntry":
+        head = status_line(status) + b"Content-Length: %d\r\n" % len(body)
+        head += b"".join(
+            header_line(key, value)
+            for key, value in headers.items()
+            if key.lower() != "connection"
+        )
+        now = time.time()
+        return cls(head, body, now, now + ttl)
+
+    @property
+    def size(self) -> int:
+        return len(self.head) + len(self.body)
+
+    def fresh(self, now: float | None = None) -> bool:
+        return (now if now is not None else time.time()) < self.expires
+
+    def age(self, now: float | None = None) -> int:
+        return max(int((now if now is not None else time.time()) - self.stored_at), 0)
+
+
+class CacheBackend(ABC):
+    @abstractmethod
+    def get(self, key: str) -> CacheEntry | None:
+        raise NotImplementedError("Abstract method must be implemented in child class.")
+
+    @abstractmethod
+    def set(self, key: str, entry: CacheEntry) -> None:
+        raise NotImplementedError("Abstract method must be implemented in child class.")
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        raise NotImplementedError("Abstract method must be implemented in child class.")
+
+    @abstractmethod
+    def clear(self) -> None:
+        raise NotImplementedError("Abstract method must be implemented in child class.")
+
+
+class MemoryCache(CacheBackend):
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> CacheEntry | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if not entry.fresh():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        if entry.size > self.max_bytes:
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = entry
+            self._bytes += entry.size
+            # Least recently used entries go first.
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskCache(CacheBackend):
+    def __init__(self, directory: str | os.PathLike, max_entries: int = 4096) -> None:
+        self.directory = os.fspath(directory)
+        self.max_entries = max_entries
+        os.makedirs(self.directory, exist_ok=True)
+        # Entries this process believes are on disk, counting every write; None until
+        # the first scan. Only past max_entries plus a tenth is the directory scanned,
+        # which resets it to the real count, shared with other processes.
+        self._count: int | None = None
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest())
+
+    def get(self, key: str) -> CacheEntry | None:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except OSError:
+            return None
+        try:
+            stored_at, expires, head_size = _DISK_HEADER.unpack_from(data)
+        except struct.error:
+            return None
+        entry = CacheEntry(
+            data[_DISK_HEADER.size : _DISK_HEADER.size + head_size],
+            data[_DISK_HEADER.size + head_size :],
+            stored_at,
+            expires,
+        )
+        if not entry.fresh():
+            self.delete(key)
+            return None
+        # The access time drives eviction; mtime keeps recording the write.
+        try:
+            os.utime(path, (time.time(), os.stat(path).st_mtime))
+        except OSError:
+            ...
+        return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        fd, temp = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(_DISK_HEADER.pack(entry.stored_at, entry.expires, len(entry.head)))
+                file.write(entry.head)
+                file.write(entry.body)
+            # Other processes see either the old entry or the complete new one.
+            os.replace(temp, self._path(key))
+        except OSError:
+            try:
+                os.remove(temp)
+            except OSError:
+                ...
+            return
+        if self._count is not None:
+            self._count += 1
+        if self._count is None or self._count > self.max_entries + max(1, self.max_entries // 10):
+            self._evict()
+
+    def _evict(self) -> None:
+        try:
+            files = [item for item in os.scandir(self.directory) if not item.name.startswith(".")]
+        except OSError:
+            return
+        self._count = len(files)
+        if len(files) <= self.max_entries:
+            return
+        files.sort(key=lambda item: item.stat().st_atime)
+        for item in files[: len(files) - self.max_entries]:
+            try:
+                os.remove(item.path)
+                self._count -= 1
+            except OSError:
+                ...
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            ...
+
+    def clear(self) -> None:
+        for item in os.scandir(self.directory):
+            try:
+                os.remove(item.path)
+            except OSError:
+                ...
+        self._count = 0
+
+
+class ResponseCache(object):
+    def __init__(
+        self,
+        ttl: float = 60,
+        vary: Iterable[str] | None = None,
+        max_entries: int = 1024,
+        backend: CacheBackend | None = None,
+    ) -> None:
+        self.ttl = ttl
+        self.vary: List[str] = list(vary or [])
+        self.backend = backend if backend is not None else MemoryCache(max_entries)
+
+    def key(self, request: Request) -> str:
+        # Keyed on the coding that would be negotiated, not the raw header, since
+        # compressed bodies are stored as they were sent. HEAD shares the GET entry:
+        # the full body is captured either way, and dropped when answering a HEAD.
+        encoding = negotiate(request.headers.get("Accept-Encoding", ""), ("gzip", "deflate"))
+        method = "GET" if request.method == "HEAD" else request.method
+        host = request.headers.get("Host", "").lower()
+        parts = [method, host, request.path, request.query, encoding or "identity"]
+        parts.extend(request.headers.get(name, "") for name in self.vary)
+        return "\0".join(parts)
+
+    def get(self, request: Request) -> CacheEntry | None:
+        return self.backend.get(self.key(request))
+
+    def store(
+        self, request: Request, status: int, headers: Dict[str, str], body: bytes
+    ) -> None:
+        self.backend.set(self.key(request), CacheEntry.build(status, headers, body, self.ttl))
+
+    def cacheable(self, status: int, headers: Dict[str, str]) -> bool:
+        if status != 200:
+            return False
+        for key, value in headers.items():
+            key = key.lower()
+            if key == "set-cookie":
+                return False
+            if key == "cache-control" and ("no-store" in value or "private" in value):
+                return False
+        return True
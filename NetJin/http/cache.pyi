@@ -0,0 +1,105 @@
+from NetJin.http.request import Request
+from NetJin.types import Dict, List
+from abc import ABC, abstractmethod
+from typing import Iterable
+import os
+
+__all__ = ["CacheEntry", "CacheBackend", "MemoryCache", "DiskCache", "ResponseCache"]
+
+class CacheEntry(object):
+    """A serialized response kept by a CacheBackend."""
+
+    head: bytes
+    """Status line and headers, without Connection and the closing blank line."""
+    body: bytes
+    stored_at: float
+    """Unix time the response was stored."""
+    expires: float
+    """Unix time after which the entry is not served any more."""
+
+    def __init__(self, head: bytes, body: bytes, stored_at: float, expires: float) -> None: ...
+    @classmethod
+    def build(
+        cls, status: int, headers: Dict[str, str], body: bytes, ttl: float
+    ) -> "CacheEntry":
+        """Serialize a response that is fresh for ttl seconds from now."""
+        ...
+
+    @property
+    def size(self) -> int:
+        """Amount of bytes held by the entry."""
+        ...
+
+    def fresh(self, now: float | None = None) -> bool: ...
+    def age(self, now: float | None = None) -> int:
+        """Seconds since the response was stored, for the Age header."""
+        ...
+
+class CacheBackend(ABC):
+    """Storage of a ResponseCache. Implementations must be thread-safe and never
+    return expired entries."""
+
+    @abstractmethod
+    def get(self, key: str) -> CacheEntry | None: ...
+    @abstractmethod
+    def set(self, key: str, entry: CacheEntry) -> None: ...
+    @abstractmethod
+    def delete(self, key: str) -> None: ...
+    @abstractmethod
+    def clear(self) -> None: ...
+
+class MemoryCache(CacheBackend):
+    """In-process LRU bounded by entry count and total size. Every worker process
+    keeps its own."""
+
+    max_entries: int
+    max_bytes: int
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024) -> None: ...
+    def get(self, key: str) -> CacheEntry | None: ...
+    def set(self, key: str, entry: CacheEntry) -> None: ...
+    def delete(self, key: str) -> None: ...
+    def clear(self) -> None: ...
+    def __len__(self) -> int: ...
+
+class DiskCache(CacheBackend):
+    """One file per entry in a directory, shared by every process that uses it
+    (e.g. the workers of run(processes=N)). Entries are replaced atomically and
+    the least recently read are removed beyond max_entries. The directory is only
+    scanned once this process's writes may have taken it a tenth past max_entries."""
+
+    directory: str
+    max_entries: int
+
+    def __init__(self, directory: str | os.PathLike, max_entries: int = 4096) -> None: ...
+    def get(self, key: str) -> CacheEntry | None: ...
+    def set(self, key: str, entry: CacheEntry) -> None: ...
+    def delete(self, key: str) -> None: ...
+    def clear(self) -> None: ...
+
+class ResponseCache(object):
+    """Caching policy of a route; see WebServer.cache()."""
+
+    ttl: float
+    vary: List[str]
+    backend: CacheBackend
+
+    def __init__(
+        self,
+        ttl: float = 60,
+        vary: Iterable[str] | None = None,
+        max_entries: int = 1024,
+        backend: CacheBackend | None = None,
+    ) -> None: ...
+    def key(self, request: Request) -> str:
+        """Method, Host, path, query string, negotiated content-coding and `vary`
+        header values. HEAD requests share the entry of the GET one."""
+        ...
+
+    def get(self, request: Request) -> CacheEntry | None: ...
+    def store(
+        self, request: Request, status: int, headers: Dict[str, str], body: bytes
+    ) -> None: ...
+    def cacheable(self, status: int, headers: Dict[str, str]) -> bool:
+        """Whether a response may be stored: 200, no Set-Cookie, not no-store/private."""
+        ...
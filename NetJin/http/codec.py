@@ -0,0 +1,131 @@
+from abc import ABC, abstractmethod
+from typing import Any
+import dataclasses
+import datetime
+import decimal
+import json
+import enum
+import uuid
+
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
+
+try:
+    import ujson  # type: ignore
+except ImportError:
+    ujson = None
+
+__all__ = [
+    "JSONCodec",
+    "StdlibCodec",
+    "OrjsonCodec",
+    "UjsonCodec",
+    "get_codec",
+    "json_default",
+]
+
+
+def json_default(value: Any) -> Any:
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        # Shallow; the encoder comes back here for nested values.
+        return {field.name: getattr(value, field.name) for field in dataclasses.fields(value)}
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (uuid.UUID, decimal.Decimal)):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError("Object of type %s is not JSON serializable" % type(value).__name__)
+
+
+class JSONCodec(ABC):
+    name = ""
+
+    @abstractmethod
+    def dumps(self, value: Any) -> bytes:
+        raise NotImplementedError("Abstract method must be implemented in child class.")
+
+    @abstractmethod
+    def loads(self, data: bytes | str) -> Any:
+        raise NotImplementedError("Abstract method must be implemented in child class.")
+
+    def __repr__(self) -> str:
+        return "%s()" % type(self).__name__
+
+
+class StdlibCodec(JSONCodec):
+    name = "json"
+
+    def __init__(self) -> None:
+        # One encoder for every call; it is stateless, so threads share it.
+        self._encoder = json.JSONEncoder(
+            ensure_ascii=False, separators=(",", ":"), default=json_default
+        )
+
+    def dumps(self, value: Any) -> bytes:
+        return self._encoder.encode(value).encode()
+
+    def loads(self, data: bytes | str) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    name = "orjson"
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise ImportError("The orjson codec needs the orjson package")
+        # Dataclasses, datetimes and UUIDs are native to orjson; int keys are
+        # turned into strings as the stdlib does.
+        self._option = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, value: Any) -> bytes:
+        return orjson.dumps(value, default=json_default, option=self._option)
+
+    def loads(self, data: bytes | str) -> Any:
+        return orjson.loads(data)
+
+
+class UjsonCodec(JSONCodec):
+    name = "ujson"
+
+    def __init__(self) -> None:
+        if ujson is None:
+            raise ImportError("The ujson codec needs the ujson package")
+
+    def dumps(self, value: Any) -> bytes:
+        try:
+            return ujson.dumps(
+                value, ensure_ascii=False, escape_forward_slashes=False, default=json_default
+            ).encode()
+        except OverflowError as e:
+            raise ValueError(str(e)) from None
+
+    def loads(self, data: bytes | str) -> Any:
+        return ujson.loads(data)
+
+
+_CODECS = {"orjson": OrjsonCodec, "ujson": UjsonCodec, "json": StdlibCodec}
+
+
+def get_codec(codec: "str | JSONCodec" = "auto") -> JSONCodec:
+    if not isinstance(codec, str):
+        return codec
+    if codec == "auto":
+        # Fastest installed first.
+        if orjson is not None:
+            return OrjsonCodec()
+        if ujson is not None:
+            return UjsonCodec()
+        return StdlibCodec()
+    try:
+        return _CODECS[codec]()
+    except KeyError:
+        raise ValueError(
+            "Unknown JSON_CODEC %r; use 'auto', %s or a JSONCodec"
+            % (codec, ", ".join(repr(name) for name in _CODECS))
+        ) from None
@@ -0,0 +1,95 @@
+from abc import ABC, abstractmethod
+from typing import Any
+
+__all__ = [
+    "JSONCodec",
+    "StdlibCodec",
+    "OrjsonCodec",
+    "UjsonCodec",
+    "get_codec",
+    "json_default",
+]
+
+def json_default(value: Any) -> Any:
+    """Fallback for values JSON has no type for, shared by every codec: datetimes,
+    dates and times become ISO 8601 strings, dataclass instances objects of their
+    fields, enums their value, UUIDs and Decimals strings and sets lists.
+
+    Raises:
+        TypeError: For any other type.
+    """
+    ...
+
+class JSONCodec(ABC):
+    """Serializer used by Response.send(), Response.json_stream() and Request.json().
+
+    Implementations must be thread-safe. Set JSON_CODEC to an instance to use
+    your own.
+    """
+
+    name: str
+    """Short name, as accepted by JSON_CODEC."""
+
+    @abstractmethod
+    def dumps(self, value: Any) -> bytes:
+        """Serialize value to UTF-8 JSON.
+
+        Raises:
+            TypeError: value (or something inside it) can't be serialized.
+            ValueError: value can't be represented, e.g. it is circular.
+        """
+        ...
+
+    @abstractmethod
+    def loads(self, data: bytes | str) -> Any:
+        """Parse a JSON document.
+
+        Raises:
+            ValueError: data isn't valid JSON.
+        """
+        ...
+
+class StdlibCodec(JSONCodec):
+    """The json module with its C accelerator; compact separators, non-ASCII
+    characters left as they are."""
+
+    def __init__(self) -> None: ...
+    def dumps(self, value: Any) -> bytes: ...
+    def loads(self, data: bytes | str) -> Any: ...
+
+class OrjsonCodec(JSONCodec):
+    """orjson, several times faster than the stdlib. Non-string dict keys are
+    converted to strings; integers must fit in 64 bits.
+
+    Raises:
+        ImportError: orjson is not installed.
+    """
+
+    def __init__(self) -> None: ...
+    def dumps(self, value: Any) -> bytes: ...
+    def loads(self, data: bytes | str) -> Any: ...
+
+class UjsonCodec(JSONCodec):
+    """ujson, with forward slashes left unescaped and Decimals written as numbers.
+
+    Raises:
+        ImportError: ujson is not installed.
+    """
+
+    def __init__(self) -> None: ...
+    def dumps(self, value: Any) -> bytes: ...
+    def loads(self, data: bytes | str) -> Any: ...
+
+def get_codec(codec: str | JSONCodec = "auto") -> JSONCodec:
+    """Codec for a JSON_CODEC setting.
+
+    Args:
+        codec (str | JSONCodec, optional): "orjson", "ujson", "json" (the stdlib), a
+            JSONCodec instance, which is returned as it is, or "auto" for orjson,
+            then ujson, whichever is installed, else the stdlib. Defaults to "auto".
+
+    Raises:
+        ImportError: The named codec's package is not installed.
+        ValueError: Unknown codec name.
+    """
+    ...
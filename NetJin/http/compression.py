@@ -0,0 +1,122 @@
+from NetJin.types import Dict, List
+from typing import Iterable
+import mimetypes
+import gzip
+import zlib
+import os
+
+try:
+    import brotli  # type: ignore
+except ImportError:
+    brotli = None
+
+__all__ = [
+    "negotiate",
+    "compressible",
+    "compress",
+    "compressor",
+    "precompress",
+    "STATIC_ENCODINGS",
+]
+
+# Sibling suffix of precompressed static files, in order of preference.
+STATIC_ENCODINGS: Dict[str, str] = {"br": ".br", "gzip": ".gz"}
+
+
+def negotiate(accept_encoding: str, available: Iterable[str]) -> str | None:
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding] = weight
+
+    best: str | None = None
+    best_weight = 0.0
+    # Ties go to the server's order of `available`.
+    for coding in available:
+        weight = weights.get(coding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+def compressible(content_type: str, types: Iterable[str]) -> bool:
+    media_type = content_type.partition(";")[0].strip().lower()
+    return any(
+        media_type.startswith(type_) if type_.endswith("/") else media_type == type_
+        for type_ in types
+    )
+
+
+def compress(data: bytes, encoding: str, level: int = 6) -> bytes:
+    if encoding == "gzip":
+        # mtime=0 keeps the output, and any ETag derived from it, deterministic.
+        return gzip.compress(data, min(level, 9), mtime=0)
+    if encoding == "deflate":
+        # HTTP "deflate" is the zlib format, not a raw deflate stream.
+        return zlib.compress(data, min(level, 9))
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(data, quality=min(level, 11))
+    raise ValueError("Unsupported content-coding %r" % encoding)
+
+
+def compressor(encoding: str, level: int = 6) -> "zlib._Compress":
+    # Incremental variant of compress() for bodies sent in pieces.
+    if encoding == "gzip":
+        return zlib.compressobj(min(level, 9), zlib.DEFLATED, 31)
+    if encoding == "deflate":
+        return zlib.compressobj(min(level, 9), zlib.DEFLATED, 15)
+    raise ValueError("Unsupported content-coding %r" % encoding)
+
+
+def precompress(
+    directories: Iterable[str | os.PathLike],
+    types: Iterable[str],
+    min_size: int = 0,
+    level: int = 9,
+) -> List[str]:
+    types = list(types)
+    encodings = ["gzip"] + (["br"] if brotli is not None else [])
+    suffixes = tuple(STATIC_ENCODINGS.values())
+    written: List[str] = []
+
+    for directory in directories:
+        for dirpath, _, filenames in os.walk(directory, followlinks=True):
+            for filename in filenames:
+                if filename.endswith(suffixes):
+                    continue
+                path = os.path.join(dirpath, filename)
+                mimetype = mimetypes.guess_type(path)[0] or ""
+                if not compressible(mimetype, types):
+                    continue
+                stat_ = os.stat(path)
+                if stat_.st_size < min_size:
+                    continue
+
+                data: bytes | None = None
+                for encoding in encodings:
+                    target = path + STATIC_ENCODINGS[encoding]
+                    if os.path.exists(target) and os.stat(target).st_mtime >= stat_.st_mtime:
+                        continue
+                    if data is None:
+                        with open(path, "rb") as file:
+                            data = file.read()
+                    compressed = compress(data, encoding, level)
+                    if len(compressed) >= len(data):
+                        continue
+                    with open(target, "wb") as file:
+                        file.write(compressed)
+                    # Same mtime as the source; the index skips variants older than it.
+                    os.utime(target, ns=(stat_.st_atime_ns, stat_.st_mtime_ns))
+                    written.append(target)
+    return written
@@ -0,0 +1,65 @@
+from NetJin.types import Dict, List
+from typing import Iterable
+import zlib
+import os
+
+__all__ = [
+    "negotiate",
+    "compressible",
+    "compress",
+    "compressor",
+    "precompress",
+    "STATIC_ENCODINGS",
+]
+
+STATIC_ENCODINGS: Dict[str, str]
+"""Suffix of precompressed static siblings by content-coding, "br" before "gzip"."""
+
+def negotiate(accept_encoding: str, available: Iterable[str]) -> str | None:
+    """Pick the content-coding to use from an Accept-Encoding header.
+
+    Args:
+        accept_encoding (str): Accept-Encoding header of the request.
+        available (Iterable[str]): Codings the server can produce, most preferred first.
+
+    Returns:
+        str | None: Coding with the highest q-value (ties go to `available` order),
+        or None when the identity should be sent.
+    """
+    ...
+
+def compressible(content_type: str, types: Iterable[str]) -> bool:
+    """Whether a Content-Type is listed in `types` (see COMPRESSION_TYPES)."""
+    ...
+
+def compress(data: bytes, encoding: str, level: int = 6) -> bytes:
+    """Encode data as "gzip", "deflate" or, with brotli installed, "br".
+
+    Raises:
+        ValueError: For any other coding.
+    """
+    ...
+
+def compressor(encoding: str, level: int = 6) -> "zlib._Compress":
+    """Incremental "gzip" or "deflate" compressor, for bodies sent in pieces.
+
+    Raises:
+        ValueError: For any other coding.
+    """
+    ...
+
+def precompress(
+    directories: Iterable[str | os.PathLike],
+    types: Iterable[str],
+    min_size: int = 0,
+    level: int = 9,
+) -> List[str]:
+    """Write ".gz" (and ".br" when brotli is installed) siblings of the
+    compressible files in the directories, which the static file index serves
+    to clients that accept them. Up to date siblings and variants that would not
+    be smaller are skipped. Also available as `python -m NetJin precompress`.
+
+    Returns:
+        List[str]: Paths of the files written.
+    """
+    ...
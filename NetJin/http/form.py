@@ -0,0 +1,231 @@
+from NetJin.http.parser import RequestError
+from NetJin.types import Dict, List, Tuple
+from email.parser import BytesHeaderParser
+from email.message import Message
+from typing import BinaryIO, Iterable
+from urllib.parse import unquote_plus
+import tempfile
+import shutil
+import os
+
+__all__ = ["UploadedFile", "parse_form"]
+
+_Form = Dict[str, List[str]]
+_Files = Dict[str, List["UploadedFile"]]
+
+_PREAMBLE, _DELIMITER, _HEADERS, _DATA, _DONE = range(5)
+
+
+class UploadedFile(object):
+    def __init__(
+        self,
+        name: str,
+        filename: str,
+        content_type: str,
+        spool_size: int,
+        spool_dir: str | None = None,
+    ) -> None:
+        self.name = name
+        self.filename = filename
+        self.content_type = content_type
+        self.size = 0
+        if spool_dir:
+            os.makedirs(spool_dir, exist_ok=True)
+        # Kept in memory up to spool_size bytes, then moved to a temporary file.
+        self.file: BinaryIO = tempfile.SpooledTemporaryFile(
+            spool_size, dir=spool_dir
+        )  # type: ignore
+
+    def write(self, data: bytes | bytearray) -> None:
+        self.file.write(data)
+        self.size += len(data)
+
+    def read(self, size: int = -1) -> bytes:
+        return self.file.read(size)
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        return self.file.seek(offset, whence)
+
+    def save(self, destination: str | os.PathLike, chunk_size: int = 65536) -> int:
+        self.file.seek(0)
+        with open(destination, "wb") as file:
+            shutil.copyfileobj(self.file, file, chunk_size)
+        self.file.seek(0)
+        return self.size
+
+    def close(self) -> None:
+        self.file.close()
+
+    def __repr__(self) -> str:
+        return "<UploadedFile %r (%s, %d bytes)>" % (
+            self.filename,
+            self.content_type,
+            self.size,
+        )
+
+
+def _parse_header(value: str, header: str) -> Message:
+    message = Message()
+    message[header] = value
+    return message
+
+
+def parse_form(
+    content_type: str,
+    chunks: Iterable[bytes],
+    spool_size: int,
+    spool_dir: str | None = None,
+    max_size: int = 2 * 1024 * 1024,
+) -> Tuple[_Form, _Files]:
+    message = _parse_header(content_type, "content-type")
+    media_type = message.get_content_type()
+
+    if media_type == "application/x-www-form-urlencoded":
+        charset = message.get_content_charset("utf-8")
+        return _parse_urlencoded(chunks, charset, max_size), {}
+
+    if media_type == "multipart/form-data":
+        boundary = message.get_param("boundary")
+        if not isinstance(boundary, str) or not boundary:
+            raise RequestError((400, "Bad Request"), "Missing multipart boundary")
+        return _parse_multipart(
+            chunks, boundary.encode("latin-1"), spool_size, spool_dir, max_size
+        )
+
+    return {}, {}
+
+
+def _parse_urlencoded(chunks: Iterable[bytes], charset: str, max_size: int) -> _Form:
+    form: _Form = {}
+    buffer = bytearray()
+    received = 0
+
+    def add(pair: bytes) -> None:
+        if not pair:
+            return
+        key, _, value = pair.decode(charset, "replace").partition("=")
+        form.setdefault(unquote_plus(key), []).append(unquote_plus(value))
+
+    for chunk in chunks:
+        received += len(chunk)
+        if received > max_size:
+            raise RequestError((413, "Content Too Large"), "Form data too large")
+        buffer += chunk
+        # Complete pairs are parsed as soon as their "&" arrives.
+        end = buffer.rfind(b"&")
+        if end != -1:
+            for pair in bytes(buffer[:end]).split(b"&"):
+                add(pair)
+            del buffer[: end + 1]
+    add(bytes(buffer))
+    return form
+
+
+def _parse_multipart(
+    chunks: Iterable[bytes],
+    boundary: bytes,
+    spool_size: int,
+    spool_dir: str | None,
+    max_size: int,
+) -> Tuple[_Form, _Files]:
+    form: _Form = {}
+    files: _Files = {}
+    delimiter = b"\r\n--" + boundary
+    # The leading CRLF lets the first boundary match the same delimiter as the rest.
+    buffer = bytearray(b"\r\n")
+    state = _PREAMBLE
+    field_size = 0
+    name = ""
+    value = bytearray()
+    upload: UploadedFile | None = None
+
+    def fail(message: str) -> RequestError:
+        for uploads in files.values():
+            for item in uploads:
+                item.close()
+        if upload is not None:
+            upload.close()
+        return RequestError((400, "Bad Request"), message)
+
+    for chunk in chunks:
+        buffer += chunk
+        while True:
+            if state == _PREAMBLE or state == _DATA:
+                end = buffer.find(delimiter)
+                if end == -1:
+                    # Hold back what could be the start of a split delimiter.
+                    end = len(buffer) - len(delimiter) + 1
+                    found = False
+                else:
+                    found = True
+
+                if state == _DATA and end > 0:
+                    if upload is not None:
+                        upload.write(buffer[:end])
+                    else:
+                        field_size += end
+                        if field_size > max_size:
+                            raise fail("Form data too large")
+                        value += buffer[:end]
+
+                if not found:
+                    if end > 0:
+                        del buffer[:end]
+                    break
+
+                del buffer[: end + len(delimiter)]
+                if state == _DATA:
+                    if upload is not None:
+                        upload.seek(0)
+                        files.setdefault(name, []).append(upload)
+                        upload = None
+                    else:
+                        field = value.decode("utf-8", "replace")
+                        form.setdefault(name, []).append(field)
+                        value = bytearray()
+                state = _DELIMITER
+
+            if state == _DELIMITER:
+                if len(buffer) < 2:
+                    break
+                if buffer[:2] == b"--":
+                    state = _DONE
+                    break
+                end = buffer.find(b"\r\n")
+                if end == -1:
+                    break
+                # Transport padding after the boundary is allowed before the CRLF.
+                if buffer[:end].strip(b" \t"):
+                    raise fail("Invalid multipart boundary")
+                del buffer[: end + 2]
+                state = _HEADERS
+
+            if state == _HEADERS:
+                end = buffer.find(b"\r\n\r\n")
+                if end == -1:
+                    if len(buffer) > 16 * 1024:
+                        raise fail("Multipart headers too large")
+                    break
+                headers = BytesHeaderParser().parsebytes(bytes(buffer[: end + 4]))
+                del buffer[: end + 4]
+
+                name = headers.get_param("name", "", "content-disposition")  # type: ignore
+                filename = headers.get_filename()
+                if filename is not None:
+                    upload = UploadedFile(
+                        str(name),
+                        os.path.basename(filename),
+                        headers.get_content_type(),
+                        spool_size,
+                        spool_dir,
+                    )
+                state = _DATA
+
+            if state == _DONE:
+                # Ignore the epilogue after the closing boundary.
+                del buffer[:]
+                break
+
+    if state != _DONE:
+        raise fail("Incomplete multipart body")
+    return form, files
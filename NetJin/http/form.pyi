@@ -0,0 +1,67 @@
+from NetJin.types import Dict, List, Tuple
+from typing import BinaryIO, Iterable
+import os
+
+__all__ = ["UploadedFile", "parse_form"]
+
+class UploadedFile(object):
+    """A file received in a multipart/form-data request.
+
+    The content is kept in memory up to SPOOL_MAX_SIZE bytes and spills to a
+    temporary file in MEDIA_DIR beyond that, so large uploads don't grow memory.
+    """
+
+    name: str
+    """Name of the form field."""
+    filename: str
+    """Client supplied file name, without directory components."""
+    content_type: str
+    size: int
+    """Amount of bytes received."""
+    file: BinaryIO
+    """Underlying SpooledTemporaryFile, positioned at the start."""
+
+    def __init__(
+        self,
+        name: str,
+        filename: str,
+        content_type: str,
+        spool_size: int,
+        spool_dir: str | None = None,
+    ) -> None: ...
+    def write(self, data: bytes | bytearray) -> None: ...
+    def read(self, size: int = -1) -> bytes: ...
+    def seek(self, offset: int, whence: int = 0) -> int: ...
+    def save(self, destination: str | os.PathLike, chunk_size: int = 65536) -> int:
+        """Copy the upload to destination in chunks.
+
+        Returns:
+            int: Amount of bytes written.
+        """
+        ...
+
+    def close(self) -> None:
+        """Release the temporary storage. Called by the server after the request."""
+        ...
+
+def parse_form(
+    content_type: str,
+    chunks: Iterable[bytes],
+    spool_size: int,
+    spool_dir: str | None = None,
+    max_size: int = 2 * 1024 * 1024,
+) -> Tuple[Dict[str, List[str]], Dict[str, List[UploadedFile]]]:
+    """Parse an application/x-www-form-urlencoded or multipart/form-data body as its
+    chunks arrive.
+
+    Args:
+        content_type (str): Content-Type header of the request.
+        chunks (Iterable[bytes]): Body chunks, e.g. Request.stream().
+        spool_size (int): Upload bytes kept in memory before spilling to disk.
+        spool_dir (str | None, optional): Directory for spilled uploads. Defaults to None.
+        max_size (int, optional): Limit for non-file field data held in memory. Defaults to 2 MiB.
+
+    Returns:
+        Tuple[Dict[str, List[str]], Dict[str, List[UploadedFile]]]: Form fields and uploaded files.
+    """
+    ...
@@ -0,0 +1,55 @@
+from NetJin.http.parser import decode_head
+from NetJin.types import Dict, List, Tuple
+from typing import Iterator, Mapping
+
+__all__ = ["Headers"]
+
+
+class Headers(Mapping[str, str]):
+    __slots__ = ("_raw", "_fields")
+
+    def __init__(self, raw: bytes | str = b"") -> None:
+        # Header block without the request line, parsed on first lookup.
+        self._raw = raw
+        self._fields: Dict[str, Tuple[str, List[str]]] | None = None
+
+    def _parse(self) -> Dict[str, Tuple[str, List[str]]]:
+        fields: Dict[str, Tuple[str, List[str]]] = {}
+        raw = self._raw if isinstance(self._raw, str) else decode_head(self._raw)
+        for line in raw.split("\r\n"):
+            name, colon, value = line.partition(":")
+            if not colon:
+                continue
+            name = name.strip()
+            key = name.lower()
+            if key in fields:
+                fields[key][1].append(value.strip())
+            else:
+                fields[key] = (name, [value.strip()])
+        self._fields = fields
+        return fields
+
+    def __getitem__(self, name: str) -> str:
+        fields = self._fields if self._fields is not None else self._parse()
+        # Repeated fields are combined into one comma-separated value.
+        return ", ".join(fields[name.lower()][1])
+
+    def __contains__(self, name: object) -> bool:
+        fields = self._fields if self._fields is not None else self._parse()
+        return isinstance(name, str) and name.lower() in fields
+
+    def __iter__(self) -> Iterator[str]:
+        fields = self._fields if self._fields is not None else self._parse()
+        return (name for name, _ in fields.values())
+
+    def __len__(self) -> int:
+        fields = self._fields if self._fields is not None else self._parse()
+        return len(fields)
+
+    def get_all(self, name: str) -> List[str]:
+        fields = self._fields if self._fields is not None else self._parse()
+        field = fields.get(name.lower())
+        return list(field[1]) if field else []
+
+    def __repr__(self) -> str:
+        return "Headers(%r)" % dict(self.items())
@@ -0,0 +1,20 @@
+from NetJin.types import List
+from typing import Iterator, Mapping
+
+__all__ = ["Headers"]
+
+class Headers(Mapping[str, str]):
+    """Case-insensitive, read-only view of an HTTP header block.
+
+    The raw bytes are kept as received and only split into fields on the first
+    lookup. Repeated fields are joined with ", "; use get_all() to get them apart.
+    """
+
+    def __init__(self, raw: bytes | str = b"") -> None: ...
+    def __getitem__(self, name: str) -> str: ...
+    def __contains__(self, name: object) -> bool: ...
+    def __iter__(self) -> Iterator[str]: ...
+    def __len__(self) -> int: ...
+    def get_all(self, name: str) -> List[str]:
+        """Every value of a repeated header, in the order received."""
+        ...
@@ -0,0 +1,288 @@
+from NetJin.types import Tuple
+from typing import Iterator, Mapping
+import socket
+import time
+import re
+
+__all__ = [
+    "RequestReader",
+    "BodyReader",
+    "RequestError",
+    "RequestTimeout",
+    "body_framing",
+    "check_rate",
+    "chunk_size",
+    "decode_head",
+    "expects_continue",
+]
+
+_HEAD_END = b"\r\n\r\n"
+# Hex digits only, and few enough to stay a sane size.
+_CHUNK_SIZE = re.compile(rb"[0-9A-Fa-f]{1,16}")
+_CONTINUE = b"HTTP/1.1 100 Continue\r\n\r\n"
+
+
+class RequestError(Exception):
+    def __init__(self, status: Tuple[int, str], message: str = "") -> None:
+        super().__init__(message or status[1])
+        self.status = status
+
+
+class RequestTimeout(RequestError):
+    # phase is "idle" (no request begun), "header" or "body".
+    def __init__(self, phase: str) -> None:
+        super().__init__((408, "Request Timeout"), "Request %s timed out" % phase)
+        self.phase = phase
+
+
+def decode_head(head: bytes) -> str:
+    # Headers are ISO-8859-1 by the spec, but browsers send UTF-8 paths and cookies.
+    try:
+        return head.decode()
+    except UnicodeDecodeError:
+        return head.decode("latin-1")
+
+
+def _header(headers: Mapping[str, str], name: str) -> str | None:
+    # Request.headers is case-insensitive.
+    value = headers.get(name)
+    return value.strip() if value is not None else None
+
+
+def expects_continue(headers: Mapping[str, str]) -> bool:
+    expect = _header(headers, "expect")
+    return expect is not None and expect.lower() == "100-continue"
+
+
+def body_framing(headers: Mapping[str, str], limit: int) -> Tuple[int | None, bool]:
+    transfer_encoding = _header(headers, "transfer-encoding")
+    if transfer_encoding is not None:
+        if transfer_encoding.lower().rsplit(",", 1)[-1].strip() != "chunked":
+            raise RequestError((501, "Not Implemented"), "Unsupported Transfer-Encoding")
+        return None, True
+
+    content_length = _header(headers, "content-length")
+    if content_length is None:
+        return 0, False
+    try:
+        length = int(content_length)
+    except ValueError:
+        raise RequestError((400, "Bad Request"), "Invalid Content-Length") from None
+    if length < 0:
+        raise RequestError((400, "Bad Request"), "Invalid Content-Length")
+    if length > limit:
+        raise RequestError((413, "Content Too Large"))
+    return length, False
+
+
+def check_rate(received: int, waited: float, grace: float, min_rate: int) -> None:
+    # Slow-drip uploads pass a per-read timeout; their average rate gives them away.
+    if min_rate and waited > grace and received < min_rate * waited:
+        raise RequestTimeout("body")
+
+
+def chunk_size(line: bytes) -> int:
+    # "1a;name=value\r\n" -> 26; chunk extensions are ignored. int() alone would
+    # also take "-3", "+5", "0x1a" and "1_0"; a negative size never finishes the body.
+    digits = line.split(b";", 1)[0].strip()
+    if not _CHUNK_SIZE.fullmatch(digits):
+        raise RequestError((400, "Bad Request"), "Invalid chunk size")
+    return int(digits, 16)
+
+
+class RequestReader(object):
+    def __init__(
+        self,
+        client: socket.socket,
+        max_header_size: int = 65536,
+        max_body_size: int = 1024 * 1024 * 1024,
+        chunk_size: int = 65536,
+        header_timeout: float = 0,
+        body_timeout: float = 0,
+        min_body_rate: int = 0,
+        write_timeout: float = 0,
+    ) -> None:
+        self._client = client
+        self._max_header_size = max_header_size
+        self._max_body_size = max_body_size
+        self._chunk_size = chunk_size
+        self._header_timeout = header_timeout
+        self._body_timeout = body_timeout
+        self._min_body_rate = min_body_rate
+        self._write_timeout = write_timeout or None
+        # Bytes received past the current request, kept for the next one.
+        self._buffer = bytearray()
+        # Seconds spent waiting on, and bytes received of, the current body.
+        self._waited = 0.0
+        self._received = 0
+        self._timeout = client.gettimeout()
+
+    def _settimeout(self, timeout: float | None) -> None:
+        # Set only on change; every call is a syscall.
+        if timeout != self._timeout:
+            self._client.settimeout(timeout)
+            self._timeout = timeout
+
+    def read_head(self, idle_timeout: float | None = None) -> bytes | None:
+        # The first byte may take idle_timeout; the header timeout runs from its arrival.
+        start = 0
+        deadline = None
+        if self._buffer:
+            deadline = time.monotonic() + self._header_timeout
+        while True:
+            end = self._buffer.find(_HEAD_END, start)
+            if end != -1:
+                end += len(_HEAD_END)
+                if end > self._max_header_size:
+                    raise RequestError((431, "Request Header Fields Too Large"))
+                head = bytes(self._buffer[:end])
+                del self._buffer[:end]
+                # Whatever blocks next is a response write, or a body read that sets its own.
+                self._settimeout(self._write_timeout)
+                return head
+
+            if len(self._buffer) > self._max_header_size:
+                raise RequestError((431, "Request Header Fields Too Large"))
+
+            # Resume the search where a split terminator could begin.
+            start = max(0, len(self._buffer) - len(_HEAD_END) + 1)
+            if deadline is None:
+                # 0 waits for the next request indefinitely; settimeout(0) would make
+                # the socket non-blocking.
+                self._settimeout(idle_timeout or None)
+            elif self._header_timeout:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise RequestTimeout("header")
+                self._settimeout(remaining)
+            else:
+                self._settimeout(None)
+            try:
+                chunk = self._client.recv(self._chunk_size)
+            except TimeoutError:
+                raise RequestTimeout("header" if deadline is not None else "idle") from None
+            if not chunk:
+                if self._buffer.strip():
+                    raise RequestError((400, "Bad Request"), "Incomplete request")
+                return None
+            if deadline is None:
+                deadline = time.monotonic() + self._header_timeout
+            self._buffer += chunk
+
+    def body(self, headers: Mapping[str, str]) -> "BodyReader":
+        length, chunked = body_framing(headers, self._max_body_size)
+        self._waited, self._received = 0.0, 0
+        return BodyReader(self, length, chunked, expects_continue(headers))
+
+    def _recv(self) -> bytes:
+        self._settimeout(self._body_timeout or None)
+        start = time.monotonic()
+        try:
+            chunk = self._client.recv(self._chunk_size)
+        except TimeoutError:
+            raise RequestTimeout("body") from None
+        finally:
+            self._settimeout(self._write_timeout)
+        if not chunk:
+            raise RequestError((400, "Bad Request"), "Incomplete request body")
+        self._waited += time.monotonic() - start
+        self._received += len(chunk)
+        check_rate(self._received, self._waited, self._body_timeout, self._min_body_rate)
+        return chunk
+
+    def _take(self, size: int) -> bytes:
+        if not self._buffer:
+            self._buffer += self._recv()
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def _readline(self) -> bytes:
+        start = 0
+        while True:
+            end = self._buffer.find(b"\r\n", start)
+            if end != -1:
+                line = bytes(self._buffer[:end])
+                del self._buffer[: end + 2]
+                return line
+            if len(self._buffer) > self._max_header_size:
+                raise RequestError((400, "Bad Request"), "Chunk header too long")
+            start = max(0, len(self._buffer) - 1)
+            self._buffer += self._recv()
+
+
+class BodyReader(object):
+    def __init__(
+        self,
+        reader: RequestReader,
+        length: int | None,
+        chunked: bool,
+        expect_continue: bool = False,
+    ) -> None:
+        self._reader = reader
+        # Bytes left in a Content-Length body, or in the current chunk.
+        self._remaining = length or 0
+        self._chunked = chunked
+        self._expect_continue = expect_continue
+        self._received = 0
+        self._done = not chunked and not length
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0:
+            return b"".join(self)
+
+        parts = []
+        while size > 0 and not self._done:
+            data = self._read_some(size)
+            parts.append(data)
+            size -= len(data)
+        return b"".join(parts)
+
+    def __iter__(self) -> Iterator[bytes]:
+        while not self._done:
+            data = self._read_some(self._reader._chunk_size)
+            if data:
+                yield data
+
+    def drain(self, limit: int = 65536) -> bool:
+        # Discard an unread body so the next request starts at the right byte.
+        # Bodies larger than limit are not worth reading; the caller closes instead.
+        if self._expect_continue or (not self._chunked and self._remaining > limit):
+            return False
+        while not self._done:
+            limit -= len(self._read_some(self._reader._chunk_size))
+            if limit < 0:
+                return False
+        return True
+
+    def _read_some(self, size: int) -> bytes:
+        if self._expect_continue:
+            self._expect_continue = False
+            self._reader._client.sendall(_CONTINUE)
+
+        if self._chunked and not self._remaining:
+            self._remaining = chunk_size(self._reader._readline())
+            if not self._remaining:
+                # Last chunk; skip trailer fields up to the blank line.
+                while self._reader._readline():
+                    ...
+                self._done = True
+                return b""
+
+        data = self._reader._take(min(size, self._remaining))
+        self._remaining -= len(data)
+        self._received += len(data)
+        if self._received > self._reader._max_body_size:
+            raise RequestError((413, "Content Too Large"))
+
+        if not self._remaining:
+            if self._chunked:
+                if self._reader._readline():
+                    raise RequestError((400, "Bad Request"), "Invalid chunk")
+            else:
+                self._done = True
+        return data
@@ -0,0 +1,156 @@
+from NetJin.types import Tuple
+from typing import Iterator, Mapping
+import socket
+
+__all__ = [
+    "RequestReader",
+    "BodyReader",
+    "RequestError",
+    "RequestTimeout",
+    "body_framing",
+    "check_rate",
+    "chunk_size",
+    "decode_head",
+    "expects_continue",
+]
+
+class RequestError(Exception):
+    """A request that can't be served; the connection is answered with `status`
+    and closed, since its framing can no longer be trusted."""
+
+    status: Tuple[int, str]
+    """Status code and reason phrase to answer with."""
+
+    def __init__(self, status: Tuple[int, str], message: str = "") -> None:
+        """Create the error; message is the response body, the reason phrase by default."""
+        ...
+
+class RequestTimeout(RequestError):
+    """A client that was too slow. Answered with a 408 when a request had begun,
+    otherwise the connection is just closed."""
+
+    phase: str
+    """Where the client stalled: "idle" (no request begun), "header" or "body"."""
+
+    def __init__(self, phase: str) -> None: ...
+
+def decode_head(head: bytes) -> str:
+    """Decode a request head as UTF-8, falling back to ISO-8859-1."""
+    ...
+
+def expects_continue(headers: Mapping[str, str]) -> bool:
+    """Whether the client waits for a 100 Continue before sending the body."""
+    ...
+
+def body_framing(headers: Mapping[str, str], limit: int) -> Tuple[int | None, bool]:
+    """Find how the body of a request is delimited.
+
+    Args:
+        headers (Mapping[str, str]): Request headers.
+        limit (int): Largest Content-Length accepted.
+
+    Returns:
+        Tuple[int | None, bool]: Content-Length (0 without a body, None when chunked) and whether the body is chunked.
+
+    Raises:
+        RequestError: 400 for an invalid Content-Length, 413 over limit, 501 for a Transfer-Encoding other than chunked.
+    """
+    ...
+
+def check_rate(received: int, waited: float, grace: float, min_rate: int) -> None:
+    """Cut off slow-drip uploads: once more than grace seconds were spent waiting
+    on a body, it must average min_rate bytes/s. 0 turns the check off.
+
+    Raises:
+        RequestTimeout: The body is too slow.
+    """
+    ...
+
+def chunk_size(line: bytes) -> int:
+    """Size of a chunk from its size line; chunk extensions are ignored.
+
+    Raises:
+        RequestError: 400 unless the size is 1 to 16 hex digits.
+    """
+    ...
+
+class RequestReader(object):
+    """Reads requests off a client socket, keeping bytes received past one
+    request for the next (pipelining).
+
+    The first byte of a request may take idle_timeout (see read_head()), the
+    rest of the head header_timeout. Body reads may stall for body_timeout and
+    must average min_body_rate bytes/s. Between reads the socket gets
+    write_timeout, for the response. 0 turns a limit off.
+    """
+
+    def __init__(
+        self,
+        client: socket.socket,
+        max_header_size: int = 65536,
+        max_body_size: int = 1024 * 1024 * 1024,
+        chunk_size: int = 65536,
+        header_timeout: float = 0,
+        body_timeout: float = 0,
+        min_body_rate: int = 0,
+        write_timeout: float = 0,
+    ) -> None: ...
+    def read_head(self, idle_timeout: float | None = None) -> bytes | None:
+        """Read the request line and headers.
+
+        Args:
+            idle_timeout (float | None, optional): Seconds to wait for the request to begin; 0 or None waits indefinitely. Defaults to None.
+
+        Returns:
+            bytes | None: The head, up to and including the blank line; None when the client closed the connection between requests.
+
+        Raises:
+            RequestError: 431 for a head over max_header_size, 400 for one cut short.
+            RequestTimeout: "idle" or "header".
+        """
+        ...
+
+    def body(self, headers: Mapping[str, str]) -> "BodyReader":
+        """Reader for the body of the request with these headers.
+
+        Raises:
+            RequestError: See body_framing().
+        """
+        ...
+
+class BodyReader(object):
+    """The body of one request, received as it is read. Chunked bodies are
+    decoded; a 100 Continue is sent on the first read when the client asked for it.
+
+    Reads raise RequestError (400 for bad framing, 413 past max_body_size) and
+    RequestTimeout("body").
+    """
+
+    def __init__(
+        self,
+        reader: RequestReader,
+        length: int | None,
+        chunked: bool,
+        expect_continue: bool = False,
+    ) -> None: ...
+    @property
+    def done(self) -> bool:
+        """Whether the whole body has been read."""
+        ...
+
+    def read(self, size: int = -1) -> bytes:
+        """Read up to size bytes, or the rest of the body when size is negative.
+        Returns b"" at the end of the body."""
+        ...
+
+    def __iter__(self) -> Iterator[bytes]: ...
+    def drain(self, limit: int = 65536) -> bool:
+        """Discard the unread rest of the body so the next request can be read.
+
+        Args:
+            limit (int, optional): Most bytes worth discarding. Defaults to 65536.
+
+        Returns:
+            bool: False when the rest is larger than limit, or the client still waits for a 100 Continue; the connection must then be closed.
+        """
+        ...
@@ -1,100 +1,230 @@
-from typing import cast
-from urllib.parse import urlparse
-from dataclasses import dataclass, field
-from NetJin.types import TypedDict, Literal, Union, Dict, RequestMethod
-import re
-
-
-__all__ = ["Request", "create_request_object"]
-
-_Headers = TypedDict(
-    "_Headers",
-    {
-        "sec-ch-ua": str,
-        "sec-ch-ua-mobile": str,
-        "sec-ch-ua-platform": str,
-        "Sec-Fetch-User": str | None,
-        "Sec-Fetch-Site": str,
-        "Sec-Fetch-Mode": str,
-        "Sec-Fetch-Dest": str,
-        "Accept": str,
-        "User-Agent": str,
-        "Referer": str | None,
-        "Accept-Encoding": str,
-        "Accept-Language": str,
-        "Cache-Control": str | None,
-        "Upgrade-Insecure-Requests": str | None,
-        "Cookie": Dict[str, str],
-    },
-)
+from typing import Any, BinaryIO, Iterator, cast
+from urllib.parse import ParseResult, parse_qs, urlparse
+from NetJin.types import Literal, Dict, List, RequestMethod
+from NetJin.http.form import UploadedFile, parse_form
+from NetJin.http.headers import Headers
+from NetJin.http.parser import RequestError, decode_head
+from NetJin.http.codec import get_codec
+from NetJin.config import SPOOL_MAX_SIZE, MEDIA_DIR, MAX_FORM_SIZE
+from NetJin.config import JSON_CODEC, MAX_JSON_SIZE
+
+
+__all__ = ["Request", "Headers", "create_request_object"]
 
 ConnectionType = Literal["keep-alive", "close"]
 
+_codec = get_codec(JSON_CODEC)
+# Marks a body that hasn't been parsed yet; null is a valid document.
+_UNPARSED = object()
 
-@dataclass
-class Request:
-    url: str
 
-    path: str = field(init=False)
-    scheme: str = field(init=False)
-    netloc: str = field(init=False)
-    params: Dict[str, str] = field(init=False)
-    queries: Dict[str, str] = field(init=False)
-    fragment: Dict[str, str] = field(init=False)
+class Request(object):
+    __slots__ = (
+        "method",
+        "target",
+        "version",
+        "headers",
+        "user_parameters",
+        "_url",
+        "_path",
+        "_parts",
+        "_queries",
+        "_params",
+        "_cookies",
+        "_stream",
+        "_body",
+        "_form",
+        "_files",
+        "_json",
+    )
 
-    Host: str
-    Connection: ConnectionType
-    headers: Union[_Headers, Dict[str, str]]
-    method: RequestMethod
+    def __init__(
+        self,
+        method: RequestMethod,
+        target: str,
+        version: str = "HTTP/1.1",
+        headers: Headers | None = None,
+        stream: BinaryIO | None = None,
+    ) -> None:
+        self.method = method
+        # Request target exactly as sent, e.g. "/users?page=2".
+        self.target = target
+        self.version = version
+        self.headers = headers if headers is not None else Headers()
+        self.user_parameters: Dict[str, str] | None = None
 
-    user_parameters: Dict[str, str] | None = field(init=False, default=None)
+        # Everything below is derived on first access.
+        self._url: str | None = None
+        self._path: str | None = None
+        self._parts: ParseResult | None = None
+        self._queries: Dict[str, List[str]] | None = None
+        self._params: Dict[str, str] | None = None
+        self._cookies: Dict[str, str] | None = None
+        self._stream = stream
+        self._body: bytes | None = None
+        self._form: Dict[str, List[str]] | None = None
+        self._files: Dict[str, List[UploadedFile]] | None = None
+        self._json: Any = _UNPARSED
 
-    def __post_init__(self):
-        parser = urlparse(self.url)
-        self.path = parser.path
-        self.scheme = parser.scheme
-        self.netloc = parser.netloc
-        self.params = dict(re.findall(r";([^=;]+)=([^=;]+)", parser.params))
-        self.queries = dict(re.findall(r"([^&=]+)=([^&=]*)", parser.query))
-        self.fragment = dict(re.findall(r"#([^#]+)", parser.fragment))
+    @property
+    def Host(self) -> str:
+        return self.headers.get("Host", "")
 
+    @property
+    def Connection(self) -> ConnectionType:
+        return cast(ConnectionType, self.headers.get("Connection", ""))
 
-def create_request_object(network_content: str) -> Request:
-    network_content_obj: Dict[str, str] = dict(
-        re.findall(r"([\w-]+): ([^\n]+)", network_content)
-    )
-    host = network_content_obj.get("Host", "").rstrip("\r")
-    connection = network_content_obj.get("Connection", "").rstrip("\r")
-    cookie = dict(
-        re.findall(r"([^=;]+)=([^=;]+)", network_content_obj.get("Cookie", ""))
-    )
+    @property
+    def url(self) -> str:
+        if self._url is None:
+            self._url = "http://" + self.Host + self.target
+        return self._url
 
-    headers = network_content.split("\r\n")
-    request_line = headers[0]
-    request_query = request_line.split()
+    def _split(self) -> ParseResult:
+        if self._parts is None:
+            self._parts = urlparse(self.url)
+        return self._parts
+
+    @property
+    def path(self) -> str:
+        if self._path is None:
+            path = self.target.partition("?")[0].partition("#")[0]
+            if ";" in path or not path.startswith("/"):
+                # Matrix parameters and absolute URLs need the full parser.
+                path = self._split().path
+            self._path = path
+        return self._path
+
+    @property
+    def scheme(self) -> str:
+        return self._split().scheme
+
+    @property
+    def netloc(self) -> str:
+        return self._split().netloc
+
+    @property
+    def fragment(self) -> str:
+        return self._split().fragment
+
+    @property
+    def query(self) -> str:
+        return self.target.partition("?")[2].partition("#")[0]
+
+    @property
+    def queries(self) -> Dict[str, List[str]]:
+        if self._queries is None:
+            self._queries = parse_qs(self.query, keep_blank_values=True)
+        return self._queries
+
+    @property
+    def params(self) -> Dict[str, str]:
+        if self._params is None:
+            self._params = {}
+            for param in self._split().params.split(";"):
+                key, equal, value = param.partition("=")
+                if equal:
+                    self._params[key] = value
+        return self._params
 
-    method, path, _ = request_query if len(request_query) == 3 else (None, "", None)
-    try:
-        del network_content_obj["Host"]
-        del network_content_obj["Connection"]
-    except KeyError:
-        ...
+    @property
+    def cookies(self) -> Dict[str, str]:
+        if self._cookies is None:
+            self._cookies = {}
+            for cookie in self.headers.get_all("Cookie"):
+                for pair in cookie.split(";"):
+                    key, equal, value = pair.partition("=")
+                    if equal:
+                        self._cookies[key.strip()] = value.strip().strip('"')
+        return self._cookies
+
+    @property
+    def form(self) -> Dict[str, List[str]]:
+        if self._form is None:
+            self._parse_form()
+        return cast(Dict[str, List[str]], self._form)
+
+    @property
+    def files(self) -> Dict[str, List[UploadedFile]]:
+        if self._files is None:
+            self._parse_form()
+        return cast(Dict[str, List[UploadedFile]], self._files)
+
+    def _parse_form(self) -> None:
+        self._form, self._files = parse_form(
+            self.headers.get("Content-Type", ""),
+            self.stream(),
+            SPOOL_MAX_SIZE,
+            MEDIA_DIR,
+            MAX_FORM_SIZE,
+        )
+
+    def close(self) -> None:
+        for uploads in (self._files or {}).values():
+            for upload in uploads:
+                upload.close()
+
+    @property
+    def body(self) -> bytes:
+        if self._body is None:
+            self._body = self._stream.read() if self._stream is not None else b""
+        return self._body
+
+    def json(self, max_size: int | None = None) -> Any:
+        if self._json is _UNPARSED:
+            limit = MAX_JSON_SIZE if max_size is None else max_size
+            if self._body is None:
+                # Read up to the limit only; a larger body is never buffered.
+                chunks: List[bytes] = []
+                size = 0
+                for chunk in self.stream():
+                    size += len(chunk)
+                    if size > limit:
+                        raise RequestError((413, "Content Too Large"))
+                    chunks.append(chunk)
+                self._body = b"".join(chunks)
+            elif len(self._body) > limit:
+                raise RequestError((413, "Content Too Large"))
+            try:
+                self._json = _codec.loads(self._body)
+            except ValueError:
+                raise RequestError((400, "Bad Request"), "Invalid JSON body") from None
+        return self._json
+
+    def stream(self, chunk_size: int = 65536) -> Iterator[bytes]:
+        if self._body is not None:
+            if self._body:
+                yield self._body
+            return
+        if self._stream is None:
+            return
+        while True:
+            chunk = self._stream.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    def __repr__(self) -> str:
+        return "Request(%s %s %s)" % (self.method, self.target, self.version)
+
+
+def create_request_object(
+    network_content: str | bytes, stream: BinaryIO | None = None
+) -> Request:
+    if isinstance(network_content, str):
+        request_line, _, headers = network_content.partition("\r\n")
+    else:
+        line, _, headers = network_content.partition(b"\r\n")
+        request_line = decode_head(line)
+
+    request_query = request_line.split()
+    method, path, version = (
+        request_query if len(request_query) == 3 else (None, "", None)
+    )
     return Request(
-        Host=host,
-        Connection=cast(ConnectionType, connection),
-        headers=cast(
-            _Headers | Dict[str, str],
-            {
-                **network_content_obj,
-                "Cookie": cookie,
-                "Cache_Control": network_content_obj.get("Cache-Control", None),
-                "Upgrade_Insecure_Requests": network_content_obj.get(
-                    "Upgrade-Insecure-Requests", None
-                ),
-                "Referer": network_content_obj.get("Referer", None),
-                "Sec_Fetch_User": network_content_obj.get("Sec-Fetch-User", None),
-            },
-        ),
-        method=cast(RequestMethod, method.upper() if method else "GET"),
-        url="http://" + host + path,
+        cast(RequestMethod, method.upper() if method else "GET"),
+        path,
+        version.upper() if version else "HTTP/1.1",
+        Headers(headers),
+        stream,
     )
@@ -1,47 +1,132 @@
-from NetJin.types import TypedDict, Literal, Union, Dict, RequestMethod
-from dataclasses import dataclass, field
-
-_Headers = TypedDict(
-    "_Headers",
-    {
-        "sec-ch-ua": str,
-        "sec-ch-ua-mobile": str,
-        "sec-ch-ua-platform": str,
-        "Sec-Fetch-User": str | None,
-        "Sec-Fetch-Site": str,
-        "Sec-Fetch-Mode": str,
-        "Sec-Fetch-Dest": str,
-        "Accept": str,
-        "User-Agent": str,
-        "Referer": str | None,
-        "Accept-Encoding": str,
-        "Accept-Language": str,
-        "Cache-Control": str | None,
-        "Upgrade-Insecure-Requests": str | None,
-        "Cookie": Dict[str, str],
-    },
-)
+from NetJin.types import Literal, Dict, List, RequestMethod
+from NetJin.http.form import UploadedFile
+from NetJin.http.headers import Headers
+from typing import Any, BinaryIO, Iterator
+
+__all__ = ["Request", "Headers", "create_request_object"]
 
 ConnectionType = Literal["keep-alive", "close"]
 
-@dataclass
-class Request:
+class Request(object):
     """This class is wrapper for the incomming Http Request from the client.
     This also extract all the data received from the client for easier access.
+
+    Only the request line is parsed up front. Headers are parsed on first lookup and
+    the URL parts, queries, cookies, body and form data on first access of the
+    matching attribute; each result is cached on the request.
     """
 
-    url: str
+    method: RequestMethod
+    target: str
+    """Request target exactly as sent by the client, e.g. "/users?page=2"."""
+    version: str
+    headers: Headers
+    """Case-insensitive view of the request headers."""
+    user_parameters: Dict[str, str] | None
+    """Values of the <parameters> in the matched route."""
 
-    path: str = field(init=False)
-    scheme: str = field(init=False)
-    netloc: str = field(init=False)
-    params: Dict[str, str] = field(init=False)
-    queries: Dict[str, str] = field(init=False)
-    fragment: Dict[str, str] = field(init=False)
+    def __init__(
+        self,
+        method: RequestMethod,
+        target: str,
+        version: str = "HTTP/1.1",
+        headers: Headers | None = None,
+        stream: BinaryIO | None = None,
+    ) -> None: ...
+    @property
+    def Host(self) -> str:
+        """Value of the Host header."""
+        ...
 
-    Host: str
-    Connection: ConnectionType
-    headers: Union[_Headers, Dict[str, str]]
-    method: RequestMethod
+    @property
+    def Connection(self) -> ConnectionType:
+        """Value of the Connection header."""
+        ...
+
+    @property
+    def url(self) -> str: ...
+    @property
+    def path(self) -> str: ...
+    @property
+    def scheme(self) -> str: ...
+    @property
+    def netloc(self) -> str: ...
+    @property
+    def fragment(self) -> str:
+        """Fragment of the target, without the leading '#'; "" when there is none."""
+        ...
+
+    @property
+    def query(self) -> str:
+        """Raw query string, without the leading '?'."""
+        ...
+
+    @property
+    def queries(self) -> Dict[str, List[str]]:
+        """Query string parameters; every key maps to all of its values."""
+        ...
+
+    @property
+    def params(self) -> Dict[str, str]:
+        """Matrix parameters (";key=value") of the last path segment."""
+        ...
+
+    @property
+    def cookies(self) -> Dict[str, str]:
+        """Cookies sent in the Cookie header(s)."""
+        ...
+
+    @property
+    def form(self) -> Dict[str, List[str]]:
+        """Fields of an application/x-www-form-urlencoded or multipart/form-data body,
+        parsed on first access while the body streams in."""
+        ...
 
-    user_parameters: Dict[str, str] | None = field(init=False, default=None)
+    @property
+    def files(self) -> Dict[str, List[UploadedFile]]:
+        """Files of a multipart/form-data body. Large files are spooled to MEDIA_DIR
+        instead of memory."""
+        ...
+
+    def close(self) -> None:
+        """Release uploaded files. Called by the server once the response is sent."""
+        ...
+
+    @property
+    def body(self) -> bytes:
+        """Request body (decoded from Content-Length or chunked transfer-encoding).
+        The body is read from the connection on first access and cached; prefer
+        stream() for large payloads."""
+        ...
+
+    def json(self, max_size: int | None = None) -> Any:
+        """Request body parsed as JSON with the JSON_CODEC codec, cached after the
+        first call. The body is read only up to the size limit.
+
+        Args:
+            max_size (int | None, optional): Largest body accepted, in bytes. Defaults to MAX_JSON_SIZE.
+
+        Raises:
+            RequestError: 413 when the body is larger than max_size, 400 when it isn't valid JSON.
+              Raised out of a handler, the server answers with that status.
+        """
+        ...
+
+    def stream(self, chunk_size: int = 65536) -> Iterator[bytes]:
+        """Iterate over the request body as it arrives without buffering all of it.
+
+        Args:
+            chunk_size (int, optional): Maximum size of each yielded chunk. Defaults to 65536.
+        """
+        ...
+
+def create_request_object(
+    network_content: str | bytes, stream: BinaryIO | None = None
+) -> Request:
+    """Build a Request from the raw request line and headers.
+
+    Args:
+        network_content (str | bytes): Request line and header block.
+        stream (BinaryIO | None, optional): Readable source of the request body. Defaults to None.
+    """
+    ...
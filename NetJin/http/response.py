@@ -1,15 +1,24 @@
-from http import HTTPStatus
+from NetJin.http.compression import compress, compressible, compressor, negotiate
+from NetJin.http.writer import write, status_line, header_line
+from NetJin.http.codec import get_codec
+from NetJin.config import COMPRESSION, COMPRESSION_LEVEL, COMPRESSION_MIN_SIZE
+from NetJin.config import JSON_CODEC
+from NetJin.config import COMPRESSION_TYPES, DEBUG, TEMPLATE_CACHE_DIR
 from jinja2 import (
     Environment,
     FileSystemLoader,
     ChoiceLoader,
+    FileSystemBytecodeCache,
     Template,
     TemplateNotFound,
+    TemplateSyntaxError,
 )
 from colorama import Fore, init
-from typing import Any, Dict, List
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, Iterator, List, Tuple
+import dataclasses
 import socket
-import json
+import zlib
+import os
 
 TEMPLATE_DIRS = None
 try:
@@ -19,7 +28,9 @@ except ModuleNotFoundError:
 
 init(True)
 
-__all__ = ["Response"]
+__all__ = ["Response", "precompile_templates"]
+
+_codec = get_codec(JSON_CODEC)
 
 if TEMPLATE_DIRS is None or isinstance(TEMPLATE_DIRS, str):
     template_loader = FileSystemLoader(TEMPLATE_DIRS if TEMPLATE_DIRS else "templates")
@@ -27,12 +38,118 @@ else:
     template_loader = ChoiceLoader(
         [FileSystemLoader(template) for template in TEMPLATE_DIRS]
     )
-env = Environment(loader=template_loader)
+bytecode_cache = None
+if TEMPLATE_CACHE_DIR:
+    os.makedirs(TEMPLATE_CACHE_DIR, exist_ok=True)
+    # Compiled templates survive restarts and are shared by worker processes.
+    bytecode_cache = FileSystemBytecodeCache(str(TEMPLATE_CACHE_DIR))
+env = Environment(
+    loader=template_loader,
+    bytecode_cache=bytecode_cache,
+    # Outside DEBUG templates are neither re-stat()ed per render nor evicted.
+    auto_reload=DEBUG,
+    cache_size=400 if DEBUG else -1,
+)
+
+
+def precompile_templates() -> int:
+    compiled = 0
+    for name in env.list_templates():
+        try:
+            env.get_template(name)
+            compiled += 1
+        except TemplateSyntaxError as e:
+            print(f"{Fore.RED}TemplateSyntaxError: {Fore.LIGHTRED_EX}{name}: {e}")
+        except UnicodeDecodeError:
+            # Binary files next to the templates.
+            ...
+    return compiled
+
+
+class _Chunker(object):
+    # Frames streamed body pieces, optionally compressing them on the way.
+    def __init__(
+        self, chunked: bool, compressor: "zlib._Compress | None", buffer_size: int
+    ) -> None:
+        self.chunked = chunked
+        self.compressor = compressor
+        self.buffer_size = buffer_size
+        self.buffer = bytearray()
+
+    def feed(self, item: str | bytes) -> bytes:
+        if isinstance(item, str):
+            item = item.encode()
+        if item:
+            self.buffer += item
+            if len(self.buffer) < self.buffer_size:
+                return b""
+        # An empty item flushes whatever is buffered.
+        return self.flush(zlib.Z_SYNC_FLUSH)
+
+    def flush(self, mode: int) -> bytes:
+        data = bytes(self.buffer)
+        self.buffer.clear()
+        if self.compressor is not None:
+            data = self.compressor.compress(data) + self.compressor.flush(mode)
+        if not data or not self.chunked:
+            return data
+        return b"%x\r\n%s\r\n" % (len(data), data)
+
+    def close(self) -> bytes:
+        data = self.flush(zlib.Z_FINISH)
+        return data + b"0\r\n\r\n" if self.chunked else data
+
+
+def _json_items(iterable: Iterable[Any], ndjson: bool) -> Iterator[bytes]:
+    # Only one encoded item is alive at a time; the chunker bounds the rest.
+    dumps = _codec.dumps
+    if ndjson:
+        for item in iterable:
+            yield dumps(item) + b"\n"
+        return
+    separator = b"["
+    for item in iterable:
+        yield separator + dumps(item)
+        separator = b","
+    yield b"[]" if separator == b"[" else b"]"
+
+
+async def _ajson_items(iterable: AsyncIterable[Any], ndjson: bool) -> AsyncIterator[bytes]:
+    dumps = _codec.dumps
+    if ndjson:
+        async for item in iterable:
+            yield dumps(item) + b"\n"
+        return
+    separator = b"["
+    async for item in iterable:
+        yield separator + dumps(item)
+        separator = b","
+    yield b"[]" if separator == b"[" else b"]"
 
 
 class Response:
-    def __init__(self, client: socket.socket) -> None:
+    def __init__(
+        self,
+        client: socket.socket,
+        keep_alive: bool = False,
+        accept_encoding: str = "",
+        version: str = "HTTP/1.1",
+        method: str = "GET",
+    ) -> None:
         self.__client = client
+        self.keep_alive = keep_alive
+        self.bytes_sent = 0
+        # Status of the last response sent, 0 until something is sent.
+        self.status = 0
+        # Accept-Encoding of the request, used to negotiate body compression.
+        self.accept_encoding = accept_encoding
+        # HTTP version of the request; HTTP/1.0 clients can't take chunked bodies.
+        self.version = version
+        # HEAD responses carry the headers of the GET one and no body.
+        self.head_only = method == "HEAD"
+        # Set by the server for cached routes; send() then keeps a copy of the response.
+        self.capture = False
+        self.captured: Tuple[int, Dict[str, str], bytes] | None = None
 
     def render(self, template: str | Template | List[str | Template], **context: Any) -> int:
         try:
@@ -56,36 +173,220 @@ class Response:
         headers = headers or {}
         status = status or 200
 
-        data: str = content
-        if isinstance(content, str):
+        body: bytes | bytearray | memoryview
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            # Raw bodies are sent from the caller's buffer as they are.
+            self.add_header(headers, "Content-Type", "application/octet-stream")
+            body = content.cast("B") if isinstance(content, memoryview) else content
+        elif isinstance(content, str):
             self.add_header(headers, "Content-Type", "text/plain; charset=utf-8")
+            body = content.encode()
         else:
             try:
-                data = json.dumps(content)
-                if isinstance(content, (dict, list)):
+                body = _codec.dumps(content)
+                if isinstance(content, (dict, list, tuple)) or dataclasses.is_dataclass(content):
                     self.add_header(
                         headers, "Content-Type", "application/json; charset=utf-8"
                     )
             except (TypeError, ValueError):
                 self.add_header(headers, "Content-Type", "text/plain; charset=utf-8")
-                data = "Cannot parse data"
-        try:
-            status_phrase = HTTPStatus(status).phrase
-        except ValueError:
-            status_phrase = "Unknown Status Code"
+                body = b"Cannot parse data"
+        if COMPRESSION and len(body) >= COMPRESSION_MIN_SIZE:
+            body = self.__compress(body, headers)
 
-        response = self.__prepare_response(
-            data.encode(), f"{status} {status_phrase}", headers
-        )
+        if self.capture:
+            self.__capture(status, headers, body)
+        self.status = status
+
+        head = self.__prepare_head(status, headers, len(body))
         try:
-            # status_ = self.__client.sendall(response)
-            status_ = self.__client.send(response)
-            # self.__client.close()
+            # Header block and body go out in one scatter-gather write, uncopied.
+            status_ = write(self.__client, (head,) if self.head_only else (head, body))
+            self.bytes_sent += status_
             return status_
+        except TimeoutError:
+            # WRITE_TIMEOUT expired; the server drops the connection.
+            self.keep_alive = False
+            raise
         except OSError as e:
             print(f"{Fore.RED}OSError: {Fore.LIGHTRED_EX}{repr(e)}")
             return 0
 
+    def stream(
+        self,
+        iterable: Iterable[str | bytes],
+        status: int | None = None,
+        headers: Dict[str, str] | None = None,
+        buffer_size: int = 0,
+    ) -> int:
+        chunker = self.__start_stream(status, headers, buffer_size)
+        if chunker is None:
+            return self.bytes_sent
+        try:
+            for item in iterable:
+                data = chunker.feed(item)
+                if data and not self.__write(data):
+                    return self.bytes_sent
+            self.__write(chunker.close())
+        except BaseException:
+            # The status line is gone already; an unterminated body marks the failure.
+            self.keep_alive = False
+            raise
+        finally:
+            close = getattr(iterable, "close", None)
+            if close is not None:
+                close()
+        return self.bytes_sent
+
+    async def astream(
+        self,
+        iterable: AsyncIterable[str | bytes] | Iterable[str | bytes],
+        status: int | None = None,
+        headers: Dict[str, str] | None = None,
+        buffer_size: int = 0,
+    ) -> int:
+        chunker = self.__start_stream(status, headers, buffer_size)
+        if chunker is None:
+            return self.bytes_sent
+        try:
+            if isinstance(iterable, AsyncIterable):
+                async for item in iterable:
+                    data = chunker.feed(item)
+                    if data:
+                        if not self.__write(data):
+                            return self.bytes_sent
+                        await self.drain()
+            else:
+                for item in iterable:
+                    data = chunker.feed(item)
+                    if data:
+                        if not self.__write(data):
+                            return self.bytes_sent
+                        await self.drain()
+            self.__write(chunker.close())
+            await self.drain()
+        except BaseException:
+            self.keep_alive = False
+            raise
+        finally:
+            aclose = getattr(iterable, "aclose", None)
+            if aclose is not None:
+                await aclose()
+        return self.bytes_sent
+
+    def json_stream(
+        self,
+        iterable: Iterable[Any],
+        status: int | None = None,
+        headers: Dict[str, str] | None = None,
+        ndjson: bool = False,
+        buffer_size: int = 64 * 1024,
+    ) -> int:
+        headers = self.__json_headers(headers, ndjson)
+        return self.stream(_json_items(iterable, ndjson), status, headers, buffer_size)
+
+    async def ajson_stream(
+        self,
+        iterable: AsyncIterable[Any] | Iterable[Any],
+        status: int | None = None,
+        headers: Dict[str, str] | None = None,
+        ndjson: bool = False,
+        buffer_size: int = 64 * 1024,
+    ) -> int:
+        headers = self.__json_headers(headers, ndjson)
+        if isinstance(iterable, AsyncIterable):
+            items = _ajson_items(iterable, ndjson)
+            return await self.astream(items, status, headers, buffer_size)
+        return await self.astream(_json_items(iterable, ndjson), status, headers, buffer_size)
+
+    def __json_headers(self, headers: Dict[str, str] | None, ndjson: bool) -> Dict[str, str]:
+        content_type = "application/x-ndjson" if ndjson else "application/json; charset=utf-8"
+        return self.add_header(headers or {}, "Content-Type", content_type)
+
+    def __capture(
+        self, status: int, headers: Dict[str, str], body: bytes | bytearray | memoryview
+    ) -> None:
+        if self.captured is not None:
+            # More than one send() is not a single response that can be replayed.
+            self.capture = False
+            self.captured = None
+            return
+        self.captured = (status, dict(headers), bytes(body))
+        headers["X-Cache"] = "MISS"
+
+    def __start_stream(
+        self, status: int | None, headers: Dict[str, str] | None, buffer_size: int
+    ) -> _Chunker | None:
+        # Streamed bodies are never cached.
+        self.capture = False
+        self.captured = None
+        headers = headers or {}
+        self.add_header(headers, "Content-Type", "text/plain; charset=utf-8")
+        keys = {key.lower(): key for key in headers.keys()}
+
+        # A body of known length is passed through as it is.
+        chunked = self.version != "HTTP/1.0" and "content-length" not in keys
+        if not chunked and "content-length" not in keys:
+            # Without chunked framing the end of the body is the end of the connection.
+            self.add_header(headers, "Connection", "close", force=True)
+
+        compressor_ = None
+        if COMPRESSION and "content-length" not in keys and "content-encoding" not in keys:
+            if compressible(headers.get(keys.get("content-type", ""), ""), COMPRESSION_TYPES):
+                self.add_header(headers, "Vary", "Accept-Encoding")
+                encoding = negotiate(self.accept_encoding, ("gzip", "deflate"))
+                if encoding is not None:
+                    headers["Content-Encoding"] = encoding
+                    compressor_ = compressor(encoding, COMPRESSION_LEVEL)
+        if chunked:
+            headers["Transfer-Encoding"] = "chunked"
+
+        self.status = status or 200
+        head = self.__prepare_head(self.status, headers)
+        if not self.__write(head) or self.head_only:
+            return None
+        return _Chunker(chunked, compressor_, buffer_size)
+
+    def __write(self, data: bytes) -> bool:
+        try:
+            self.bytes_sent += write(self.__client, (data,))
+            return True
+        except TimeoutError:
+            self.keep_alive = False
+            raise
+        except OSError as e:
+            print(f"{Fore.RED}OSError: {Fore.LIGHTRED_EX}{repr(e)}")
+            self.keep_alive = False
+            return False
+
+    async def arender(
+        self, template: str | Template | List[str | Template], **context: Any
+    ) -> int:
+        status_ = self.render(template, **context)
+        await self.drain()
+        return status_
+
+    async def aend(self, status: int) -> int:
+        status_ = self.end(status)
+        await self.drain()
+        return status_
+
+    async def asend(
+        self,
+        content: Any,
+        status: int | None = None,
+        headers: Dict[str, str] | None = None,
+    ) -> int:
+        status_ = self.send(content, status, headers)
+        await self.drain()
+        return status_
+
+    async def drain(self) -> None:
+        # Only stream-backed clients (asyncio engine) buffer writes.
+        drain = getattr(self.__client, "drain", None)
+        if drain is not None:
+            await drain()
+
     def add_header(
         self, headers: Dict[str, str], header: str, value: str, force: bool = False
     ) -> Dict[str, str]:
@@ -96,32 +397,48 @@ class Response:
             headers[header] = value
         return headers
 
-    def __prepare_response(
+    def __compress(
+        self, body: bytes | bytearray | memoryview, headers: Dict[str, str]
+    ) -> bytes | bytearray | memoryview:
+        keys = {key.lower(): key for key in headers.keys()}
+        if "content-encoding" in keys:
+            return body
+        if not compressible(headers.get(keys.get("content-type", ""), ""), COMPRESSION_TYPES):
+            return body
+
+        # The body depends on Accept-Encoding even when it goes out uncompressed.
+        self.add_header(headers, "Vary", "Accept-Encoding")
+        encoding = negotiate(self.accept_encoding, ("gzip", "deflate"))
+        if encoding is None:
+            return body
+        headers["Content-Encoding"] = encoding
+        return compress(body, encoding, COMPRESSION_LEVEL)
+
+    def __prepare_head(
         self,
-        content: bytes,
-        status: str = "200 OK",
+        status: int = 200,
         headers: Dict[str, str] | None = None,
+        content_length: int | None = None,
     ) -> bytes:
-
         headers = headers or {
             "X-Content-Type-Options": "nosniff",
-            "Connection": "keep-alive",
         }
 
-        header_response = "\r\n".join(f"{key}: {value}" for key, value in headers.items())
-        content_length = len(content)
-
-        response = (
-            f"HTTP/1.1 {status}\r\n"
-            f"Content-Length: {content_length}\r\n"
-            f"{header_response}\r\n\r\n"
+        connection = next(
+            (value for key, value in headers.items() if key.lower() == "connection"),
+            None,
         )
-        print(response.rstrip(), "\n")
-        response = response.encode()
+        if connection is None:
+            headers["Connection"] = "keep-alive" if self.keep_alive else "close"
+        elif connection.lower() == "close":
+            self.keep_alive = False
 
-        if isinstance(content, str):
-            content = content.encode()
-        return response + content
+        head = [status_line(status)]
+        if content_length is not None:
+            head.append(b"Content-Length: %d\r\n" % content_length)
+        head.extend(header_line(key, value) for key, value in headers.items())
+        head.append(b"\r\n")
+        return b"".join(head)
 
     def set(self, key: str, value: Any) -> None:
         setattr(self, key, value)
@@ -1,13 +1,58 @@
 import socket
-from typing import Any, Dict, List
+from typing import Any, AsyncIterable, Dict, Iterable, List, Tuple
 from jinja2 import Template
 
-__all__ = ["Response"]
+__all__ = ["Response", "precompile_templates"]
+
+def precompile_templates() -> int:
+    """Load every template of TEMPLATE_DIRS into the Jinja environment, so no
+    request pays for compiling one. With TEMPLATE_CACHE_DIR set the bytecode is
+    also written there and reused by later processes. run() calls this when
+    DEBUG is off; `python -m NetJin precompile` fills the cache ahead of a deploy.
+
+    Templates are only re-read when changed (auto_reload) while DEBUG is on.
+
+    Returns:
+        int: Amount of templates compiled. Templates with syntax errors are reported and skipped.
+    """
+    ...
 
 
 class Response:
     """Http Response Object. This is the class that can be used to send response back to the client."""
-    def __init__(self, client: socket.socket) -> None: ...
+
+    keep_alive: bool
+    """Whether the connection stays open for another request. Sending a
+    `Connection: close` header turns this off."""
+    bytes_sent: int
+    """Amount of bytes written to the client by this response."""
+    status: int
+    """Status code of the last response sent; 0 while nothing has been sent."""
+    accept_encoding: str
+    """Accept-Encoding header of the request. Bodies of COMPRESSION_TYPES of at
+    least COMPRESSION_MIN_SIZE bytes are gzip or deflate compressed accordingly."""
+
+    version: str
+    """HTTP version of the request. Streams to HTTP/1.0 clients are sent unframed
+    and end with the connection."""
+    head_only: bool
+    """The request was a HEAD: responses keep their headers, Content-Length
+    included, and are sent without a body."""
+
+    capture: bool
+    """Keep a copy of the response sent by send()/render() in `captured`. Set by
+    the server on routes with a response cache."""
+    captured: Tuple[int, Dict[str, str], bytes] | None
+    """Status code, headers and body of the captured response."""
+
+    def __init__(
+        self,
+        client: socket.socket,
+        keep_alive: bool = False,
+        accept_encoding: str = "",
+        version: str = "HTTP/1.1",
+        method: str = "GET",
+    ) -> None: ...
 
     def render(self, template: str | Template | List[str | Template], **context: Any) -> int:
         """Render HTML (Jinja) template file. This method pre-renders the
@@ -37,18 +82,156 @@ class Response:
         status: int | None = None,
         headers: Dict[str, str] | None = None,
     ) -> int:
-        """Send response back to the client.
+        """Send response back to the client. str is sent as text, bytes, bytearray and
+        memoryview as they are (application/octet-stream unless a Content-Type is
+        given) and anything else as JSON. Headers and body are written together
+        with one scatter-gather call, without copying the body.
+
+        JSON is encoded with the JSON_CODEC codec (orjson or ujson when installed),
+        which also takes dataclasses, datetimes, UUIDs, Decimals and enums. Dicts,
+        lists, tuples and dataclasses are labelled application/json.
+
+        The body is compressed when COMPRESSION
+        is on and the client accepts gzip or deflate (see accept_encoding), unless
+        a Content-Encoding header is given.
 
         Args:
             content (Any): Data or Message that is to be responded back to client.
             status (int): Http status code for response.
             headers (Dict[str, str] | None, optional): Http Response Headers. Defaults to None.
 
+        Returns:
+            int: Amount of bytes transfered to the client.
+
+        Raises:
+            TimeoutError: The client stopped reading and the write blocked for WRITE_TIMEOUT.
+        """
+        ...
+
+    def stream(
+        self,
+        iterable: Iterable[str | bytes],
+        status: int | None = None,
+        headers: Dict[str, str] | None = None,
+        buffer_size: int = 0,
+    ) -> int:
+        """Send a body produced piece by piece, e.g. by a generator. The headers go
+        out immediately and every item as a `Transfer-Encoding: chunked` chunk, so
+        the body never has to be assembled in memory. Compressible content is
+        gzip/deflate compressed as it streams when the client accepts it.
+
+        Args:
+            iterable (Iterable[str | bytes]): Pieces of the body; str is UTF-8 encoded.
+            status (int | None, optional): Http status code for response. Defaults to 200.
+            headers (Dict[str, str] | None, optional): Http Response Headers. With a
+                Content-Length header the body is sent unchunked and uncompressed.
+                Defaults to None.
+            buffer_size (int, optional): Collect items into chunks of at least this
+                many bytes; an empty item flushes early. Defaults to 0 (every item
+                is sent as it is yielded).
+
+        Returns:
+            int: Amount of bytes transfered to the client.
+        """
+        ...
+
+    async def astream(
+        self,
+        iterable: AsyncIterable[str | bytes] | Iterable[str | bytes],
+        status: int | None = None,
+        headers: Dict[str, str] | None = None,
+        buffer_size: int = 0,
+    ) -> int:
+        """Awaitable variant of stream() that also takes async iterators, and waits
+        for the write buffer to drain after every chunk.
+
+        Returns:
+            int: Amount of bytes transfered to the client.
+        """
+        ...
+
+    def json_stream(
+        self,
+        iterable: Iterable[Any],
+        status: int | None = None,
+        headers: Dict[str, str] | None = None,
+        ndjson: bool = False,
+        buffer_size: int = 64 * 1024,
+    ) -> int:
+        """Send the items of an iterable (e.g. rows of a database cursor) as a JSON
+        array, or as newline delimited JSON, encoding one item at a time. At most
+        about buffer_size bytes are held before they are written to the client,
+        and writes block while the client is slow, so memory stays flat however
+        many items there are. Sent with stream(), i.e. chunked and compressed.
+
+        Items are encoded like in send(), with the JSON_CODEC codec.
+
+        Args:
+            iterable (Iterable[Any]): JSON serialisable items.
+            status (int | None, optional): Http status code for response. Defaults to 200.
+            headers (Dict[str, str] | None, optional): Http Response Headers. Defaults to None.
+            ndjson (bool, optional): One JSON document per line (application/x-ndjson)
+                instead of an array. Defaults to False.
+            buffer_size (int, optional): Size of the chunks written. Defaults to 64 KiB.
+
         Returns:
             int: Amount of bytes transfered to the client.
         """
         ...
 
+    async def ajson_stream(
+        self,
+        iterable: AsyncIterable[Any] | Iterable[Any],
+        status: int | None = None,
+        headers: Dict[str, str] | None = None,
+        ndjson: bool = False,
+        buffer_size: int = 64 * 1024,
+    ) -> int:
+        """Awaitable variant of json_stream() that also takes async iterators.
+
+        Returns:
+            int: Amount of bytes transfered to the client.
+        """
+        ...
+
+    async def arender(
+        self, template: str | Template | List[str | Template], **context: Any
+    ) -> int:
+        """Awaitable variant of render() for `async def` handlers. Waits until the
+        rendered page has been handed to the transport.
+
+        Returns:
+            int: Amount of bytes sent.
+        """
+        ...
+
+    async def aend(self, status: int) -> int:
+        """Awaitable variant of end().
+
+        Returns:
+            int: Amount of bytes sent.
+        """
+        ...
+
+    async def asend(
+        self,
+        content: Any,
+        status: int | None = None,
+        headers: Dict[str, str] | None = None,
+    ) -> int:
+        """Awaitable variant of send(). Waits for the write buffer to drain, so slow
+        clients apply backpressure to the handler instead of growing memory.
+
+        Returns:
+            int: Amount of bytes transfered to the client.
+        """
+        ...
+
+    async def drain(self) -> None:
+        """Wait until buffered response data has been flushed to the client. This is
+        a no-op for plain sockets, which are written synchronously."""
+        ...
+
     def add_header(
         self, headers: Dict[str, str], header: str, value: str, force: bool = False
     ) -> Dict[str, str]:
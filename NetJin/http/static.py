@@ -0,0 +1,322 @@
+from NetJin.http.compression import STATIC_ENCODINGS, negotiate
+from NetJin.types import Dict, List, Tuple
+from email.utils import formatdate, parsedate_to_datetime
+from typing import BinaryIO, Mapping
+from urllib.parse import unquote
+from colorama import Fore, init
+import mimetypes
+import threading
+import traceback
+import socket
+import stat
+import mmap
+import os
+
+__all__ = ["StaticFile", "StaticIndex", "send_file", "parse_range", "byterange_parts"]
+init(True)
+
+_MMAP_CHUNK = 1024 * 1024
+# More ranges than this in one request are answered with the whole file.
+_MAX_RANGES = 32
+
+_Range = Tuple[int, int]
+
+
+def send_file(
+    client: socket.socket, file: BinaryIO, offset: int = 0, count: int | None = None
+) -> int:
+    if count is None:
+        file.seek(0, 2)
+        count = file.tell() - offset
+    if count <= 0:
+        return 0
+
+    sendfile = getattr(client, "sendfile", None)
+    if sendfile is not None:
+        # The kernel copies file pages straight to the socket (os.sendfile).
+        return sendfile(file, offset, count)
+
+    # Socket-like clients without sendfile get slices of a read-only mapping, so
+    # the file is never copied into a Python bytes object as a whole.
+    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        with memoryview(mapped) as view:
+            end = offset + count
+            for start in range(offset, end, _MMAP_CHUNK):
+                with view[start : min(start + _MMAP_CHUNK, end)] as chunk:
+                    client.sendall(chunk)
+    return count
+
+
+def parse_range(header: str, size: int) -> List[_Range] | None:
+    unit, equal, specs = header.partition("=")
+    if not equal or unit.strip().lower() != "bytes":
+        return None
+
+    ranges: List[_Range] = []
+    for spec in specs.split(","):
+        spec = spec.strip()
+        if not spec:
+            continue
+        first, dash, last = spec.partition("-")
+        first, last = first.strip(), last.strip()
+        if not dash or not (first.isdigit() or first == "") or not (last.isdigit() or last == ""):
+            return None
+        if not first:
+            # Suffix range: the last N bytes.
+            if not last:
+                return None
+            length = int(last)
+            if length > 0 and size > 0:
+                ranges.append((max(size - length, 0), size - 1))
+            continue
+        start = int(first)
+        if last and int(last) < start:
+            return None
+        if start < size:
+            ranges.append((start, min(int(last), size - 1) if last else size - 1))
+
+    if len(ranges) > _MAX_RANGES:
+        return None
+    # Overlapping and adjacent ranges are sent once.
+    merged: List[_Range] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(end, merged[-1][1]))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def byterange_parts(
+    ranges: List[_Range], size: int, content_type: str, boundary: str
+) -> Tuple[List[Tuple[bytes, int, int]], bytes]:
+    parts = []
+    for start, end in ranges:
+        head = (
+            "\r\n--%s\r\nContent-Type: %s\r\nContent-Range: bytes %d-%d/%d\r\n\r\n"
+            % (boundary, content_type, start, end, size)
+        ).encode()
+        parts.append((head, start, end - start + 1))
+    return parts, ("\r\n--%s--\r\n" % boundary).encode()
+
+
+class StaticFile(object):
+    __slots__ = (
+        "url",
+        "path",
+        "size",
+        "mtime",
+        "mtime_ns",
+        "mimetype",
+        "encoding",
+        "etag",
+        "headers",
+        "variants",
+    )
+
+    def __init__(
+        self,
+        url: str,
+        path: str,
+        stat_: os.stat_result,
+        cache_control: str = "",
+        encoding: str = "",
+        mimetype: str | None = None,
+    ) -> None:
+        self.url = url
+        self.path = path
+        self.size = stat_.st_size
+        self.mtime = stat_.st_mtime
+        self.mtime_ns = stat_.st_mtime_ns
+        if mimetype is None:
+            mimetype, coding = mimetypes.guess_type(url)
+            if coding:
+                # "app.js.gz" requested by name is the archive, not encoded JavaScript.
+                mimetype = "application/gzip" if coding == "gzip" else "application/octet-stream"
+        self.mimetype = mimetype or ""
+        self.encoding = encoding
+        self.etag = '"%x-%x%s"' % (self.mtime_ns, self.size, encoding and "-" + encoding)
+        # Precompressed siblings (".gz", ".br") by content-coding.
+        self.variants: Dict[str, StaticFile] = {}
+        # Validators sent with every response for this file, 200 or 304.
+        self.headers: Dict[str, str] = {
+            "Accept-Ranges": "bytes",
+            "ETag": self.etag,
+            "Last-Modified": formatdate(self.mtime, usegmt=True),
+        }
+        if cache_control:
+            self.headers["Cache-Control"] = cache_control
+        if encoding:
+            self.headers["Content-Encoding"] = encoding
+            self.headers["Vary"] = "Accept-Encoding"
+
+    def add_variant(self, variant: "StaticFile") -> None:
+        self.variants[variant.encoding] = variant
+        self.headers["Vary"] = "Accept-Encoding"
+
+    def negotiate(self, accept_encoding: str) -> "StaticFile":
+        if not self.variants or not accept_encoding:
+            return self
+        encoding = negotiate(accept_encoding, self.variants)
+        return self.variants[encoding] if encoding else self
+
+    def changed(self, stat_: os.stat_result) -> bool:
+        return stat_.st_mtime_ns != self.mtime_ns or stat_.st_size != self.size
+
+    def not_modified(self, headers: Mapping[str, str]) -> bool:
+        # If-None-Match takes precedence over If-Modified-Since (RFC 9110 13.2.2).
+        match = headers.get("If-None-Match")
+        if match is not None:
+            tags = [tag.strip() for tag in match.split(",")]
+            return "*" in tags or any(
+                tag.removeprefix("W/") == self.etag for tag in tags
+            )
+
+        since = headers.get("If-Modified-Since")
+        if not since:
+            return False
+        try:
+            date = parsedate_to_datetime(since)
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have a resolution of one second.
+        return int(self.mtime) <= date.timestamp()
+
+    def if_range(self, value: str | None) -> bool:
+        if value is None:
+            return True
+        value = value.strip()
+        if value.startswith(('"', "W/")):
+            # Only a strong, current entity tag allows a partial response.
+            return value == self.etag
+        return value == self.headers["Last-Modified"]
+
+    def __repr__(self) -> str:
+        return "<StaticFile %r (%s, %d bytes)>" % (self.url, self.mimetype, self.size)
+
+
+class StaticIndex(object):
+    def __init__(
+        self,
+        directories: List[str],
+        cache_control: str = "",
+        refresh_interval: float = 5,
+    ) -> None:
+        self.directories = list(directories)
+        self.cache_control = cache_control
+        self.refresh_interval = refresh_interval
+        self._files: Dict[str, StaticFile] = {}
+        self._built = False
+        self._lock = threading.Lock()
+        # Rescans run on a background thread, started by the first lookup in each
+        # process (threads don't survive a fork); setting the event rescans early.
+        self._rescan = threading.Event()
+        self._scanner: threading.Thread | None = None
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._forked)
+
+    def build(self) -> "StaticIndex":
+        files: Dict[str, StaticFile] = {}
+        for directory in self.directories:
+            root = os.path.abspath(directory)
+            # (st_dev, st_ino) of each directory's ancestors: a symlink back up the
+            # tree would otherwise be followed forever.
+            ancestors: Dict[str, frozenset] = {}
+            for dirpath, dirnames, filenames in os.walk(root, followlinks=True):
+                try:
+                    stat_ = os.stat(dirpath)
+                except OSError:
+                    dirnames[:] = []
+                    continue
+                key = (stat_.st_dev, stat_.st_ino)
+                parents = ancestors.get(os.path.dirname(dirpath), frozenset())
+                if key in parents:
+                    dirnames[:] = []
+                    continue
+                ancestors[dirpath] = parents | {key}
+                for filename in filenames:
+                    path = os.path.join(dirpath, filename)
+                    url = "/" + os.path.relpath(path, root).replace(os.sep, "/")
+                    # Earlier directories win, like the order of STATIC_DIRS.
+                    if url in files:
+                        continue
+                    try:
+                        stat_ = os.stat(path)
+                    except OSError:
+                        continue
+                    if stat.S_ISREG(stat_.st_mode):
+                        files[url] = StaticFile(url, path, stat_, self.cache_control)
+
+        for url, file in files.items():
+            for encoding, suffix in STATIC_ENCODINGS.items():
+                sibling = files.get(url + suffix)
+                # A variant older than its source is out of date and ignored.
+                if sibling is None or sibling.mtime_ns < file.mtime_ns:
+                    continue
+                try:
+                    stat_ = os.stat(sibling.path)
+                except OSError:
+                    continue
+                file.add_variant(
+                    StaticFile(
+                        url, sibling.path, stat_, self.cache_control, encoding, file.mimetype
+                    )
+                )
+        # Swapped in whole, so lookups never see a half built index.
+        self._files = files
+        self._built = True
+        return self
+
+    def lookup(self, path: str) -> StaticFile | None:
+        if self._scanner is None:
+            self._start()
+        return self._files.get(unquote(path))
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._scanner is not None:
+                return
+            if not self._built:
+                self.build()
+            self._scanner = threading.Thread(
+                target=self._scan, name="NetJin-static-index", daemon=True
+            )
+            self._scanner.start()
+
+    def _scan(self) -> None:
+        # Requests never walk the directories; files they serve are revalidated
+        # one by one through refresh() and discard().
+        while True:
+            self._rescan.wait(self.refresh_interval or None)
+            self._rescan.clear()
+            try:
+                self.build()
+            except Exception:
+                print(f"{Fore.RED}{traceback.format_exc()}")
+
+    def _forked(self) -> None:
+        self._lock = threading.Lock()
+        self._scanner = None
+
+    def refresh(self, file: StaticFile, stat_: os.stat_result) -> StaticFile:
+        if not file.changed(stat_):
+            return file
+        if file.encoding:
+            # A rewritten variant is sorted out against its source by the next scan.
+            self._rescan.set()
+            return StaticFile(
+                file.url, file.path, stat_, self.cache_control, file.encoding, file.mimetype
+            )
+        # Variants of the old content are stale until they are regenerated.
+        updated = StaticFile(file.url, file.path, stat_, self.cache_control)
+        self._files[file.url] = updated
+        return updated
+
+    def discard(self, file: StaticFile) -> None:
+        if file.encoding:
+            self._rescan.set()
+        else:
+            self._files.pop(file.url, None)
+
+    def __len__(self) -> int:
+        return len(self._files)
@@ -0,0 +1,133 @@
+from NetJin.types import Dict, List, Tuple
+from typing import BinaryIO, Mapping
+import socket
+import os
+
+__all__ = ["StaticFile", "StaticIndex", "send_file", "parse_range", "byterange_parts"]
+
+class StaticFile(object):
+    """A file of STATIC_DIRS as recorded by the StaticIndex."""
+
+    url: str
+    """Request path the file is served under, e.g. "/css/style.css"."""
+    path: str
+    size: int
+    mtime: float
+    mtime_ns: int
+    mimetype: str
+    encoding: str
+    """Content-coding of a precompressed variant; "" for the file itself."""
+    etag: str
+    headers: Dict[str, str]
+    """Accept-Ranges, ETag, Last-Modified and Cache-Control headers sent with the
+    file, plus Content-Encoding and Vary where they apply."""
+    variants: Dict[str, "StaticFile"]
+    """Precompressed ".br"/".gz" siblings by content-coding."""
+
+    def __init__(
+        self,
+        url: str,
+        path: str,
+        stat_: os.stat_result,
+        cache_control: str = "",
+        encoding: str = "",
+        mimetype: str | None = None,
+    ) -> None: ...
+    def add_variant(self, variant: "StaticFile") -> None: ...
+    def negotiate(self, accept_encoding: str) -> "StaticFile":
+        """The variant to send for an Accept-Encoding header, or the file itself."""
+        ...
+    def changed(self, stat_: os.stat_result) -> bool:
+        """Whether the size or modification time differ from the recorded ones."""
+        ...
+
+    def not_modified(self, headers: Mapping[str, str]) -> bool:
+        """Whether the request's If-None-Match or If-Modified-Since header is
+        satisfied, i.e. the client copy is current and a 304 may be sent."""
+        ...
+
+    def if_range(self, value: str | None) -> bool:
+        """Whether a Range may be honoured given the request's If-Range value
+        (a strong ETag or the Last-Modified date); True without If-Range."""
+        ...
+
+class StaticIndex(object):
+    """Maps request paths to the files of a list of directories, so serving a
+    static file needs no stat() calls per directory. "name.gz" and "name.br"
+    files at least as new as "name" are recorded as its precompressed variants.
+
+    The directories are walked by build() and then rescanned every refresh_interval
+    seconds (never when it is 0) by a background thread that the first lookup() in
+    each process starts, so requests never wait for a scan. Symbolic links are
+    followed, except back into a directory they are already inside.
+    """
+
+    directories: List[str]
+    cache_control: str
+    refresh_interval: float
+
+    def __init__(
+        self,
+        directories: List[str],
+        cache_control: str = "",
+        refresh_interval: float = 5,
+    ) -> None: ...
+    def build(self) -> "StaticIndex":
+        """Walk the directories and replace the index. Files of earlier
+        directories win over later ones with the same path."""
+        ...
+
+    def lookup(self, path: str) -> StaticFile | None:
+        """File served for a (percent-encoded) request path, if any."""
+        ...
+
+    def refresh(self, file: StaticFile, stat_: os.stat_result) -> StaticFile:
+        """Record a new stat result for a file that changed since it was indexed."""
+        ...
+
+    def discard(self, file: StaticFile) -> None:
+        """Forget a file that no longer exists."""
+        ...
+
+    def __len__(self) -> int: ...
+
+def parse_range(header: str, size: int) -> List[Tuple[int, int]] | None:
+    """Parse a "bytes=" Range header against a representation of `size` bytes.
+
+    Returns:
+        List[Tuple[int, int]] | None: Satisfiable (first, last) byte positions,
+        inclusive, sorted and with overlapping ranges merged; an empty list when
+        none is satisfiable (416); None when the header is invalid, uses another
+        unit or asks for too many ranges, so the whole file should be sent.
+    """
+    ...
+
+def byterange_parts(
+    ranges: List[Tuple[int, int]], size: int, content_type: str, boundary: str
+) -> Tuple[List[Tuple[bytes, int, int]], bytes]:
+    """Frame ranges as a multipart/byteranges body.
+
+    Returns:
+        Tuple[List[Tuple[bytes, int, int]], bytes]: (part header, offset, count)
+        for every range, and the closing delimiter.
+    """
+    ...
+
+def send_file(
+    client: socket.socket, file: BinaryIO, offset: int = 0, count: int | None = None
+) -> int:
+    """Copy part of an open file to the client without reading it into memory.
+
+    Uses the client's sendfile() (os.sendfile for sockets) when available; other
+    socket-like clients receive 1 MiB slices of a read-only mmap of the file.
+
+    Args:
+        client (socket.socket): Connection to write to.
+        file (BinaryIO): File opened in binary mode.
+        offset (int, optional): Position of the first byte to send. Defaults to 0.
+        count (int | None, optional): Amount of bytes to send; the rest of the file when None. Defaults to None.
+
+    Returns:
+        int: Amount of bytes sent.
+    """
+    ...
@@ -0,0 +1,63 @@
+from NetJin.types import Dict
+from http import HTTPStatus
+from functools import lru_cache
+from typing import Sequence
+import socket
+
+__all__ = ["write", "status_line", "header_line", "CONNECTION"]
+
+_Buffer = bytes | bytearray | memoryview
+
+# Upper bound of buffers per sendmsg() call (IOV_MAX is 1024 on Linux and macOS).
+_IOV_MAX = 1024
+
+# Closing header of every response, by keep-alive.
+CONNECTION: Dict[bool, bytes] = {
+    True: b"Connection: keep-alive\r\n\r\n",
+    False: b"Connection: close\r\n\r\n",
+}
+
+
+@lru_cache(maxsize=None)
+def status_line(status: int, phrase: str | None = None) -> bytes:
+    if phrase is None:
+        try:
+            phrase = HTTPStatus(status).phrase
+        except ValueError:
+            phrase = "Unknown Status Code"
+    return b"HTTP/1.1 %d %s\r\n" % (status, phrase.encode("latin-1"))
+
+
+@lru_cache(maxsize=256)
+def _header_name(name: str) -> bytes:
+    # Names repeat across responses; values (ETag, Set-Cookie, ...) mostly don't.
+    return ("%s: " % name).encode()
+
+
+def header_line(name: str, value: str) -> bytes:
+    return _header_name(name) + str(value).encode() + b"\r\n"
+
+
+def write(client: socket.socket, buffers: Sequence[_Buffer]) -> int:
+    sendmsg = getattr(client, "sendmsg", None)
+    if sendmsg is None:
+        # Socket-like clients without scatter-gather write each buffer in full.
+        total = 0
+        for buffer in buffers:
+            client.sendall(buffer)
+            total += memoryview(buffer).nbytes
+        return total
+
+    views = [memoryview(buffer).cast("B") for buffer in buffers]
+    views = [view for view in views if view.nbytes]
+    total = sum(view.nbytes for view in views)
+    while views:
+        # sendmsg() may write less than asked; continue from where it stopped.
+        sent = sendmsg(views[:_IOV_MAX])
+        while sent:
+            if sent >= views[0].nbytes:
+                sent -= views.pop(0).nbytes
+            else:
+                views[0] = views[0][sent:]
+                sent = 0
+    return total
@@ -0,0 +1,36 @@
+from NetJin.types import Dict
+from typing import Sequence
+import socket
+
+__all__ = ["write", "status_line", "header_line", "CONNECTION"]
+
+CONNECTION: Dict[bool, bytes]
+"""Encoded `Connection` header plus the blank line ending the header block, by keep-alive."""
+
+def status_line(status: int, phrase: str | None = None) -> bytes:
+    """Encoded "HTTP/1.1 <status> <phrase>" line, cached per status.
+
+    Args:
+        status (int): Http status code.
+        phrase (str | None, optional): Reason phrase. Defaults to the standard phrase of the status.
+    """
+    ...
+
+def header_line(name: str, value: str) -> bytes:
+    """Encoded "name: value" header line; the encoded names are cached."""
+    ...
+
+def write(
+    client: socket.socket, buffers: Sequence[bytes | bytearray | memoryview]
+) -> int:
+    """Write buffers to the client in order without joining them. Sockets get a
+    scatter-gather sendmsg() call, repeated from where it stopped until
+    everything is written; other clients get one sendall() per buffer.
+
+    Returns:
+        int: Amount of bytes written.
+
+    Raises:
+        OSError: When the connection fails or times out.
+    """
+    ...
@@ -1,3 +1,10 @@
 from .extract_route_pattern import extract_route_pattern
+from .router import Router, CONVERTERS
+from .worker_pool import WorkerPool
+from .handover import HotRestart, inherited_socket, notify_ready, RESTART_SIGNALS
+from .prefork import Supervisor
+from .access_log import AccessLog
+from .metrics import Metrics
+from .profiler import Profiler
 
-__all__ = ["extract_route_pattern"]
+__all__ = ["extract_route_pattern", "Router", "CONVERTERS", "WorkerPool", "Supervisor", "HotRestart", "inherited_socket", "notify_ready", "RESTART_SIGNALS", "AccessLog", "Metrics", "Profiler"]
@@ -0,0 +1,199 @@
+from NetJin.types import List, Literal, Tuple
+from typing import IO
+import threading
+import datetime
+import atexit
+import random
+import time
+import queue
+import json
+import sys
+import os
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+__all__ = ["AccessLog"]
+
+# time, peer, method, path, version, status, bytes, duration
+_Record = Tuple[float, str, str, str, str, int, int, float]
+
+
+class AccessLog(object):
+    def __init__(
+        self,
+        path: str | None = "-",
+        format: Literal["text", "json"] = "text",
+        sample_rate: float = 1.0,
+        max_bytes: int = 0,
+        backups: int = 5,
+        batch_size: int = 256,
+    ) -> None:
+        self.path = path
+        self.format = format
+        self.sample_rate = sample_rate
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.batch_size = batch_size
+        # SimpleQueue.put() never blocks and takes no Python-level lock.
+        self._queue: "queue.SimpleQueue[_Record | None]" = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._pid = 0
+        self._lock = threading.Lock()
+        self._stream: IO[str] | None = None
+        self._size = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path) and self.sample_rate > 0
+
+    def sampled(self) -> bool:
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def log(
+        self,
+        peer: str,
+        method: str,
+        path: str,
+        version: str,
+        status: int,
+        bytes_sent: int,
+        duration: float,
+    ) -> None:
+        if self._pid != os.getpid():
+            # Every worker process starts its own writer.
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._start()
+        self._queue.put(
+            (time.time(), peer, method, path, version, status, bytes_sent, duration)
+        )
+
+    def _start(self) -> None:
+        self._queue = queue.SimpleQueue()
+        self._stream = None
+        self._thread = threading.Thread(target=self._run, name="NetJin-access-log", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+        self._pid = os.getpid()
+
+    def close(self, timeout: float = 1) -> None:
+        if self._thread is None or self._pid != os.getpid():
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            batch: List[_Record] = []
+            record = self._queue.get()
+            # Whatever queued up while the last batch was written goes out in one write.
+            while record is not None:
+                batch.append(record)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    record = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self._write("".join(map(self._format, batch)))
+            if record is None:
+                if self._stream is not None and self._stream is not sys.stdout:
+                    self._stream.close()
+                return
+
+    def _format(self, record: _Record) -> str:
+        time_, peer, method, path, version, status, bytes_sent, duration = record
+        date = datetime.datetime.fromtimestamp(time_).astimezone()
+        if self.format == "json":
+            return json.dumps(
+                {
+                    "time": date.isoformat(timespec="milliseconds"),
+                    "peer": peer,
+                    "method": method,
+                    "path": path,
+                    "version": version,
+                    "status": status,
+                    "bytes": bytes_sent,
+                    "duration": round(duration, 6),
+                }
+            ) + "\n"
+        return '%s - - [%s] "%s %s %s" %d %d %.6f\n' % (
+            peer or "-",
+            date.strftime("%d/%b/%Y:%H:%M:%S %z"),
+            method,
+            path,
+            version,
+            status,
+            bytes_sent,
+            duration,
+        )
+
+    def _write(self, data: str) -> None:
+        try:
+            if self._stream is None:
+                self._open()
+            elif self._stream is not sys.stdout and self.path:
+                # Other processes (prefork workers, the next generation after a
+                # restart) append to the same file, and may have rotated it.
+                if self._moved(self._stream, self.path):
+                    self._stream.close()
+                    self._open()
+                else:
+                    self._size = os.fstat(self._stream.fileno()).st_size
+            # max_bytes is a file size, so it is counted in encoded bytes, not characters.
+            size = len(data.encode("utf-8"))
+            if self.max_bytes and self._size + size > self.max_bytes and self._size:
+                self._rotate()
+            stream = self._stream
+            if stream is None:
+                return
+            stream.write(data)
+            stream.flush()
+            self._size += size
+        except OSError as e:
+            print("Access log: %r" % e, file=sys.stderr)
+
+    def _open(self) -> None:
+        if self.path == "-":
+            self._stream = sys.stdout
+            return
+        if self.path:
+            self._stream = open(self.path, "a", encoding="utf-8")
+            self._size = self._stream.tell()
+
+    def _moved(self, stream: IO[str], path: str) -> bool:
+        # Whether the file at path is no longer the one open here.
+        try:
+            return not os.path.samestat(os.stat(path), os.fstat(stream.fileno()))
+        except FileNotFoundError:
+            return True
+
+    def _rotate(self) -> None:
+        stream = self._stream
+        if stream is None or stream is sys.stdout or not self.path:
+            return
+        if fcntl is not None:
+            # Every process appending to the file can reach max_bytes at once. The
+            # first to take the lock rotates; the others then find a new file.
+            fcntl.flock(stream.fileno(), fcntl.LOCK_EX)
+        try:
+            if not self._moved(stream, self.path):
+                # access.log -> access.log.1 -> ... -> access.log.<backups>
+                for index in range(self.backups - 1, 0, -1):
+                    source = "%s.%d" % (self.path, index)
+                    if os.path.exists(source):
+                        os.replace(source, "%s.%d" % (self.path, index + 1))
+                if self.backups > 0:
+                    os.replace(self.path, self.path + ".1")
+                else:
+                    os.remove(self.path)
+        finally:
+            # Also releases the lock.
+            stream.close()
+            self._stream = None
+        self._open()
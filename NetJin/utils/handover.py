@@ -0,0 +1,110 @@
+from NetJin.types import Callable, Tuple
+from colorama import Fore, init
+import subprocess
+import threading
+import socket
+import select
+import signal
+import sys
+import os
+
+__all__ = ["HotRestart", "inherited_socket", "notify_ready", "RESTART_SIGNALS"]
+init(True)
+
+# Set by the old generation for the new one; file descriptor numbers survive exec.
+LISTEN_FD = "NETJIN_LISTEN_FD"
+READY_FD = "NETJIN_READY_FD"
+
+RESTART_SIGNALS: Tuple[int, ...] = tuple(
+    getattr(signal, name) for name in ("SIGHUP", "SIGUSR2") if hasattr(signal, name)
+)
+
+
+def inherited_socket() -> socket.socket | None:
+    fd = os.environ.pop(LISTEN_FD, None)
+    if fd is None:
+        return None
+    try:
+        return socket.socket(fileno=int(fd))
+    except (OSError, ValueError):
+        return None
+
+
+def notify_ready() -> None:
+    fd = os.environ.pop(READY_FD, None)
+    if fd is None:
+        return
+    try:
+        os.write(int(fd), b"1")
+        os.close(int(fd))
+    except (OSError, ValueError):
+        ...
+
+
+class HotRestart(object):
+    def __init__(
+        self,
+        server: socket.socket | None,
+        stop: Callable[[], None],
+        timeout: float = 30,
+    ) -> None:
+        # None where each worker binds its own SO_REUSEPORT socket.
+        self._server = server
+        self._stop = stop
+        self._timeout = timeout
+        self._lock = threading.Lock()
+
+    def install(self) -> None:
+        for signum in RESTART_SIGNALS:
+            signal.signal(signum, self._signal)
+
+    def _signal(self, signum: int, frame: object) -> None:
+        # Spawning and waiting happen off the signal handler, so serving carries on.
+        self.restart()
+
+    def restart(self) -> None:
+        if not self._lock.acquire(blocking=False):
+            return
+        threading.Thread(target=self._restart, name="NetJin-restart", daemon=True).start()
+
+    def _restart(self) -> None:
+        try:
+            process, ready = self._spawn()
+        except OSError as e:
+            print(f"{Fore.RED}Restart failed: {e}")
+            self._lock.release()
+            return
+
+        try:
+            readable, _, _ = select.select([ready], [], [], self._timeout or None)
+            started = bool(readable) and os.read(ready, 1) == b"1"
+        finally:
+            os.close(ready)
+
+        if not started:
+            print(f"{Fore.RED}Generation {process.pid} never started accepting; still serving.")
+            process.kill()
+            process.wait()
+            self._lock.release()
+            return
+        # The lock stays taken: this generation only drains from here on.
+        print(f"Generation {process.pid} is accepting; draining {os.getpid()}.")
+        self._stop()
+
+    def _spawn(self) -> Tuple[subprocess.Popen, int]:
+        ready, write = os.pipe()
+        env = dict(os.environ)
+        env[READY_FD] = str(write)
+        fds = [write]
+        if self._server is not None:
+            env[LISTEN_FD] = str(self._server.fileno())
+            fds.append(self._server.fileno())
+        try:
+            # orig_argv keeps "-m package" and interpreter options that argv loses.
+            process = subprocess.Popen([sys.executable, *sys.orig_argv[1:]], env=env, pass_fds=fds)
+        except BaseException:
+            os.close(ready)
+            raise
+        finally:
+            os.close(write)
+        return process, ready
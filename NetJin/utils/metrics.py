@@ -0,0 +1,190 @@
+from NetJin.types import Dict, List, Tuple
+from typing import Iterable
+import threading
+import bisect
+
+__all__ = ["Metrics", "DEFAULT_BUCKETS"]
+
+# Seconds; Prometheus client defaults.
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1, 2.5, 5, 7.5, 10,
+)
+
+
+class _Shard(object):
+    # Written by one thread only; other threads merely read it on scrape.
+    __slots__ = (
+        "requests",
+        "buckets",
+        "durations",
+        "bytes",
+        "sources",
+        "shed",
+        "timeouts",
+        "connections",
+        "opened",
+    )
+
+    def __init__(self) -> None:
+        self.requests: Dict[Tuple[str, str, int], int] = {}
+        self.buckets: Dict[str, List[int]] = {}
+        self.durations: Dict[str, float] = {}
+        self.bytes: Dict[str, int] = {}
+        self.sources: Dict[str, int] = {}
+        self.shed: Dict[str, int] = {}
+        self.timeouts: Dict[str, int] = {}
+        # Opened minus closed on this thread; only the sum over shards is meaningful.
+        self.connections = 0
+        self.opened = 0
+
+
+def _labels(**labels: object) -> str:
+    return ",".join(
+        '%s="%s"'
+        % (
+            key,
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for key, value in labels.items()
+    )
+
+
+def _number(value: float) -> str:
+    return "%d" % value if float(value).is_integer() else repr(float(value))
+
+
+class Metrics(object):
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS, prefix: str = "netjin") -> None:
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets))
+        self.prefix = prefix
+        self._local = threading.local()
+        self._shards: List[_Shard] = []
+        self._lock = threading.Lock()
+
+    def _shard(self) -> _Shard:
+        try:
+            return self._local.shard
+        except AttributeError:
+            # Taken once per thread; recording itself never locks.
+            shard = self._local.shard = _Shard()
+            with self._lock:
+                self._shards.append(shard)
+            return shard
+
+    def connection_opened(self) -> None:
+        shard = self._shard()
+        shard.connections += 1
+        shard.opened += 1
+
+    def connection_closed(self) -> None:
+        self._shard().connections -= 1
+
+    def shed(self, reason: str) -> None:
+        shard = self._shard()
+        shard.shed[reason] = shard.shed.get(reason, 0) + 1
+
+    def timeout(self, phase: str) -> None:
+        shard = self._shard()
+        shard.timeouts[phase] = shard.timeouts.get(phase, 0) + 1
+
+    def observe(
+        self,
+        route: str,
+        method: str,
+        status: int,
+        source: str,
+        bytes_sent: int,
+        duration: float,
+    ) -> None:
+        shard = self._shard()
+        key = (route, method, status)
+        shard.requests[key] = shard.requests.get(key, 0) + 1
+        buckets = shard.buckets.get(route)
+        if buckets is None:
+            # One slot per bound plus +Inf; cumulated on scrape.
+            buckets = shard.buckets[route] = [0] * (len(self.buckets) + 1)
+        buckets[bisect.bisect_left(self.buckets, duration)] += 1
+        shard.durations[route] = shard.durations.get(route, 0.0) + duration
+        shard.bytes[route] = shard.bytes.get(route, 0) + bytes_sent
+        shard.sources[source] = shard.sources.get(source, 0) + 1
+
+    def render(self, gauges: Dict[str, Tuple[str, float]] | None = None) -> str:
+        requests: Dict[Tuple[str, str, int], int] = {}
+        buckets: Dict[str, List[int]] = {}
+        durations: Dict[str, float] = {}
+        sent: Dict[str, int] = {}
+        sources: Dict[str, int] = {}
+        shed: Dict[str, int] = {}
+        timeouts: Dict[str, int] = {}
+        connections = opened = 0
+
+        with self._lock:
+            shards = list(self._shards)
+        for shard in shards:
+            # list() copies each dict in one step, so a concurrent insert can't break it.
+            for key, count in list(shard.requests.items()):
+                requests[key] = requests.get(key, 0) + count
+            for route, counts in list(shard.buckets.items()):
+                merged = buckets.setdefault(route, [0] * len(counts))
+                for index, count in enumerate(list(counts)):
+                    merged[index] += count
+            for route, total in list(shard.durations.items()):
+                durations[route] = durations.get(route, 0.0) + total
+            for route, total in list(shard.bytes.items()):
+                sent[route] = sent.get(route, 0) + total
+            for source, count in list(shard.sources.items()):
+                sources[source] = sources.get(source, 0) + count
+            for reason, count in list(shard.shed.items()):
+                shed[reason] = shed.get(reason, 0) + count
+            for phase, count in list(shard.timeouts.items()):
+                timeouts[phase] = timeouts.get(phase, 0) + count
+            connections += shard.connections
+            opened += shard.opened
+
+        prefix = self.prefix
+        lines: List[str] = []
+
+        def family(name: str, kind: str, help_: str) -> str:
+            lines.append("# HELP %s_%s %s" % (prefix, name, help_))
+            lines.append("# TYPE %s_%s %s" % (prefix, name, kind))
+            return prefix + "_" + name
+
+        name = family("requests_total", "counter", "Requests served by route, method and status.")
+        for (route, method, status), count in sorted(requests.items()):
+            lines.append("%s{%s} %d" % (name, _labels(route=route, method=method, status=status), count))
+
+        name = family("request_duration_seconds", "histogram", "Time spent dispatching a request.")
+        for route, counts in sorted(buckets.items()):
+            total = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                total += count
+                le = "+Inf" if bound == float("inf") else _number(bound)
+                lines.append("%s_bucket{%s} %d" % (name, _labels(route=route, le=le), total))
+            lines.append("%s_sum{%s} %s" % (name, _labels(route=route), _number(durations.get(route, 0))))
+            lines.append("%s_count{%s} %d" % (name, _labels(route=route), total))
+
+        name = family("response_bytes_total", "counter", "Bytes sent in responses by route.")
+        for route, total in sorted(sent.items()):
+            lines.append("%s{%s} %d" % (name, _labels(route=route), total))
+
+        name = family("responses_total", "counter", "Responses by what served them (dynamic, cache, static, error).")
+        for source, count in sorted(sources.items()):
+            lines.append("%s{%s} %d" % (name, _labels(source=source), count))
+
+        name = family("shed_total", "counter", "Connections and requests answered 503 by admission control.")
+        for reason, count in sorted(shed.items()):
+            lines.append("%s{%s} %d" % (name, _labels(reason=reason), count))
+
+        name = family("client_timeouts_total", "counter", "Connections closed for a slow or idle client, by phase.")
+        for phase, count in sorted(timeouts.items()):
+            lines.append("%s{%s} %d" % (name, _labels(phase=phase), count))
+
+        name = family("connections_active", "gauge", "Client connections currently open.")
+        lines.append("%s %d" % (name, connections))
+        name = family("connections_total", "counter", "Client connections accepted.")
+        lines.append("%s %d" % (name, opened))
+
+        for key, (help_, value) in (gauges or {}).items():
+            name = family(key, "gauge", help_)
+            lines.append("%s %s" % (name, _number(value)))
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,109 @@
+from NetJin.types import Callable, Dict, List
+from .handover import RESTART_SIGNALS
+from typing import Iterable
+from colorama import Fore, init
+import traceback
+import signal
+import time
+import os
+
+__all__ = ["Supervisor"]
+init(True)
+
+# Workers dying faster than this are restarted with a delay to avoid a fork loop.
+_MIN_LIFETIME = 1.0
+
+
+class Supervisor(object):
+    def __init__(
+        self,
+        target: Callable[[], None],
+        processes: int,
+        forward: Iterable[int] = (),
+        ready: Callable[[], None] | None = None,
+    ) -> None:
+        self._target = target
+        self._processes = max(1, processes)
+        # Signals relayed to every worker instead of handled by the supervisor.
+        self._forward: List[int] = list(forward)
+        # Called once the first workers are forked.
+        self._ready = ready
+        self._children: Dict[int, float] = {}
+        self._stopping = False
+
+    @property
+    def children(self) -> Dict[int, float]:
+        return dict(self._children)
+
+    def run(self) -> None:
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+        for signum in self._forward:
+            signal.signal(signum, self._relay)
+
+        for _ in range(self._processes):
+            self._spawn()
+        if self._ready is not None:
+            self._ready()
+
+        while self._children:
+            try:
+                pid, _ = os.wait()
+            except ChildProcessError:
+                break
+
+            started = self._children.pop(pid, None)
+            if started is None or self._stopping:
+                continue
+
+            print(f"{Fore.YELLOW}Worker {pid} exited, restarting.")
+            if time.monotonic() - started < _MIN_LIFETIME:
+                time.sleep(_MIN_LIFETIME)
+            if not self._stopping:
+                self._spawn()
+
+    def _spawn(self) -> None:
+        pid = os.fork()
+        if pid:
+            self._children[pid] = time.monotonic()
+            return
+
+        code = 0
+        try:
+            # The supervisor owns Ctrl+C and forwards it as SIGTERM.
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            signal.signal(signal.SIGTERM, signal.default_int_handler)
+            for signum in self._forward:
+                signal.signal(signum, signal.SIG_DFL)
+            # Restarts replace the whole generation and are the supervisor's job.
+            for signum in RESTART_SIGNALS:
+                signal.signal(signum, signal.SIG_IGN)
+            self._target()
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else 0
+        except KeyboardInterrupt:
+            ...
+        except BaseException:
+            print(f"{Fore.RED}{traceback.format_exc()}")
+            code = 1
+        finally:
+            os._exit(code)
+
+    def stop(self) -> None:
+        # Workers finish what they are serving; asked twice, they are killed.
+        signum = signal.SIGKILL if self._stopping else signal.SIGTERM
+        self._stopping = True
+        self._signal(signum)
+
+    def _stop(self, signum: int, frame: object) -> None:
+        self.stop()
+
+    def _relay(self, signum: int, frame: object) -> None:
+        self._signal(signum)
+
+    def _signal(self, signum: int) -> None:
+        for pid in list(self._children):
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                ...
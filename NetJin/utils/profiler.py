@@ -0,0 +1,213 @@
+from NetJin.types import Dict, List, Tuple
+from collections import defaultdict
+from typing import Any, Callable, Iterable, Set, TypeVar
+import threading
+import cProfile
+import pstats
+import random
+import re
+import os
+
+__all__ = ["Profiler", "collapsed_stacks"]
+
+# (file, line, function) as used by pstats.
+_Function = Tuple[str, int, str]
+
+_T = TypeVar("_T")
+
+# Call chains deeper than this are cut off in the collapsed output.
+_MAX_DEPTH = 64
+
+
+def _label(function: _Function) -> str:
+    file, line, name = function
+    if file == "~":
+        # Built-ins: "<built-in method time.sleep>", "<method 'join' of 'str' objects>"
+        label = name
+    else:
+        label = "%s (%s:%d)" % (name, os.path.basename(file), line)
+    # ";" separates frames in the collapsed format.
+    return label.replace(";", ",")
+
+
+def collapsed_stacks(stats: pstats.Stats) -> List[str]:
+    # cProfile records caller/callee edges, not stacks; every path is rebuilt from
+    # the edges, splitting a function's time between its callers by their share
+    # of its cumulative time.
+    entries = stats.stats  # type: ignore[attr-defined]
+    callees: Dict[_Function, Dict[_Function, float]] = defaultdict(dict)
+    roots: List[_Function] = []
+    for function, (_, _, _, _, callers) in entries.items():
+        if not callers:
+            roots.append(function)
+        for caller, edge in callers.items():
+            callees[caller][function] = edge[3]
+
+    totals: Dict[str, float] = defaultdict(float)
+
+    def walk(function: _Function, stack: List[str], share: float, seen: frozenset) -> None:
+        _, _, own, cumulative, _ = entries[function]
+        stack = stack + [_label(function)]
+        if own * share > 0:
+            totals[";".join(stack)] += own * share
+        if len(stack) >= _MAX_DEPTH:
+            return
+        for callee, edge_time in callees.get(function, {}).items():
+            if callee in seen:
+                continue
+            callee_time = entries[callee][3]
+            if callee_time <= 0 or edge_time <= 0:
+                continue
+            part = share * min(edge_time / callee_time, 1.0)
+            # Below a microsecond the path adds nothing visible to a flame graph.
+            if part * callee_time < 1e-6:
+                continue
+            walk(callee, stack, part, seen | {callee})
+
+    for root in roots:
+        walk(root, [], 1.0, frozenset((root,)))
+    # Flame graph tools take integer sample counts; microseconds here.
+    return [
+        "%s %d" % (stack, round(seconds * 1e6))
+        for stack, seconds in sorted(totals.items())
+        if round(seconds * 1e6) > 0
+    ]
+
+
+class Profiler(object):
+    def __init__(
+        self,
+        directory: str | os.PathLike,
+        sample_rate: float = 0.01,
+        routes: Iterable[str] | None = None,
+        enabled: bool = False,
+        dump_interval: float = 10,
+    ) -> None:
+        self.directory = os.fspath(directory)
+        self.sample_rate = sample_rate
+        self.routes = set(routes or ())
+        self.enabled = enabled
+        self.dump_interval = dump_interval
+        self._local = threading.local()
+        # cProfile can't run in two threads of one process at once (3.12+), so one
+        # request is profiled at a time and the others are simply not sampled.
+        # Since 3.12 the hook is process wide: other threads' work shows up too.
+        self._busy = threading.Lock()
+        self._stats: Dict[str, pstats.Stats] = {}
+        self._counts: Dict[str, int] = {}
+        # Routes sampled since their files were last written. Files are written by
+        # a background thread, never on the request path.
+        self._dirty: Set[str] = set()
+        self._wake = threading.Event()
+        self._starting = threading.Lock()
+        self._dumper: threading.Thread | None = None
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._forked)
+
+    def toggle(self, enabled: bool | None = None) -> bool:
+        self.enabled = (not self.enabled) if enabled is None else enabled
+        if not self.enabled:
+            # What was sampled so far is written out right away.
+            self.flush()
+        return self.enabled
+
+    def flush(self) -> None:
+        # Asks the background thread to write the files now. Safe from a signal
+        # handler or a request that is being profiled.
+        self._start()
+        self._wake.set()
+
+    def dump(self) -> None:
+        if not self._dirty:
+            return
+        # Holding _busy keeps any request from being profiled meanwhile, so the dump
+        # isn't recorded and no stats are added while they are written.
+        with self._busy:
+            routes, self._dirty = self._dirty, set()
+            for route in routes:
+                self._dump(route, self._stats[route])
+
+    def close(self) -> None:
+        self.dump()
+
+    def _start(self) -> None:
+        with self._starting:
+            if self._dumper is not None:
+                return
+            self._dumper = threading.Thread(target=self._run, name="NetJin-profiler", daemon=True)
+            self._dumper.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.dump_interval or None)
+            self._wake.clear()
+            self.dump()
+
+    def _forked(self) -> None:
+        # The child starts its own dumper on its first sample.
+        self._starting = threading.Lock()
+        self._dumper = None
+
+    def begin(self) -> None:
+        if not self.enabled or getattr(self._local, "profile", None) is not None:
+            return
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return
+        if self._busy.acquire(blocking=False):
+            self._local.profile = cProfile.Profile()
+
+    def call(self, function: Callable[..., _T], *args: Any) -> _T:
+        # Runs under the profile begun on this thread, if any. Profiling whole calls
+        # keeps the recorded call graph rooted at `function`.
+        profile: cProfile.Profile | None = getattr(self._local, "profile", None)
+        if profile is None:
+            return function(*args)
+        try:
+            return profile.runcall(function, *args)
+        except ValueError as e:
+            if "profiling tool" not in str(e):
+                raise
+            # Another profiler or debugger holds the hook.
+            return function(*args)
+
+    def end(self, route: str | None) -> None:
+        profile: cProfile.Profile | None = getattr(self._local, "profile", None)
+        if profile is None:
+            return
+        self._local.profile = None
+        try:
+            if route is not None and (not self.routes or route in self.routes):
+                self._keep(route, profile)
+        finally:
+            self._busy.release()
+
+    def _keep(self, route: str, profile: cProfile.Profile) -> None:
+        try:
+            stats = self._stats.get(route)
+            if stats is None:
+                stats = self._stats[route] = pstats.Stats(profile)
+            else:
+                stats.add(profile)
+        except TypeError:
+            # Nothing ran under the profile.
+            return
+        self._counts[route] = self._counts.get(route, 0) + 1
+        self._dirty.add(route)
+        if self._dumper is None:
+            self._start()
+
+    @property
+    def counts(self) -> Dict[str, int]:
+        return dict(self._counts)
+
+    def _dump(self, route: str, stats: pstats.Stats) -> None:
+        # Worker processes each write their own files; pstats.Stats.add() merges them.
+        name = "%s.%d" % (re.sub(r"[^A-Za-z0-9_.-]+", "_", route).strip("_") or "root", os.getpid())
+        base = os.path.join(self.directory, name)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            stats.dump_stats(base + ".pstats")
+            with open(base + ".collapsed", "w", encoding="utf-8") as file:
+                file.writelines(line + "\n" for line in collapsed_stacks(stats))
+        except OSError as e:
+            print("Profiler: %r" % e)
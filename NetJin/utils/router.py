@@ -0,0 +1,175 @@
+from NetJin.types import Any, Callable, Dict, List, Tuple
+from typing import Iterator
+from urllib.parse import unquote
+import re
+import uuid
+
+
+__all__ = ["Router", "CONVERTERS"]
+
+_ConverterType = Tuple["re.Pattern[str]", Callable[[str], Any]]
+
+# Converters usable as <converter:name> inside a route pattern.
+CONVERTERS: Dict[str, _ConverterType] = {
+    "str": (re.compile(r"[^/]+"), str),
+    "int": (re.compile(r"\d+"), int),
+    "float": (re.compile(r"\d+(?:\.\d+)?"), float),
+    "uuid": (
+        re.compile(
+            r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+        ),
+        uuid.UUID,
+    ),
+    "path": (re.compile(r".+"), str),
+}
+
+_PARAMETER = re.compile(r"<(?:(\w+):)?(\w+)>")
+
+
+class _Node(object):
+    __slots__ = ("static", "params", "patterns", "wildcard", "record")
+
+    def __init__(self) -> None:
+        # Children keyed by literal segment, e.g. "users" in "/users/<id>".
+        self.static: Dict[str, _Node] = {}
+        # Children for segments made of a single parameter, e.g. "<int:id>".
+        self.params: List[Tuple[str, _ConverterType, _Node]] = []
+        # Children for segments mixing text and parameters, e.g. "<name>:<age>".
+        self.patterns: List[
+            Tuple["re.Pattern[str]", Dict[str, _ConverterType], _Node]
+        ] = []
+        # Trailing <path:name> parameter that swallows the rest of the URL.
+        self.wildcard: Tuple[str, _Node] | None = None
+        self.record: Any = None
+
+
+def _converter(name: str | None, pattern: str) -> _ConverterType:
+    try:
+        return CONVERTERS[name or "str"]
+    except KeyError:
+        raise ValueError(
+            "Unknown converter '%s' in route '%s'" % (name, pattern)
+        ) from None
+
+
+def _split(path: str) -> List[str]:
+    # Trailing slashes are optional: "/about", "/about/" and "/about//" are the same route.
+    return path.rstrip("/").split("/")
+
+
+class Router(object):
+    def __init__(self) -> None:
+        self._root = _Node()
+
+    def add(self, pattern: str, record: Any) -> None:
+        node = self._root
+        segments = _split(pattern)
+        for index, segment in enumerate(segments):
+            params = list(_PARAMETER.finditer(segment))
+
+            if not params:
+                node = node.static.setdefault(segment, _Node())
+                continue
+
+            if len(params) == 1 and params[0].group(0) == segment:
+                converter_name, name = params[0].groups()
+                if converter_name == "path":
+                    if index != len(segments) - 1:
+                        raise ValueError(
+                            "<path:%s> must be the last segment of route '%s'"
+                            % (name, pattern)
+                        )
+                    if node.wildcard is None or node.wildcard[0] != name:
+                        node.wildcard = (name, _Node())
+                    node = node.wildcard[1]
+                    continue
+
+                converter = _converter(converter_name, pattern)
+                for param_name, param_converter, child in node.params:
+                    if param_name == name and param_converter is converter:
+                        node = child
+                        break
+                else:
+                    child = _Node()
+                    node.params.append((name, converter, child))
+                    node = child
+                continue
+
+            regex, converters, last = "", {}, 0
+            for param in params:
+                converter_name, name = param.groups()
+                converter = _converter(converter_name, pattern)
+                regex += re.escape(segment[last : param.start()])
+                regex += "(?P<%s>%s)" % (name, converter[0].pattern)
+                converters[name] = converter
+                last = param.end()
+            regex += re.escape(segment[last:])
+
+            for compiled, _, child in node.patterns:
+                if compiled.pattern == regex:
+                    node = child
+                    break
+            else:
+                child = _Node()
+                node.patterns.append((re.compile(regex), converters, child))
+                node = child
+
+        node.record = record
+
+    def lookup(
+        self, path: str, method: str | None = None
+    ) -> Tuple[Any, Dict[str, Any]] | None:
+        # Removing browser quotes like %20 representing space.
+        segments = _split(unquote(path))
+        fallback = None
+        for record, params in self._walk(self._root, segments, 0, {}):
+            if method is None or method in getattr(record, "methods", ()):
+                return record, params
+            if fallback is None:
+                # Remember the first match so the caller can answer 405.
+                fallback = (record, params)
+        return fallback
+
+    def _walk(
+        self,
+        node: _Node,
+        segments: List[str],
+        index: int,
+        params: Dict[str, Any],
+    ) -> Iterator[Tuple[Any, Dict[str, Any]]]:
+        if index == len(segments):
+            if node.record is not None:
+                yield node.record, params
+            return
+
+        segment = segments[index]
+
+        child = node.static.get(segment)
+        if child is not None:
+            yield from self._walk(child, segments, index + 1, params)
+
+        if segment:
+            for name, (regex, to_python), child in node.params:
+                if regex.fullmatch(segment):
+                    yield from self._walk(
+                        child,
+                        segments,
+                        index + 1,
+                        {**params, name: to_python(segment)},
+                    )
+
+            for regex, converters, child in node.patterns:
+                match = regex.fullmatch(segment)
+                if match:
+                    values = {
+                        key: converters[key][1](value)
+                        for key, value in match.groupdict().items()
+                    }
+                    yield from self._walk(
+                        child, segments, index + 1, {**params, **values}
+                    )
+
+        if node.wildcard is not None:
+            rest = "/".join(segments[index:])
+            if rest and node.wildcard[1].record is not None:
+                yield node.wildcard[1].record, {**params, node.wildcard[0]: rest}
@@ -0,0 +1,100 @@
+from NetJin.types import Any, Callable, List
+from colorama import Fore, init
+import threading
+import traceback
+import queue
+import time
+
+__all__ = ["WorkerPool"]
+init(True)
+
+_STOP = object()
+
+
+class WorkerPool(object):
+    def __init__(
+        self,
+        handler: Callable[[Any], None],
+        workers: int,
+        max_queue: int = 0,
+        name: str = "NetJin-worker",
+    ) -> None:
+        self._handler = handler
+        self._workers = max(1, workers)
+        self._queue: "queue.Queue[Any]" = queue.Queue(max(0, max_queue))
+        self._threads: List[threading.Thread] = []
+        self._name = name
+        self._busy = 0
+        self._lock = threading.Lock()
+        # Set by shutdown(): workers finish what is queued, then exit.
+        self._closing = False
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    @property
+    def busy(self) -> int:
+        return self._busy
+
+    @property
+    def size(self) -> int:
+        return len(self._threads)
+
+    def start(self) -> "WorkerPool":
+        self._closing = False
+        for index in range(self._workers - len(self._threads)):
+            thread = threading.Thread(
+                target=self._work, name="%s-%d" % (self._name, index), daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def submit(
+        self, item: Any, block: bool = True, timeout: float | None = None
+    ) -> bool:
+        if self._closing:
+            return False
+        try:
+            self._queue.put(item, block, timeout)
+            return True
+        except queue.Full:
+            return False
+
+    def shutdown(self, wait: bool = True, timeout: float | None = None) -> None:
+        self._closing = True
+        for _ in self._threads:
+            # Never blocks: a worker waiting on an empty queue gets a stop marker, and
+            # with the queue full every worker is busy and sees _closing once it's empty.
+            try:
+                self._queue.put_nowait(_STOP)
+            except queue.Full:
+                break
+        if wait:
+            # One deadline for the whole pool rather than timeout per thread.
+            deadline = None if timeout is None else time.monotonic() + timeout
+            for thread in self._threads:
+                thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        self._threads = []
+
+    def _work(self) -> None:
+        while True:
+            if self._closing:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    return
+            else:
+                item = self._queue.get()
+            if item is _STOP:
+                return
+            with self._lock:
+                self._busy += 1
+            try:
+                self._handler(item)
+            except Exception:
+                print(f"{Fore.RED}{traceback.format_exc()}")
+            finally:
+                with self._lock:
+                    self._busy -= 1
@@ -0,0 +1,45 @@
+from typing import Any, Dict
+import subprocess
+import platform
+import datetime
+import json
+import sys
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXAMPLE = os.path.join(ROOT, "example")
+
+if ROOT not in sys.path:
+    # Benchmarks run against the working tree, not an installed NetJin.
+    sys.path.insert(0, ROOT)
+
+
+def environment() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            timeout=5,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ""
+    return {
+        "date": datetime.datetime.now().astimezone().isoformat(timespec="seconds"),
+        "commit": commit or None,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def write_report(report: Dict[str, Any], path: str | None) -> None:
+    data = json.dumps(report, indent=2)
+    if path and path != "-":
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(data + "\n")
+        print("Report written to %s" % path, file=sys.stderr)
+    else:
+        print(data)
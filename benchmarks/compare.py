@@ -0,0 +1,70 @@
+"""Compare two benchmark reports written by micro.py or load.py.
+
+    python benchmarks/compare.py before.json after.json [--threshold 5]
+
+Prints every benchmark present in both reports with the relative change;
+changes beyond --threshold percent are marked as faster or slower.
+"""
+
+from typing import Any, Dict, List, Tuple
+import argparse
+import json
+import sys
+
+# Metric, and whether a larger value is better, per suite.
+_METRICS: Dict[str, List[Tuple[str, bool]]] = {
+    "micro": [("ns_per_op", False)],
+    "load": [("rps", True), ("latency_ms.p50", False), ("latency_ms.p99", False)],
+}
+
+
+def _value(result: Dict[str, Any], metric: str) -> float | None:
+    value: Any = result
+    for key in metric.split("."):
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return float(value)
+
+
+def _load(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--threshold", type=float, default=5, help="Percent change reported as a difference")
+    args = parser.parse_args()
+
+    before, after = _load(args.before), _load(args.after)
+    if before.get("suite") != after.get("suite"):
+        raise SystemExit("Reports are from different suites: %s, %s" % (before.get("suite"), after.get("suite")))
+    metrics = _METRICS[before["suite"]]
+    baseline = {result["name"]: result for result in before["results"]}
+
+    regressions = 0
+    print("%-36s %-16s %14s %14s %9s" % ("benchmark", "metric", "before", "after", "change"))
+    for result in after["results"]:
+        old = baseline.get(result["name"])
+        if old is None:
+            continue
+        for metric, higher_is_better in metrics:
+            a, b = _value(old, metric), _value(result, metric)
+            if a is None or b is None:
+                continue
+            change = (b - a) / a * 100 if a else 0.0
+            better = change > 0 if higher_is_better else change < 0
+            mark = ""
+            if abs(change) >= args.threshold:
+                mark = "faster" if better else "slower"
+                regressions += not better
+            line = "%-36s %-16s %14.2f %14.2f %+8.1f%% %s" % (result["name"], metric, a, b, change, mark)
+            print(line.rstrip())
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""End-to-end load test of NetJin on loopback.
+
+    python benchmarks/load.py [--engine thread|asyncio] [--processes N]
+                              [--connections 16] [--duration 5] [--output load.json]
+
+Starts benchmarks/server.py in a scratch directory with its own settings, then
+drives each scenario with keep-alive connections from an asyncio client and
+reports requests per second, latency percentiles and the server's RSS.
+"""
+
+from _common import EXAMPLE, ROOT, environment, write_report
+from typing import Any, Dict, List
+import subprocess
+import statistics
+import threading
+import tempfile
+import argparse
+import asyncio
+import socket
+import time
+import sys
+import os
+
+SCENARIOS: Dict[str, str] = {
+    "dynamic": "/hello",
+    "params": "/users/7",
+    "json": "/json",
+    "template": "/template",
+    "static": "/css/style.css",
+    "async": "/async",
+}
+
+_SETTINGS = """\
+PORT = {port}
+DEBUG = False
+TEMPLATE_DIRS = {templates!r}
+STATIC_DIRS = [{static!r}]
+ACCESS_LOG = None
+COMPRESSION = False
+PROCESSES = {processes}
+REUSE_PORT = {reuse_port}
+"""
+
+
+def _free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def _rss(pid: int) -> int | None:
+    # Resident set of the server and its pre-forked workers, in bytes (Linux only).
+    total = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            with open("/proc/%d/status" % current) as file:
+                for line in file:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+            with open("/proc/%d/task/%d/children" % (current, current)) as file:
+                pending.extend(int(child) for child in file.read().split())
+        except (OSError, ValueError):
+            if current == pid:
+                return None
+    return total
+
+
+class _RssSampler(threading.Thread):
+    def __init__(self, pid: int, interval: float = 0.1) -> None:
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.samples: List[int] = []
+        self._done = threading.Event()
+
+    def run(self) -> None:
+        while not self._done.is_set():
+            rss = _rss(self.pid)
+            if rss is not None:
+                self.samples.append(rss)
+            self._done.wait(self.interval)
+
+    def stop(self) -> Dict[str, float] | None:
+        self._done.set()
+        self.join()
+        if not self.samples:
+            return None
+        return {
+            "start_mb": round(self.samples[0] / 2**20, 1),
+            "peak_mb": round(max(self.samples) / 2**20, 1),
+            "end_mb": round(self.samples[-1] / 2**20, 1),
+        }
+
+
+async def _connection(
+    port: int, request: bytes, deadline: float, latencies: List[float], errors: List[str]
+) -> None:
+    reader = writer = None
+    while time.perf_counter() < deadline:
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            assert reader is not None
+            start = time.perf_counter()
+            writer.write(request)
+            head = await reader.readuntil(b"\r\n\r\n")
+            length, close = 0, False
+            for line in head.split(b"\r\n")[1:]:
+                name, _, value = line.partition(b":")
+                name = name.strip().lower()
+                if name == b"content-length":
+                    length = int(value)
+                elif name == b"connection":
+                    close = value.strip().lower() == b"close"
+            if length:
+                await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            status = int(head[9:12])
+            if status >= 400:
+                errors.append(str(status))
+            if close:
+                writer.close()
+                reader = writer = None
+        except (OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError) as e:
+            errors.append(type(e).__name__)
+            if writer is not None:
+                writer.close()
+            reader = writer = None
+            await asyncio.sleep(0.01)
+    if writer is not None:
+        writer.close()
+
+
+async def _drive(port: int, path: str, connections: int, duration: float) -> Dict[str, Any]:
+    request = ("GET %s HTTP/1.1\r\nHost: 127.0.0.1:%d\r\n\r\n" % (path, port)).encode()
+    latencies: List[float] = []
+    errors: List[str] = []
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(
+        *(_connection(port, request, deadline, latencies, errors) for _ in range(connections))
+    )
+    elapsed = time.perf_counter() - started
+    return {"latencies": latencies, "errors": errors, "elapsed": elapsed}
+
+
+def _percentile(ordered: List[float], percent: float) -> float:
+    if not ordered:
+        return 0.0
+    # Nearest rank.
+    index = max(0, min(len(ordered) - 1, int(round(percent / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def run_scenario(
+    name: str, path: str, port: int, pid: int, connections: int, duration: float, warmup: float
+) -> Dict[str, Any]:
+    if warmup > 0:
+        asyncio.run(_drive(port, path, connections, warmup))
+    sampler = _RssSampler(pid)
+    sampler.start()
+    outcome = asyncio.run(_drive(port, path, connections, duration))
+    rss = sampler.stop()
+
+    ordered = sorted(outcome["latencies"])
+    count = len(ordered)
+    errors: Dict[str, int] = {}
+    for error in outcome["errors"]:
+        errors[error] = errors.get(error, 0) + 1
+    return {
+        "name": name,
+        "path": path,
+        "requests": count,
+        "errors": errors,
+        "duration_s": round(outcome["elapsed"], 3),
+        "rps": round(count / outcome["elapsed"], 1) if outcome["elapsed"] else 0.0,
+        "latency_ms": {
+            "mean": round(statistics.fmean(ordered) * 1000, 3) if ordered else 0.0,
+            "p50": round(_percentile(ordered, 50) * 1000, 3),
+            "p90": round(_percentile(ordered, 90) * 1000, 3),
+            "p99": round(_percentile(ordered, 99) * 1000, 3),
+            "max": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+        },
+        "rss": rss,
+    }
+
+
+def _start_server(directory: str, engine: str, processes: int) -> subprocess.Popen:
+    server = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "benchmarks", "server.py"), "--engine", engine, "--processes", str(processes)],
+        cwd=directory,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+    )
+    assert server.stdout is not None
+    line = server.stdout.readline()
+    if "ready" not in line:
+        server.kill()
+        raise SystemExit("Server failed to start:\n" + line + server.stdout.read())
+    # The rest of the output is drained so a chatty server never blocks on a full pipe.
+    threading.Thread(target=server.stdout.read, daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--engine", default="thread", choices=["thread", "asyncio"])
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--connections", "-c", type=int, default=16)
+    parser.add_argument("--duration", "-d", type=float, default=5, help="Seconds per scenario")
+    parser.add_argument("--warmup", type=float, default=1, help="Seconds before measuring")
+    parser.add_argument("--scenario", "-s", action="append", choices=sorted(SCENARIOS), help="Repeatable; default all")
+    parser.add_argument("--port", type=int, default=0, help="Default: a free port")
+    parser.add_argument("--output", "-o", help="JSON report file (default: stdout)")
+    args = parser.parse_args()
+
+    port = args.port or _free_port()
+    results = []
+    with tempfile.TemporaryDirectory(prefix="netjin-bench-") as directory:
+        os.makedirs(os.path.join(directory, "config"))
+        with open(os.path.join(directory, "config", "settings.py"), "w") as file:
+            file.write(
+                _SETTINGS.format(
+                    port=port,
+                    templates=os.path.join(EXAMPLE, "views"),
+                    static=os.path.join(EXAMPLE, "static"),
+                    processes=args.processes,
+                    reuse_port=args.processes > 1 and hasattr(socket, "SO_REUSEPORT"),
+                )
+            )
+        server = _start_server(directory, args.engine, args.processes)
+        try:
+            for name in args.scenario or list(SCENARIOS):
+                result = run_scenario(
+                    name, SCENARIOS[name], port, server.pid, args.connections, args.duration, args.warmup
+                )
+                print(
+                    "%-10s %9.1f req/s  p50 %7.2f ms  p99 %7.2f ms  errors %d"
+                    % (
+                        name,
+                        result["rps"],
+                        result["latency_ms"]["p50"],
+                        result["latency_ms"]["p99"],
+                        sum(result["errors"].values()),
+                    ),
+                    file=sys.stderr,
+                )
+                results.append(result)
+        finally:
+            server.terminate()
+            try:
+                server.wait(10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+
+    write_report(
+        {
+            "suite": "load",
+            "environment": environment(),
+            "config": {
+                "engine": args.engine,
+                "processes": args.processes,
+                "connections": args.connections,
+                "duration": args.duration,
+                "warmup": args.warmup,
+            },
+            "results": results,
+        },
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    main()
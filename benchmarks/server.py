@@ -0,0 +1,42 @@
+"""Application served by load.py; started in a directory holding its config/settings.py."""
+
+from _common import EXAMPLE  # noqa: F401  (puts the working tree on sys.path)
+from NetJin import WebServer, Request, Response
+import argparse
+
+app = WebServer(False)
+
+_USERS = [{"id": index, "name": "User %d" % index, "active": index % 2 == 0} for index in range(50)]
+
+
+@app.route("/hello")
+def hello(_: Request, response: Response) -> None:
+    response.send("Hello, World!")
+
+
+@app.route("/json")
+def users(_: Request, response: Response) -> None:
+    response.send(_USERS)
+
+
+@app.route("/users/<int:id>")
+def user(request: Request, response: Response) -> None:
+    response.send(_USERS[request.user_parameters["id"] % len(_USERS)])
+
+
+@app.route("/template")
+def template(_: Request, response: Response) -> None:
+    response.render("index.html", name="Benchmark")
+
+
+@app.route("/async")
+async def asynchronous(_: Request, response: Response) -> None:
+    await response.asend({"async": True})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--engine", default="thread", choices=["thread", "asyncio"])
+    parser.add_argument("--processes", type=int, default=1)
+    args = parser.parse_args()
+    app.run(lambda *_: print("ready", flush=True), engine=args.engine, processes=args.processes)
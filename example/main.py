@@ -42,5 +42,17 @@ def get_users(_: Request, response: Response):
     )
 
 
+@app.route("/users/export", methods=["GET"])
+def export_users(request: Request, response: Response):
+    count = request.queries.get("count", ["1000"])[0]
+    if not count.isdigit():
+        response.send("count must be a non-negative integer", 400)
+        return
+    count = int(count)
+    users = ({"id": i, "name": "User %d" % i} for i in range(count))
+    # Encoded and sent a chunk at a time instead of as one huge string.
+    response.json_stream(users, ndjson="ndjson" in request.queries)
+
+
 if __name__ == "__main__":
     app.run()
\ No newline at end of file
@@ -0,0 +1,10 @@
+import pytest
+import sys
+
+
+@pytest.fixture(autouse=True)
+def media_dir(tmp_path, monkeypatch):
+    # Uploads and spooled bodies land in MEDIA_DIR, relative to the working directory.
+    for module in ("NetJin.core.engine.engine", "NetJin.http.request"):
+        monkeypatch.setattr(sys.modules[module], "MEDIA_DIR", str(tmp_path))
+    return tmp_path
@@ -0,0 +1,99 @@
+from NetJin import WebServer
+from NetJin.core.engine import AsyncioEngine
+from contextlib import contextmanager
+from typing import Iterator, List, Sequence, Tuple
+import threading
+import asyncio
+import socket
+
+ENGINES = ["thread", "asyncio"]
+
+
+@contextmanager
+def serve(app: WebServer, engine: str = "thread") -> Iterator[Tuple[str, int]]:
+    # The app on an ephemeral loopback port, without run()'s signals and forking.
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    server.listen(64)
+    address = server.getsockname()
+    if engine == "asyncio":
+        app._engine = AsyncioEngine(app)
+        ready = threading.Event()
+        thread = threading.Thread(target=app._engine.serve, args=(server, ready.set), daemon=True)
+        thread.start()
+        ready.wait(5)
+        try:
+            yield address
+        finally:
+            app._engine.stop()
+            thread.join(5)
+            server.close()
+        return
+
+    server.settimeout(0.1)
+    stopping = threading.Event()
+
+    def accept() -> None:
+        while not stopping.is_set():
+            try:
+                client, _ = server.accept()
+            except (TimeoutError, OSError):
+                continue
+            threading.Thread(target=app.handleClient, args=(client,), daemon=True).start()
+
+    thread = threading.Thread(target=accept, daemon=True)
+    thread.start()
+    try:
+        yield address
+    finally:
+        stopping.set()
+        thread.join(5)
+        server.close()
+
+
+def exchange(address: Tuple[str, int], data: bytes, timeout: float = 5) -> bytes:
+    # Sends data and returns everything received until the server closes.
+    with socket.create_connection(address, timeout) as client:
+        client.sendall(data)
+        received = b""
+        while True:
+            try:
+                chunk = client.recv(65536)
+            except ConnectionResetError:
+                break
+            if not chunk:
+                break
+            received += chunk
+        return received
+
+
+def responses(data: bytes, methods: Sequence[str] = ()) -> List[Tuple[int, dict, bytes]]:
+    # Splits a stream of Content-Length framed responses into (status, headers, body).
+    # Responses to the HEAD requests among methods have no body.
+    result = []
+    while data:
+        head_only = len(methods) > len(result) and methods[len(result)] == "HEAD"
+        head, _, data = data.partition(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        length = 0 if head_only else int(headers.get("content-length", 0))
+        result.append((int(lines[0].split()[1]), headers, data[:length]))
+        data = data[length:]
+    return result
+
+
+def request(
+    method: str, path: str, body: bytes = b"", headers: dict | None = None, close: bool = True
+) -> bytes:
+    lines = ["%s %s HTTP/1.1" % (method, path)]
+    headers = dict(headers or {})
+    headers.setdefault("Host", "test")
+    if body and "Transfer-Encoding" not in headers:
+        headers.setdefault("Content-Length", str(len(body)))
+    if close:
+        headers.setdefault("Connection", "close")
+    lines.extend("%s: %s" % header for header in headers.items())
+    return ("\r\n".join(lines) + "\r\n\r\n").encode() + body
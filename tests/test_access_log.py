@@ -0,0 +1,77 @@
+from NetJin.utils import AccessLog
+import multiprocessing
+import json
+import os
+import pytest
+
+
+def records(log: AccessLog, count: int, path: str = "/page") -> None:
+    for index in range(count):
+        log.log("127.0.0.1", "GET", path, "HTTP/1.1", 200, index, 0.001)
+
+
+def lines(directory, name: str = "access.log") -> list:
+    found = []
+    for entry in sorted(os.listdir(directory)):
+        if entry.startswith(name):
+            with open(os.path.join(directory, entry), encoding="utf-8") as file:
+                found.extend(file.read().splitlines())
+    return found
+
+
+def test_text_format(tmp_path):
+    log = AccessLog(str(tmp_path / "access.log"))
+    records(log, 2, "/zoë")
+    log.close()
+    first, second = lines(tmp_path)
+    assert first.startswith("127.0.0.1 - - [")
+    assert first.endswith('] "GET /zoë HTTP/1.1" 200 0 0.001000')
+    assert second.endswith(" 200 1 0.001000")
+
+
+def test_json_format(tmp_path):
+    log = AccessLog(str(tmp_path / "access.log"), "json")
+    records(log, 1)
+    log.close()
+    (line,) = lines(tmp_path)
+    record = json.loads(line)
+    assert {key: record[key] for key in ("peer", "method", "path", "status", "bytes")} == {
+        "peer": "127.0.0.1",
+        "method": "GET",
+        "path": "/page",
+        "status": 200,
+        "bytes": 0,
+    }
+
+
+def test_disabled():
+    assert not AccessLog(None).enabled
+    assert not AccessLog("-", sample_rate=0).enabled
+    assert AccessLog("-", sample_rate=1).sampled()
+
+
+def test_rotation_keeps_backups(tmp_path):
+    log = AccessLog(str(tmp_path / "access.log"), max_bytes=300, backups=2, batch_size=1)
+    records(log, 50)
+    log.close()
+    assert sorted(os.listdir(tmp_path)) == ["access.log", "access.log.1", "access.log.2"]
+    for name in os.listdir(tmp_path):
+        assert os.path.getsize(tmp_path / name) <= 300
+
+
+def _worker(path: str) -> None:
+    log = AccessLog(path, max_bytes=2000, backups=1000, batch_size=4)
+    records(log, 200)
+    log.close(timeout=10)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="prefork only")
+def test_processes_share_rotation(tmp_path):
+    # Every line survives when several processes rotate the same file.
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=_worker, args=(str(tmp_path / "access.log"),)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(30)
+    assert len(lines(tmp_path)) == 4 * 200
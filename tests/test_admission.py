@@ -0,0 +1,136 @@
+from NetJin import WebServer
+from NetJin.core.admission import accept, admit, limit, UNAVAILABLE
+from NetJin.utils import WorkerPool
+from tests.server import ENGINES, serve, exchange, responses, request
+from contextlib import contextmanager
+import threading
+import socket
+import time
+import sys
+import pytest
+
+
+@contextmanager
+def accepting(handle, workers: int = 1, max_queue: int = 0, connections: int = 0):
+    # accept() and admit() on an ephemeral port; yields the address and the shed reasons.
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    server.listen(16)
+    server.settimeout(0.1)
+    cap = limit(connections)
+    shed = []
+
+    def reject(client, reason):
+        shed.append(reason)
+        client.sendall(UNAVAILABLE)
+        client.close()
+
+    def admitted(item):
+        admit(item, handle, cap, reject)
+
+    pool = WorkerPool(admitted, workers, max_queue).start()
+    stopping = threading.Event()
+    thread = threading.Thread(
+        target=accept,
+        args=(server, pool, cap, lambda client: None, lambda: not stopping.is_set(), reject),
+        daemon=True,
+    )
+    thread.start()
+    try:
+        yield server.getsockname(), shed
+    finally:
+        stopping.set()
+        thread.join(5)
+        pool.shutdown(wait=True, timeout=5)
+        server.close()
+
+
+def answered(address) -> bytes:
+    with socket.create_connection(address, 5) as client:
+        return client.recv(65536)
+
+
+def test_unavailable():
+    (status, headers, body), = responses(UNAVAILABLE)
+    assert (status, headers["retry-after"], headers["connection"]) == (503, "1", "close")
+    assert body == b"Service Unavailable"
+
+
+def test_connection_cap():
+    release = threading.Event()
+
+    def handle(client):
+        release.wait(5)
+        client.sendall(b"served")
+        client.close()
+
+    with accepting(handle, workers=2, connections=1) as (address, shed):
+        with socket.create_connection(address, 5) as first:
+            time.sleep(0.1)
+            assert answered(address).startswith(b"HTTP/1.1 503 ")
+            release.set()
+            assert first.recv(64) == b"served"
+        assert shed == ["connections"]
+        # The slot is free again.
+        assert answered(address) == b"served"
+
+
+def test_full_queue():
+    release = threading.Event()
+
+    def handle(client):
+        release.wait(5)
+        client.close()
+
+    with accepting(handle, workers=1, max_queue=1) as (address, shed):
+        busy = socket.create_connection(address, 5)
+        time.sleep(0.1)
+        queued = socket.create_connection(address, 5)
+        time.sleep(0.1)
+        assert answered(address).startswith(b"HTTP/1.1 503 ")
+        release.set()
+        busy.close()
+        queued.close()
+    assert shed == ["queue"]
+
+
+def test_queue_timeout(monkeypatch):
+    monkeypatch.setattr(sys.modules["NetJin.core.admission"], "QUEUE_TIMEOUT", 0.1)
+    release = threading.Event()
+
+    def handle(client):
+        release.wait(0.3)
+        client.sendall(b"served")
+        client.close()
+
+    with accepting(handle) as (address, shed):
+        with socket.create_connection(address, 5) as first:
+            time.sleep(0.05)
+            # Waits behind the first connection for longer than QUEUE_TIMEOUT.
+            assert answered(address).startswith(b"HTTP/1.1 503 ")
+            assert first.recv(64) == b"served"
+    assert shed == ["queue_timeout"]
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_inflight_cap(engine):
+    app = WebServer()
+    app._inflight = limit(1)
+    started, release = threading.Event(), threading.Event()
+
+    @app.route("/slow")
+    def slow(request, response):
+        started.set()
+        release.wait(5)
+        response.send("done")
+
+    with serve(app, engine) as address:
+        result = []
+        thread = threading.Thread(target=lambda: result.append(exchange(address, request("GET", "/slow"))))
+        thread.start()
+        assert started.wait(5)
+        (status, headers, _), = responses(exchange(address, request("GET", "/slow")))
+        assert (status, headers["retry-after"]) == (503, "1")
+        release.set()
+        thread.join(5)
+    assert responses(result[0])[0][2] == b"done"
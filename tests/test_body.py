@@ -0,0 +1,89 @@
+from NetJin import WebServer
+from tests.server import ENGINES, serve, exchange, responses, request
+import pytest
+import socket
+
+
+@pytest.fixture
+def app():
+    app = WebServer()
+
+    @app.route("/ignore", ["POST"])
+    def ignore(request, response):
+        response.send(b"ignored")
+
+    @app.route("/chunks", ["POST"])
+    def chunks(request, response):
+        response.send(b",".join(b"%d" % len(chunk) for chunk in request.stream(4)))
+
+    @app.route("/upload", ["POST"])
+    async def upload(request, response):
+        (file,) = request.files["file"]
+        response.send(b"%s %s %s" % (request.form["name"][0].encode(), file.filename.encode(), file.read()))
+
+    @app.route("/abody", ["POST"])
+    async def abody(request, response):
+        response.send(request.body)
+
+    return app
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_unread_body_is_skipped(app, engine):
+    data = request("POST", "/ignore", b"x" * 100, close=False) + request("POST", "/abody", b"next")
+    with serve(app, engine) as address:
+        received = responses(exchange(address, data))
+    assert [body for _, _, body in received] == [b"ignored", b"next"]
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_large_unread_body_closes(app, engine):
+    data = request("POST", "/ignore", b"x" * 1024 * 1024, close=False)
+    with serve(app, engine) as address:
+        (status, headers, body), = responses(exchange(address, data))
+    assert (status, body) == (200, b"ignored")
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_body_is_read_as_asked(app, engine):
+    chunked = request("POST", "/chunks", headers={"Transfer-Encoding": "chunked"})
+    with serve(app, engine) as address:
+        received = exchange(address, chunked + b"a\r\n0123456789\r\n0\r\n\r\n")
+    assert responses(received)[0][2] == b"4,4,2"
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("path, answer", [("/ignore", b"ignored"), ("/abody", b"body")])
+def test_100_continue_only_when_read(app, engine, path, answer):
+    head = request("POST", path, headers={"Content-Length": "4", "Expect": "100-continue"})
+    with serve(app, engine) as address:
+        with socket.create_connection(address, 5) as client:
+            client.sendall(head)
+            received = client.recv(65536)
+            if path == "/abody":
+                assert received == b"HTTP/1.1 100 Continue\r\n\r\n"
+                client.sendall(b"body")
+                received = b""
+            while chunk := client.recv(65536):
+                received += chunk
+    assert b"100 Continue" not in received
+    assert responses(received)[0][2] == answer
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_async_route_uploads(app, engine):
+    body = (
+        b"--b\r\n"
+        b'Content-Disposition: form-data; name="name"\r\n\r\n'
+        b"zoe\r\n"
+        b"--b\r\n"
+        b'Content-Disposition: form-data; name="file"; filename="a.txt"\r\n'
+        b"Content-Type: text/plain\r\n\r\n"
+        b"hello\r\n"
+        b"--b--\r\n"
+    )
+    headers = {"Content-Type": "multipart/form-data; boundary=b"}
+    with serve(app, engine) as address:
+        received = exchange(address, request("POST", "/upload", body, headers))
+    assert responses(received)[0][2] == b"zoe a.txt hello"
+
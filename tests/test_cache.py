@@ -0,0 +1,105 @@
+from NetJin import WebServer
+from NetJin.http.cache import CacheEntry, DiskCache, MemoryCache, ResponseCache
+from NetJin.http.request import create_request_object
+from tests.server import ENGINES, serve, exchange, responses, request
+import pytest
+
+
+def make_request(method: str = "GET", target: str = "/a?x=1", **headers: str):
+    lines = ["%s %s HTTP/1.1" % (method, target)]
+    lines.extend("%s: %s" % (name.replace("_", "-"), value) for name, value in headers.items())
+    return create_request_object(("\r\n".join(lines) + "\r\n\r\n").encode())
+
+
+def entry(body: bytes = b"body", ttl: float = 60) -> CacheEntry:
+    return CacheEntry.build(200, {"Content-Type": "text/plain"}, body, ttl)
+
+
+def test_key():
+    cache = ResponseCache(vary=["Cookie"])
+    key = cache.key(make_request(Host="a.test"))
+    assert cache.key(make_request("HEAD", Host="a.test")) == key
+    assert cache.key(make_request(Host="A.TEST")) == key
+    assert cache.key(make_request(Host="b.test")) != key
+    assert cache.key(make_request("POST", Host="a.test")) != key
+    assert cache.key(make_request(target="/a?x=2", Host="a.test")) != key
+    assert cache.key(make_request(Host="a.test", Cookie="s=1")) != key
+    gzip = cache.key(make_request(Host="a.test", Accept_Encoding="gzip"))
+    assert gzip != key
+    assert cache.key(make_request(Host="a.test", Accept_Encoding="br, gzip;q=0.5")) == gzip
+
+
+def test_cacheable():
+    cache = ResponseCache()
+    assert cache.cacheable(200, {"Content-Type": "text/plain"})
+    assert not cache.cacheable(404, {})
+    assert not cache.cacheable(200, {"Set-Cookie": "s=1"})
+    assert not cache.cacheable(200, {"Cache-Control": "private, max-age=60"})
+    assert not cache.cacheable(200, {"cache-control": "no-store"})
+
+
+def test_memory_cache_lru():
+    cache = MemoryCache(max_entries=2)
+    cache.set("a", entry())
+    cache.set("b", entry())
+    assert cache.get("a") is not None
+    cache.set("c", entry())
+    # b was the least recently used.
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert len(cache) == 2
+
+
+def test_memory_cache_bytes_and_ttl():
+    cache = MemoryCache(max_bytes=1000)
+    cache.set("big", entry(b"x" * 2000))
+    assert cache.get("big") is None
+    cache.set("stale", entry(ttl=-1))
+    assert cache.get("stale") is None and len(cache) == 0
+
+
+def test_disk_cache(tmp_path):
+    cache = DiskCache(tmp_path, max_entries=10)
+    cache.set("a", entry(b"disk"))
+    found = cache.get("a")
+    assert found is not None and found.body == b"disk"
+    assert DiskCache(tmp_path).get("a") is not None
+    cache.delete("a")
+    assert cache.get("a") is None
+    cache.set("stale", entry(ttl=-1))
+    assert cache.get("stale") is None
+
+
+def test_disk_cache_evicts(tmp_path):
+    cache = DiskCache(tmp_path, max_entries=10)
+    for index in range(30):
+        cache.set(str(index), entry())
+    assert len(list(tmp_path.iterdir())) <= 11
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_cached_route(engine):
+    app = WebServer()
+    calls = []
+
+    @app.route("/news", ["GET", "HEAD"])
+    @app.cache(ttl=60)
+    def news(request, response):
+        calls.append(request.method)
+        response.send("news %d" % len(calls))
+
+    with serve(app, engine) as address:
+
+        def get(method: str = "GET", host: str = "test") -> tuple:
+            data = request(method, "/news", headers={"Host": host})
+            return responses(exchange(address, data), [method])[0]
+
+        _, headers, body = get()
+        assert (headers["x-cache"], body) == ("MISS", b"news 1")
+        _, headers, body = get()
+        assert (headers["x-cache"], body) == ("HIT", b"news 1")
+        _, headers, body = get("HEAD")
+        assert (headers["x-cache"], headers["content-length"], body) == ("HIT", "6", b"")
+        _, headers, body = get(host="other")
+        assert (headers["x-cache"], body) == ("MISS", b"news 2")
+    assert calls == ["GET", "GET"]
@@ -0,0 +1,124 @@
+from NetJin import WebServer
+from NetJin.http.codec import JSONCodec, StdlibCodec, get_codec, json_default
+from NetJin.http.parser import RequestError
+from NetJin.http.request import create_request_object
+from tests.server import ENGINES, serve, exchange, responses, request
+from dataclasses import dataclass
+import datetime
+import decimal
+import uuid
+import enum
+import json
+import io
+import pytest
+
+
+@dataclass
+class User(object):
+    id: int
+    joined: datetime.date
+
+
+class Color(enum.Enum):
+    RED = "red"
+
+
+def codecs():
+    for name in ("json", "orjson", "ujson"):
+        try:
+            yield get_codec(name)
+        except ImportError:
+            continue
+
+
+@pytest.mark.parametrize("codec", list(codecs()), ids=lambda codec: codec.name)
+def test_codecs_round_trip(codec):
+    value = {"name": "Zoë", "items": [1, 2.5, None, True], "nested": {"url": "/a/b"}}
+    data = codec.dumps(value)
+    assert isinstance(data, bytes)
+    assert codec.loads(data) == value
+    assert codec.loads(data.decode()) == value
+
+
+@pytest.mark.parametrize("codec", list(codecs()), ids=lambda codec: codec.name)
+def test_codecs_encode_extra_types(codec):
+    value = [
+        User(1, datetime.date(2024, 5, 1)),
+        datetime.datetime(2024, 5, 1, 12, 30),
+        uuid.UUID(int=1),
+        Color.RED,
+    ]
+    assert codec.loads(codec.dumps(value)) == [
+        {"id": 1, "joined": "2024-05-01"},
+        "2024-05-01T12:30:00",
+        "00000000-0000-0000-0000-000000000001",
+        "red",
+    ]
+
+
+def test_json_default():
+    assert json_default(decimal.Decimal("1.10")) == "1.10"
+    assert sorted(json_default({2, 1})) == [1, 2]
+    with pytest.raises(TypeError):
+        json_default(object())
+
+
+def test_get_codec():
+    assert isinstance(get_codec("json"), StdlibCodec)
+    assert get_codec("auto").name in ("orjson", "ujson", "json")
+    codec = StdlibCodec()
+    assert get_codec(codec) is codec
+    with pytest.raises(ValueError):
+        get_codec("yaml")
+
+
+def test_custom_codec():
+    class Upper(JSONCodec):
+        name = "upper"
+
+        def dumps(self, value):
+            return json.dumps(value).upper().encode()
+
+        def loads(self, data):
+            return json.loads(data)
+
+    assert get_codec(Upper()).dumps({"a": "b"}) == b'{"A": "B"}'
+
+
+def body_request(body: bytes):
+    head = b"POST / HTTP/1.1\r\nContent-Length: %d\r\n\r\n" % len(body)
+    return create_request_object(head, io.BytesIO(body))
+
+
+def test_request_json():
+    request = body_request(b'{"a": [1, 2]}')
+    assert request.json() == {"a": [1, 2]}
+    # Parsed once.
+    assert request.json() is request.json()
+
+
+@pytest.mark.parametrize("body, status", [(b'{"a": "0123456789"}', 413), (b"{nope", 400)])
+def test_request_json_errors(body, status):
+    with pytest.raises(RequestError) as error:
+        body_request(body).json(max_size=10)
+    assert error.value.status[0] == status
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_json_on_the_wire(engine):
+    app = WebServer()
+
+    @app.route("/echo", ["POST"])
+    def echo(request, response):
+        response.send({"got": request.json(max_size=32), "at": datetime.date(2024, 1, 2)})
+
+    with serve(app, engine) as address:
+        status, headers, body = responses(exchange(address, request("POST", "/echo", b"[1,2]")))[0]
+        assert status == 200
+        assert headers["content-type"] == "application/json; charset=utf-8"
+        assert json.loads(body) == {"got": [1, 2], "at": "2024-01-02"}
+
+        status, headers, body = responses(exchange(address, request("POST", "/echo", b"1" * 40)))[0]
+        assert (status, headers["connection"]) == (413, "close")
+        status, _, body = responses(exchange(address, request("POST", "/echo", b"[1,")))[0]
+        assert (status, body) == (400, b"Invalid JSON body")
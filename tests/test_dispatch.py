@@ -0,0 +1,91 @@
+from NetJin import WebServer
+from NetJin.utils import Metrics
+from tests.server import ENGINES, serve, exchange, responses, request
+import pytest
+import time
+
+
+@pytest.fixture
+def app():
+    app = WebServer()
+    app._metrics = Metrics([0.1, 1])
+
+    @app.route("/boom/<int:n>")
+    def boom(request, response):
+        raise RuntimeError("boom")
+
+    @app.route("/aboom/<int:n>")
+    async def aboom(request, response):
+        raise RuntimeError("boom")
+
+    @app.route("/json", ["POST"])
+    def json(request, response):
+        response.send(request.json(max_size=10))
+
+    @app.route("/ajson", ["POST"])
+    async def ajson(request, response):
+        response.send(request.json(max_size=10))
+
+    @app.route("/body", ["POST"])
+    def body(request, response):
+        response.send(request.body)
+
+    return app
+
+
+def status(address, data: bytes) -> int:
+    return responses(exchange(address, data))[0][0]
+
+
+def metrics(address, *expected: str) -> str:
+    # Requests are recorded after their response is written, so a scrape right after
+    # may not have them yet.
+    deadline = time.monotonic() + 5
+    while True:
+        text = responses(exchange(address, request("GET", "/metrics")))[0][2].decode()
+        if all(line in text for line in expected) or time.monotonic() > deadline:
+            return text
+        time.sleep(0.02)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_handler_exception_is_500_labelled_by_pattern(app, engine, capsys):
+    with serve(app, engine) as address:
+        assert status(address, request("GET", "/boom/1")) == 500
+        assert status(address, request("GET", "/aboom/2")) == 500
+        assert status(address, request("GET", "/nothing")) == 404
+        expected = [
+            'route="/boom/<int:n>",method="GET",status="500"} 1',
+            'route="/aboom/<int:n>",method="GET",status="500"} 1',
+            'route="<unmatched>",method="GET",status="404"} 1',
+        ]
+        text = metrics(address, *expected)
+    assert all(line in text for line in expected)
+    # Raw paths never become labels.
+    assert "/boom/1" not in text
+    assert "RuntimeError: boom" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("path", ["/json", "/ajson"])
+def test_request_errors_in_handlers_keep_their_status(app, engine, path, capsys):
+    with serve(app, engine) as address:
+        assert status(address, request("POST", path, b'{"a": "0123456789"}')) == 413
+        assert status(address, request("POST", path, b"{nope")) == 400
+        assert status(address, request("POST", path, b"[1]")) == 200
+        expected = [
+            'route="%s",method="POST",status="413"} 1' % path,
+            'route="%s",method="POST",status="400"} 1' % path,
+        ]
+        text = metrics(address, *expected)
+    assert all(line in text for line in expected)
+    assert "Traceback" not in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("size", [b"-3", b"0x3", b"+3", b"1_0"])
+def test_malformed_chunk_size_is_400(app, engine, size):
+    chunked = request("POST", "/body", headers={"Transfer-Encoding": "chunked"})
+    with serve(app, engine) as address:
+        assert status(address, chunked + size + b"\r\nabc\r\n0\r\n\r\n") == 400
+        assert responses(exchange(address, chunked + b"3\r\nabc\r\n0\r\n\r\n"))[0][2] == b"abc"
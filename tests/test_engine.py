@@ -0,0 +1,97 @@
+from NetJin import WebServer
+from NetJin.http.static import StaticIndex
+from tests.server import serve, exchange, responses, request
+import threading
+import asyncio
+import socket
+import pytest
+
+
+@pytest.fixture
+def app(tmp_path):
+    (tmp_path / "big.bin").write_bytes(bytes(range(256)) * 4096)
+    app = WebServer()
+    app._static = StaticIndex([str(tmp_path)]).build()
+
+    @app.route("/sync")
+    def sync(request, response):
+        response.send(threading.current_thread().name)
+
+    @app.route("/async")
+    async def async_(request, response):
+        await asyncio.sleep(0)
+        response.send(threading.current_thread().name)
+
+    @app.route("/astream")
+    async def astream(request, response):
+        async def items():
+            for item in (b"a", "b", b"c"):
+                await asyncio.sleep(0)
+                yield item
+
+        await response.astream(items())
+
+    return app
+
+
+def body(address, path: str) -> bytes:
+    return responses(exchange(address, request("GET", path)))[0][2]
+
+
+def test_sync_handlers_run_on_the_executor(app):
+    with serve(app, "asyncio") as address:
+        assert body(address, "/sync").startswith(b"NetJin-executor")
+        assert not body(address, "/async").startswith(b"NetJin-executor")
+
+
+def test_async_stream(app):
+    with serve(app, "asyncio") as address:
+        received = exchange(address, request("GET", "/astream"))
+    head, _, chunks = received.partition(b"\r\n\r\n")
+    assert b"Transfer-Encoding: chunked" in head
+    assert chunks == b"1\r\na\r\n1\r\nb\r\n1\r\nc\r\n0\r\n\r\n"
+
+
+def test_static_files_use_the_loop(app):
+    with serve(app, "asyncio") as address:
+        assert body(address, "/big.bin") == bytes(range(256)) * 4096
+        received = exchange(address, request("GET", "/big.bin", headers={"Range": "bytes=256-511"}))
+    (status, headers, data), = responses(received)
+    assert (status, headers["content-range"], data) == (206, "bytes 256-511/1048576", bytes(range(256)))
+
+
+def test_concurrent_connections(app):
+    # One slow client doesn't hold up the others.
+    with serve(app, "asyncio") as address:
+        with socket.create_connection(address, 5) as idle:
+            idle.sendall(b"GET /async HTTP/1.1\r\n")
+            results = []
+            threads = [
+                threading.Thread(target=lambda: results.append(body(address, "/async")))
+                for _ in range(20)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(5)
+    assert len(results) == 20
+
+
+def test_stop_waits_for_responses(app):
+    started, release = threading.Event(), threading.Event()
+
+    @app.route("/slow")
+    async def slow(request, response):
+        started.set()
+        await asyncio.get_running_loop().run_in_executor(None, release.wait, 5)
+        response.send("done")
+
+    result = []
+    with serve(app, "asyncio") as address:
+        thread = threading.Thread(target=lambda: result.append(body(address, "/slow")))
+        thread.start()
+        assert started.wait(5)
+        app._engine.stop()
+        release.set()
+        thread.join(5)
+    assert result == [b"done"]
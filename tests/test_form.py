@@ -0,0 +1,131 @@
+from NetJin import WebServer
+from NetJin.http.form import parse_form
+from NetJin.http.parser import RequestError
+from tests.server import ENGINES, serve, exchange, responses, request
+from typing import Iterable, List
+import pytest
+import sys
+
+BOUNDARY = "----boundary"
+
+
+def pieces(data: bytes, size: int) -> List[bytes]:
+    return [data[index : index + size] for index in range(0, len(data), size)]
+
+
+def multipart(*parts: bytes) -> bytes:
+    body = b"".join(b"--" + BOUNDARY.encode() + b"\r\n" + part + b"\r\n" for part in parts)
+    return body + b"--" + BOUNDARY.encode() + b"--\r\n"
+
+
+def parse(body: Iterable[bytes], content_type: str = "multipart/form-data; boundary=" + BOUNDARY, **options):
+    options.setdefault("spool_size", 1024)
+    return parse_form(content_type, body, **options)
+
+
+def test_urlencoded():
+    form, files = parse(
+        [b"a=1&b=hello+world&a=", b"2&c=%C3%A9"], "application/x-www-form-urlencoded"
+    )
+    assert form == {"a": ["1", "2"], "b": ["hello world"], "c": ["é"]}
+    assert files == {}
+
+
+def test_urlencoded_too_large():
+    with pytest.raises(RequestError) as error:
+        parse([b"a=" + b"x" * 20], "application/x-www-form-urlencoded", max_size=10)
+    assert error.value.status[0] == 413
+
+
+def test_unknown_content_type():
+    assert parse([b"{}"], "application/json") == ({}, {})
+
+
+@pytest.mark.parametrize("size", [1, 3, 7, 64, 4096])
+def test_multipart_fields_and_files(size):
+    body = multipart(
+        b'Content-Disposition: form-data; name="title"\r\n\r\nHello\r\n--not a boundary',
+        b'Content-Disposition: form-data; name="upload"; filename="../../etc/a.txt"\r\n'
+        b"Content-Type: text/plain\r\n\r\nfile\r\ncontent",
+    )
+    form, files = parse(pieces(b"preamble\r\n" + body, size))
+    assert form == {"title": ["Hello\r\n--not a boundary"]}
+    upload = files["upload"][0]
+    # Directory components from the client are dropped.
+    assert upload.filename == "a.txt"
+    assert upload.content_type == "text/plain"
+    assert upload.size == len(b"file\r\ncontent")
+    assert upload.read() == b"file\r\ncontent"
+    upload.close()
+
+
+def test_multipart_large_file_spools_to_disk(tmp_path):
+    data = bytes(range(256)) * 64
+    body = multipart(
+        b'Content-Disposition: form-data; name="f"; filename="b.bin"\r\n\r\n' + data
+    )
+    _, files = parse(pieces(body, 1000), spool_size=1024, spool_dir=str(tmp_path))
+    upload = files["f"][0]
+    assert upload.file._rolled  # type: ignore[attr-defined]
+    destination = tmp_path / "saved.bin"
+    assert upload.save(destination) == len(data)
+    assert destination.read_bytes() == data
+    upload.close()
+
+
+def test_multipart_missing_boundary():
+    with pytest.raises(RequestError):
+        parse([b""], "multipart/form-data")
+
+
+def test_multipart_incomplete():
+    body = multipart(b'Content-Disposition: form-data; name="a"\r\n\r\n1')
+    with pytest.raises(RequestError):
+        parse([body[:-10]])
+
+
+def test_multipart_field_too_large():
+    body = multipart(b'Content-Disposition: form-data; name="a"\r\n\r\n' + b"x" * 100)
+    with pytest.raises(RequestError):
+        parse([body], max_size=10)
+
+
+def test_multipart_headers_too_large():
+    body = b"--" + BOUNDARY.encode() + b"\r\nX: " + b"a" * 20000
+    with pytest.raises(RequestError):
+        parse(pieces(body, 1024))
+
+
+@pytest.fixture
+def app(monkeypatch):
+    monkeypatch.setattr(sys.modules["NetJin.http.request"], "MAX_FORM_SIZE", 64)
+    app = WebServer()
+
+    @app.route("/form", ["POST"])
+    def form(request, response):
+        response.send(request.form)
+
+    @app.route("/aform", ["POST"])
+    async def aform(request, response):
+        response.send(request.form)
+
+    return app
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("path", ["/form", "/aform"])
+def test_form_errors_on_the_wire(app, engine, path, capsys):
+    urlencoded = {"Content-Type": "application/x-www-form-urlencoded"}
+    form_data = {"Content-Type": "multipart/form-data; boundary=" + BOUNDARY}
+    field = multipart(b'Content-Disposition: form-data; name="a"\r\n\r\n1')
+    with serve(app, engine) as address:
+
+        def status(body: bytes, headers: dict) -> int:
+            return responses(exchange(address, request("POST", path, body, headers)))[0][0]
+
+        assert status(b"a=1&b=2", urlencoded) == 200
+        assert status(field, form_data) == 200
+        assert status(b"a=" + b"x" * 100, urlencoded) == 413
+        assert status(field[:-10], form_data) == 400
+        assert status(field, {"Content-Type": "multipart/form-data"}) == 400
+    assert "Traceback" not in capsys.readouterr().out
@@ -0,0 +1,101 @@
+from NetJin import WebServer
+from tests.server import ENGINES, serve, exchange, responses, request
+import pytest
+import socket
+import time
+import sys
+
+BODY = b"0123456789" * 10
+
+
+@pytest.fixture
+def app():
+    app = WebServer()
+
+    @app.route("/h", ["GET", "HEAD"])
+    def h(request, response):
+        response.send(BODY)
+
+    @app.route("/ah", ["GET", "HEAD"])
+    async def ah(request, response):
+        response.send(BODY)
+
+    @app.route("/stream", ["GET", "HEAD"])
+    def stream(request, response):
+        response.stream([b"a", b"b"])
+
+    @app.route("/boom", ["GET", "HEAD"])
+    def boom(request, response):
+        raise RuntimeError("boom")
+
+    @app.route("/post", ["POST"])
+    def post(request, response):
+        response.send(b"posted")
+
+    return app
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_requests_share_a_connection(app, engine):
+    data = request("GET", "/h", close=False) + request("GET", "/ah", close=False)
+    with serve(app, engine) as address:
+        received = responses(exchange(address, data + request("GET", "/h")))
+    assert [status for status, _, _ in received] == [200, 200, 200]
+    assert [body for _, _, body in received] == [BODY] * 3
+    assert [headers["connection"] for _, headers, _ in received] == [
+        "keep-alive",
+        "keep-alive",
+        "close",
+    ]
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_http_10_closes_without_keep_alive(app, engine):
+    with serve(app, engine) as address:
+        received = exchange(address, b"GET /h HTTP/1.0\r\n\r\nGET /h HTTP/1.0\r\n\r\n")
+    (status, headers, body), = responses(received)
+    assert (status, body) == (200, BODY)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize(
+    "path, status", [("/h", 200), ("/ah", 200), ("/stream", 200), ("/missing", 404)]
+)
+def test_head_keeps_the_pipeline_in_sync(app, engine, path, status):
+    data = request("HEAD", path, close=False) + request("GET", "/h")
+    with serve(app, engine) as address:
+        received = responses(exchange(address, data), ["HEAD", "GET"])
+    assert len(received) == 2
+    (head_status, headers, body), (get_status, _, get_body) = received
+    assert (head_status, body) == (status, b"")
+    if path in ("/h", "/ah"):
+        assert headers["content-length"] == str(len(BODY))
+    assert (get_status, get_body) == (200, BODY)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("path, status", [("/boom", 500), ("/post", 405)])
+def test_head_error_pages_have_no_body(app, engine, path, status, capsys):
+    with serve(app, engine) as address:
+        received = exchange(address, request("HEAD", path))
+    head, _, body = received.partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 %d " % status)
+    assert b"Content-Length: " in head
+    assert body == b""
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_keep_alive_timeout_0_waits(app, engine, monkeypatch):
+    # 0 is no idle timeout, not a non-blocking socket.
+    monkeypatch.setattr(sys.modules["NetJin.core.WebServer.WebServer"], "KEEP_ALIVE_TIMEOUT", 0)
+    monkeypatch.setattr(sys.modules["NetJin.core.engine.engine"], "KEEP_ALIVE_TIMEOUT", 0)
+    with serve(app, engine) as address:
+        with socket.create_connection(address, 5) as client:
+            client.sendall(request("GET", "/h", close=False))
+            first = client.recv(65536)
+            time.sleep(0.2)
+            client.sendall(request("GET", "/h"))
+            second = b""
+            while chunk := client.recv(65536):
+                second += chunk
+    assert [status for status, _, _ in responses(first + second)] == [200, 200]
@@ -0,0 +1,174 @@
+from NetJin.http.parser import RequestReader, RequestError, RequestTimeout
+from NetJin.http.parser import body_framing, chunk_size, decode_head
+from typing import List
+import pytest
+
+
+class FakeSocket(object):
+    # Hands out the given chunks one recv() at a time, then EOF.
+    def __init__(self, chunks: List[bytes]) -> None:
+        self.chunks = list(chunks)
+        self.sent = b""
+        self.timeout: float | None = None
+
+    def recv(self, size: int) -> bytes:
+        if not self.chunks:
+            return b""
+        chunk = self.chunks.pop(0)
+        if isinstance(chunk, BaseException):
+            raise chunk
+        if len(chunk) > size:
+            self.chunks.insert(0, chunk[size:])
+            chunk = chunk[:size]
+        return chunk
+
+    def sendall(self, data: bytes) -> None:
+        self.sent += data
+
+    def gettimeout(self) -> float | None:
+        return self.timeout
+
+    def settimeout(self, timeout: float | None) -> None:
+        self.timeout = timeout
+
+
+def reader(*chunks: bytes, **options) -> RequestReader:
+    return RequestReader(FakeSocket(list(chunks)), **options)  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize(
+    "line, size",
+    [(b"0", 0), (b"1a", 26), (b"1A", 26), (b"ff;name=value", 255), (b" 10 ", 16)],
+)
+def test_chunk_size(line, size):
+    assert chunk_size(line) == size
+
+
+@pytest.mark.parametrize(
+    "line", [b"-3", b"+5", b"0x1a", b"1_0", b"", b";ext", b"g", b"1" * 17]
+)
+def test_chunk_size_rejects_malformed(line):
+    with pytest.raises(RequestError) as error:
+        chunk_size(line)
+    assert error.value.status[0] == 400
+
+
+def test_body_framing():
+    assert body_framing({}, 100) == (0, False)
+    assert body_framing({"content-length": " 12 "}, 100) == (12, False)
+    assert body_framing({"transfer-encoding": "gzip, chunked"}, 100) == (None, True)
+
+
+@pytest.mark.parametrize(
+    "headers, status",
+    [
+        ({"content-length": "abc"}, 400),
+        ({"content-length": "-1"}, 400),
+        ({"content-length": "101"}, 413),
+        ({"transfer-encoding": "gzip"}, 501),
+    ],
+)
+def test_body_framing_errors(headers, status):
+    with pytest.raises(RequestError) as error:
+        body_framing(headers, 100)
+    assert error.value.status[0] == status
+
+
+def test_decode_head_falls_back_to_latin1():
+    assert decode_head("GET /café".encode()) == "GET /café"
+    assert decode_head(b"GET /caf\xe9") == "GET /caf\xe9"
+
+
+def test_read_head_split_across_reads():
+    request = reader(b"GET / HTTP/1.1\r\nHo", b"st: a\r", b"\n\r\nGET /next")
+    assert request.read_head() == b"GET / HTTP/1.1\r\nHost: a\r\n\r\n"
+    # Bytes past the first request are kept for the next one.
+    assert bytes(request._buffer) == b"GET /next"
+
+
+def test_read_head_eof():
+    assert reader().read_head() is None
+    with pytest.raises(RequestError):
+        reader(b"GET / HTTP/1.1\r\n").read_head()
+
+
+def test_read_head_too_large():
+    with pytest.raises(RequestError) as error:
+        reader(b"GET / HTTP/1.1\r\nX: " + b"a" * 200, max_header_size=64).read_head()
+    assert error.value.status[0] == 431
+
+
+def test_read_head_timeout_phases():
+    with pytest.raises(RequestTimeout) as error:
+        reader(TimeoutError()).read_head()  # type: ignore[arg-type]
+    assert error.value.phase == "idle"
+    with pytest.raises(RequestTimeout) as error:
+        reader(b"GET / HT", TimeoutError()).read_head()  # type: ignore[arg-type]
+    assert error.value.phase == "header"
+
+
+def test_read_head_idle_timeout_0_blocks():
+    # settimeout(0) would make the socket non-blocking.
+    client = FakeSocket([b"GET / HTTP/1.1\r\n\r\n"])
+    client.timeout = 5
+    timeouts = []
+    client.settimeout = timeouts.append  # type: ignore[method-assign]
+    assert RequestReader(client).read_head(0) == b"GET / HTTP/1.1\r\n\r\n"  # type: ignore[arg-type]
+    assert timeouts[0] is None and 0 not in timeouts
+
+
+def test_content_length_body():
+    request = reader(b"hello", b" world", b"GET /")
+    body = request.body({"content-length": "11"})
+    assert body.read(3) == b"hel"
+    assert body.read() == b"lo world"
+    assert body.done
+
+
+def test_chunked_body_with_extensions_and_trailers():
+    request = reader(b"5;x=y\r\nhello\r\n", b"6\r\n world\r\n0\r\nTrailer: 1\r\n\r\nnext")
+    body = request.body({"transfer-encoding": "chunked"})
+    assert body.read() == b"hello world"
+    assert body.done
+    assert bytes(request._buffer) == b"next"
+
+
+def test_chunked_body_rejects_negative_size():
+    body = reader(b"-3\r\nabc\r\n0\r\n\r\n").body({"transfer-encoding": "chunked"})
+    with pytest.raises(RequestError) as error:
+        body.read()
+    assert error.value.status[0] == 400
+
+
+def test_chunked_body_missing_crlf():
+    body = reader(b"3\r\nabcX\r\n0\r\n\r\n").body({"transfer-encoding": "chunked"})
+    with pytest.raises(RequestError):
+        body.read()
+
+
+def test_chunked_body_too_large():
+    request = reader(b"a\r\n0123456789\r\n0\r\n\r\n", max_body_size=5)
+    with pytest.raises(RequestError) as error:
+        request.body({"transfer-encoding": "chunked"}).read()
+    assert error.value.status[0] == 413
+
+
+def test_truncated_body():
+    with pytest.raises(RequestError):
+        reader(b"abc").body({"content-length": "10"}).read()
+
+
+def test_expect_continue_is_sent_on_first_read():
+    client = FakeSocket([b"data"])
+    body = RequestReader(client).body({"content-length": "4", "expect": "100-continue"})  # type: ignore[arg-type]
+    assert client.sent == b""
+    assert body.read() == b"data"
+    assert client.sent == b"HTTP/1.1 100 Continue\r\n\r\n"
+
+
+def test_drain():
+    request = reader(b"abc", b"GET /")
+    assert request.body({"content-length": "3"}).drain()
+    assert bytes(request._buffer) == b""
+    # Larger than the limit: not read, the caller closes the connection instead.
+    assert not reader(b"x" * 10).body({"content-length": "10"}).drain(limit=5)
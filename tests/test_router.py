@@ -0,0 +1,81 @@
+from NetJin.utils import Router
+import uuid
+import pytest
+
+
+class Route(object):
+    def __init__(self, name: str, methods=("GET",)) -> None:
+        self.name = name
+        self.methods = list(methods)
+
+
+def router(*patterns: str) -> Router:
+    table = Router()
+    for pattern in patterns:
+        table.add(pattern, Route(pattern))
+    return table
+
+
+def match(table: Router, path: str, method: str | None = "GET"):
+    found = table.lookup(path, method)
+    return None if found is None else (found[0].name, found[1])
+
+
+def test_static_and_root():
+    table = router("/", "/about", "/users/list")
+    assert match(table, "/") == ("/", {})
+    assert match(table, "/about") == ("/about", {})
+    assert match(table, "/about/") == ("/about", {})
+    assert match(table, "/users/list") == ("/users/list", {})
+    assert match(table, "/users") is None
+    assert match(table, "/nothing") is None
+
+
+def test_converters():
+    table = router("/i/<int:n>", "/f/<float:x>", "/u/<uuid:id>", "/s/<name>")
+    assert match(table, "/i/42") == ("/i/<int:n>", {"n": 42})
+    assert match(table, "/i/abc") is None
+    assert match(table, "/f/1.5") == ("/f/<float:x>", {"x": 1.5})
+    value = uuid.uuid4()
+    assert match(table, "/u/%s" % value) == ("/u/<uuid:id>", {"id": value})
+    assert match(table, "/s/hello%20world") == ("/s/<name>", {"name": "hello world"})
+
+
+def test_static_segment_beats_parameter():
+    table = router("/users/<int:id>", "/users/me")
+    assert match(table, "/users/me") == ("/users/me", {})
+    assert match(table, "/users/7") == ("/users/<int:id>", {"id": 7})
+
+
+def test_backtracks_to_parameter():
+    table = router("/a/b/c", "/a/<x>/d")
+    assert match(table, "/a/b/d") == ("/a/<x>/d", {"x": "b"})
+
+
+def test_mixed_segment():
+    table = router("/<name>:<int:age>")
+    assert match(table, "/openai:12") == ("/<name>:<int:age>", {"name": "openai", "age": 12})
+    assert match(table, "/openai") is None
+
+
+def test_path_wildcard():
+    table = router("/static/<path:rest>", "/static/index")
+    assert match(table, "/static/css/site.css") == ("/static/<path:rest>", {"rest": "css/site.css"})
+    assert match(table, "/static/index") == ("/static/index", {})
+    assert match(table, "/static") is None
+
+
+def test_method_fallback_for_405():
+    table = Router()
+    table.add("/items", Route("post", ["POST"]))
+    found = table.lookup("/items", "GET")
+    # A path match with the wrong method is still returned; the caller answers 405.
+    assert found is not None and found[0].name == "post"
+    assert table.lookup("/items", None)[0].name == "post"
+
+
+def test_invalid_patterns():
+    with pytest.raises(ValueError):
+        Router().add("/x/<nope:id>", Route("x"))
+    with pytest.raises(ValueError):
+        Router().add("/x/<path:rest>/more", Route("x"))
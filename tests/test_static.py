@@ -0,0 +1,124 @@
+from NetJin import WebServer
+from NetJin.http.static import StaticFile, StaticIndex, parse_range, byterange_parts
+from tests.server import ENGINES, serve, exchange, responses, request
+from email.utils import formatdate
+import os
+import pytest
+
+
+@pytest.mark.parametrize(
+    "header, ranges",
+    [
+        ("bytes=0-9", [(0, 9)]),
+        ("bytes=90-", [(90, 99)]),
+        ("bytes=-10", [(90, 99)]),
+        ("bytes=-500", [(0, 99)]),
+        ("bytes=50-500", [(50, 99)]),
+        ("BYTES = 0-0", [(0, 0)]),
+        # Overlapping and adjacent ranges are merged.
+        ("bytes=0-9, 5-14, 15-19, 30-39", [(0, 19), (30, 39)]),
+        # Ranges starting past the end are dropped; none left is unsatisfiable.
+        ("bytes=100-200", []),
+        ("bytes=-0", []),
+    ],
+)
+def test_parse_range(header, ranges):
+    assert parse_range(header, 100) == ranges
+
+
+@pytest.mark.parametrize(
+    "header",
+    ["items=0-9", "bytes", "bytes=5-2", "bytes=a-b", "bytes=-", "bytes=0-1-2", "bytes=+1-2"],
+)
+def test_parse_range_invalid(header):
+    assert parse_range(header, 100) is None
+
+
+def test_parse_range_too_many():
+    header = "bytes=" + ",".join("%d-%d" % (index * 3, index * 3) for index in range(33))
+    assert parse_range(header, 1000) is None
+
+
+def test_byterange_parts():
+    parts, closing = byterange_parts([(0, 1), (5, 9)], 10, "text/plain", "B")
+    assert parts == [
+        (b"\r\n--B\r\nContent-Type: text/plain\r\nContent-Range: bytes 0-1/10\r\n\r\n", 0, 2),
+        (b"\r\n--B\r\nContent-Type: text/plain\r\nContent-Range: bytes 5-9/10\r\n\r\n", 5, 5),
+    ]
+    assert closing == b"\r\n--B--\r\n"
+
+
+@pytest.fixture
+def static_file(tmp_path):
+    path = tmp_path / "app.js"
+    path.write_bytes(b"console.log(1)")
+    return StaticFile("/app.js", str(path), os.stat(path), "max-age=60")
+
+
+def test_static_file_headers(static_file):
+    assert static_file.mimetype in ("text/javascript", "application/javascript")
+    assert static_file.etag == '"%x-%x"' % (static_file.mtime_ns, static_file.size)
+    assert static_file.headers["ETag"] == static_file.etag
+    assert static_file.headers["Cache-Control"] == "max-age=60"
+    assert static_file.headers["Accept-Ranges"] == "bytes"
+
+
+def test_not_modified(static_file):
+    assert static_file.not_modified({"If-None-Match": static_file.etag})
+    assert static_file.not_modified({"If-None-Match": '"x", W/' + static_file.etag})
+    assert static_file.not_modified({"If-None-Match": "*"})
+    assert not static_file.not_modified({"If-None-Match": '"other"'})
+    last_modified = static_file.headers["Last-Modified"]
+    assert static_file.not_modified({"If-Modified-Since": last_modified})
+    assert not static_file.not_modified(
+        {"If-Modified-Since": formatdate(static_file.mtime - 10, usegmt=True)}
+    )
+    # If-None-Match wins over If-Modified-Since.
+    assert not static_file.not_modified(
+        {"If-None-Match": '"other"', "If-Modified-Since": last_modified}
+    )
+    assert not static_file.not_modified({"If-Modified-Since": "garbage"})
+
+
+def test_if_range(static_file):
+    assert static_file.if_range(None)
+    assert static_file.if_range(static_file.etag)
+    assert static_file.if_range(static_file.headers["Last-Modified"])
+    # Weak and stale validators get the whole file.
+    assert not static_file.if_range("W/" + static_file.etag)
+    assert not static_file.if_range('"stale"')
+    assert not static_file.if_range(formatdate(0, usegmt=True))
+
+
+def test_variant_negotiation(tmp_path, static_file):
+    gz = tmp_path / "app.js.gz"
+    gz.write_bytes(b"gz")
+    variant = StaticFile("/app.js", str(gz), os.stat(gz), encoding="gzip", mimetype=static_file.mimetype)
+    static_file.add_variant(variant)
+    assert static_file.negotiate("gzip, deflate") is variant
+    assert static_file.negotiate("identity") is static_file
+    assert static_file.negotiate("") is static_file
+    assert variant.etag.endswith('-gzip"') and variant.etag != static_file.etag
+    assert static_file.headers["Vary"] == "Accept-Encoding"
+
+
+def test_index_lookup_and_symlink_cycle(tmp_path):
+    (tmp_path / "css").mkdir()
+    (tmp_path / "css" / "style.css").write_text("body {}")
+    (tmp_path / "css" / "loop").symlink_to(tmp_path)
+    index = StaticIndex([str(tmp_path)]).build()
+    found = index.lookup("/css/style.css")
+    assert found is not None and found.size == len("body {}")
+    assert index.lookup("/css/missing.css") is None
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_unsatisfiable_range_has_no_content_type(tmp_path, engine):
+    (tmp_path / "data.txt").write_text("0123456789")
+    app = WebServer()
+    app._static = StaticIndex([str(tmp_path)]).build()
+    with serve(app, engine) as address:
+        received = exchange(address, request("GET", "/data.txt", headers={"Range": "bytes=20-"}))
+    (status, headers, body), = responses(received)
+    assert (status, headers["content-range"], body) == (416, "bytes */10", b"")
+    assert "content-type" not in headers
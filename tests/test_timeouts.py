@@ -0,0 +1,45 @@
+from NetJin import WebServer
+from NetJin.utils import Metrics
+from tests.server import ENGINES, serve, exchange, responses, request
+import pytest
+import time
+import sys
+
+
+@pytest.fixture
+def app(monkeypatch):
+    for module in ("NetJin.core.WebServer.WebServer", "NetJin.core.engine.engine"):
+        monkeypatch.setattr(sys.modules[module], "BODY_TIMEOUT", 0.2)
+    app = WebServer()
+    app._metrics = Metrics([0.1, 1])
+
+    @app.route("/body", ["POST"])
+    def body(request, response):
+        response.send(request.body)
+
+    @app.route("/abody", ["POST"])
+    async def abody(request, response):
+        response.send(request.body)
+
+    return app
+
+
+def metrics(address, *expected: str) -> str:
+    deadline = time.monotonic() + 5
+    while True:
+        text = responses(exchange(address, request("GET", "/metrics")))[0][2].decode()
+        if all(line in text for line in expected) or time.monotonic() > deadline:
+            return text
+        time.sleep(0.02)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("path", ["/body", "/abody"])
+def test_stalled_body_is_408(app, engine, path, capsys):
+    stalled = request("POST", path, headers={"Content-Length": "10"}) + b"abc"
+    with serve(app, engine) as address:
+        (status, headers, _), = responses(exchange(address, stalled))
+        assert (status, headers["connection"]) == (408, "close")
+        text = metrics(address, 'client_timeouts_total{phase="body"} 1')
+    assert 'client_timeouts_total{phase="body"} 1' in text
+    assert "Traceback" not in capsys.readouterr().out
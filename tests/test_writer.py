@@ -0,0 +1,86 @@
+from NetJin.http.writer import write, status_line, header_line, CONNECTION
+import threading
+import socket
+import pytest
+
+
+class PartialSocket(object):
+    # sendmsg() takes at most `limit` bytes per call, like a full socket buffer.
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.received = b""
+        self.calls = 0
+
+    def sendmsg(self, buffers) -> int:
+        self.calls += 1
+        assert len(buffers) <= 1024
+        data = b"".join(bytes(buffer) for buffer in buffers)[: self.limit]
+        self.received += data
+        return len(data)
+
+
+class PlainSocket(object):
+    def __init__(self) -> None:
+        self.received = b""
+
+    def sendall(self, data) -> None:
+        self.received += bytes(data)
+
+
+@pytest.mark.parametrize("limit", [1, 3, 7, 64, 10000])
+def test_partial_writes_resume(limit):
+    buffers = [b"head\r\n", b"", bytearray(b"body" * 10), memoryview(b"tail")]
+    client = PartialSocket(limit)
+    assert write(client, buffers) == 50  # type: ignore[arg-type]
+    assert client.received == b"head\r\n" + b"body" * 10 + b"tail"
+
+
+def test_buffers_past_iov_max():
+    buffers = [b"%04d" % index for index in range(3000)]
+    client = PartialSocket(10**9)
+    assert write(client, buffers) == 12000  # type: ignore[arg-type]
+    assert client.received == b"".join(buffers)
+    assert client.calls == 3
+
+
+def test_memoryview_of_other_formats():
+    data = memoryview(bytearray(range(8))).cast("I")
+    client = PartialSocket(3)
+    assert write(client, [data]) == 8  # type: ignore[arg-type]
+    assert client.received == bytes(range(8))
+
+
+def test_without_sendmsg():
+    client = PlainSocket()
+    assert write(client, [b"a", memoryview(b"bc")]) == 3  # type: ignore[arg-type]
+    assert client.received == b"abc"
+
+
+def test_socket_pair():
+    # 1 MiB doesn't fit the socket buffer, so sendmsg() comes back short.
+    body = b"x" * 1024 * 1024
+    received = []
+    left, right = socket.socketpair()
+    with left, right:
+        left.settimeout(5)
+
+        def read() -> None:
+            size = 0
+            while size < len(body) + 4:
+                chunk = right.recv(65536)
+                received.append(chunk)
+                size += len(chunk)
+
+        reader = threading.Thread(target=read)
+        reader.start()
+        assert write(left, [b"head", body]) == len(body) + 4
+        reader.join(5)
+    assert b"".join(received) == b"head" + body
+
+
+def test_head_helpers():
+    assert status_line(200) == b"HTTP/1.1 200 OK\r\n"
+    assert status_line(799) == b"HTTP/1.1 799 Unknown Status Code\r\n"
+    assert header_line("ETag", '"1"') == b'ETag: "1"\r\n'
+    assert header_line("Content-Length", 5) == b"Content-Length: 5\r\n"  # type: ignore[arg-type]
+    assert CONNECTION[True].endswith(b"\r\n\r\n")